@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.context import context_manager
-from core.ledger import list_production_kits
+from core.ledger import list_production_kits, find_production_kit, format_kit_id
 
 # Archive threshold (days since published)
 ARCHIVE_THRESHOLD_DAYS = 30
@@ -61,12 +61,14 @@ def cmd_run(args):
     archive_path = ctx.production_path / "archive"
     archive_path.mkdir(exist_ok=True)
     
-    kits = list_production_kits(ctx)
     archived_count = 0
     
-    # Filter by kit ID if specified
+    # One kit by ID ('18' finds 018) if specified
     if hasattr(args, 'kit_id') and args.kit_id:
-        kits = [k for k in kits if k['id'] == args.kit_id]
+        kit = find_production_kit(ctx, format_kit_id(int(args.kit_id))) if args.kit_id.isdigit() else None
+        kits = [kit] if kit else []
+    else:
+        kits = list_production_kits(ctx)
     
     now = datetime.now()
     
@@ -85,7 +87,7 @@ def cmd_run(args):
             continue
         
         # Move to archive
-        kit_folder = ctx.production_path / f"{kit['id']}_{kit['name']}"
+        kit_folder = kit['path']
         if kit_folder.exists():
             dest = archive_path / kit_folder.name
             shutil.move(str(kit_folder), str(dest))
@@ -125,7 +127,10 @@ def cmd_restore(args):
         print(f"Kit '{args.kit_id}' not found in archive.")
         return
     
-    dest = ctx.production_path / target.name
+    from core.ledger import parse_kit_folder, kit_folder_path
+    parsed = parse_kit_folder(target.name)
+    dest = kit_folder_path(ctx, *parsed) if parsed else ctx.production_path / target.name
+    dest.parent.mkdir(parents=True, exist_ok=True)
     shutil.move(str(target), str(dest))
     print(f"Restored: {target.name} to active production.")
 
@@ -53,11 +53,8 @@ def cmd_place(args):
     slot = args.slot  # forward_start, forward_end, reverse_start, reverse_end
     
     # Find kit
-    kit_path = None
-    for item in ctx.production_path.iterdir():
-        if item.is_dir() and item.name.startswith(f"{kit_id}_"):
-            kit_path = item
-            break
+    from core.ledger import resolve_kit_path
+    kit_path = resolve_kit_path(ctx, kit_id)
     
     if not kit_path:
         print(f"❌ Kit {kit_id} not found.")
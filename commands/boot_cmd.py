@@ -78,8 +78,8 @@ Each channel has its own folder with brain/, production/, and analytics/.
         # Production kits count
         prod_path = ctx.production_path
         if prod_path.exists():
-            kits = [d for d in prod_path.iterdir() if d.is_dir()]
-            print(f"\n### Production Kits: {len(kits)} active")
+            from core.kit_catalog import count_kits
+            print(f"\n### Production Kits: {count_kits(ctx)} active")
     else:
         print("\n[!] No active channel. Run: `contentos channel use <name>`")
     
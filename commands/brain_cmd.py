@@ -7,7 +7,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.context import context_manager
 from core.brain import (
     init_brain, load_state, load_playbook, load_learnings,
-    add_learning, set_active_theme, brain_exists, get_prompt_context
+    add_learning, set_active_theme, brain_exists, assemble_prompt_context,
+    render_learnings, read_learning_log, format_learning, LEARNING_SECTIONS
 )
 
 def cmd_init(args):
@@ -26,7 +27,7 @@ def cmd_init(args):
     print(f"Brain initialized for {ctx.name}!")
     print(f"  Created: brain/state.json")
     print(f"  Created: brain/themes/ (loop, advice, cinematic)")
-    print(f"  Created: brain/learnings.md")
+    print(f"  Created: brain/learnings.jsonl (log) + learnings.md (view)")
     print("\nNext: Run 'contentos scout' or 'contentos scan' to populate learnings.")
 
 def cmd_show(args):
@@ -76,6 +77,20 @@ def cmd_show(args):
     print(f"\n[Active Theme]")
     print(f"  {state.get('active_theme', 'loop')}")
     
+    # Learnings (brings learnings.md up to date with the log)
+    render_learnings(ctx)
+    entries = read_learning_log(ctx)
+    counts = {}
+    for entry in entries:
+        counts[entry.get('category', 'other')] = counts.get(entry.get('category', 'other'), 0) + 1
+    print(f"\n[Learnings] {len(entries)} logged")
+    for category, n in counts.items():
+        title = LEARNING_SECTIONS.get(category, ("Other",))[0]
+        print(f"  {title:<20} {n}")
+    for entry in entries[-3:]:
+        safe = format_learning(entry)[:90].encode('ascii', 'ignore').decode('ascii')
+        print(f"  {safe}")
+    
     print(f"\n{'='*50}")
     print(f"Updated: {state.get('updated_at', 'Never')}")
 
@@ -111,7 +126,7 @@ def cmd_learn(args):
         print(f"Invalid category. Use: {', '.join(valid_categories)}")
         return
     
-    add_learning(ctx, category, args.insight, evidence="Manual entry")
+    add_learning(ctx, category, args.insight, evidence="Manual entry", source="brain learn")
     print(f"Learning added to {category}:")
     print(f"  {args.insight}")
 
@@ -126,8 +141,78 @@ def cmd_context(args):
         print("Brain not initialized. Run: contentos brain init")
         return
     
-    context = get_prompt_context(ctx)
-    print(context)
+    budget = getattr(args, 'budget', None)
+    context = assemble_prompt_context(ctx, budget=budget, include_protocols=True,
+                                      query=getattr(args, 'query', None))
+    print(context["text"])
+    
+    print(f"{'='*50}")
+    print(f"CONTEXT BUDGET: ~{context['used']:,} / {context['budget']:,} tokens")
+    print(f"{'='*50}")
+    print(f"{'Section':<12} {'Tokens':>8} {'Available':>10} {'Items':>10}")
+    print("-" * 44)
+    for section in context['sections']:
+        items = f"{section['items_kept']}/{section['items_total']}"
+        print(f"{section['section']:<12} {section['tokens']:>8,} {section['tokens_total']:>10,} {items:>10}")
+    print("\nAdjust with --budget N, or 'brain.context_budget' in .contentos/config.json")
+
+def cmd_compact(args):
+    """Merge near-duplicate learnings (newest kept with a count, rest archived)."""
+    from core.brain_compact import compact, get_archive_path
+    ctx = context_manager.get_current_context()
+    if not ctx:
+        print("No active channel.")
+        return
+    
+    if not brain_exists(ctx):
+        print("Brain not initialized. Run: contentos brain init")
+        return
+    
+    result = compact(ctx, threshold=args.threshold, dry_run=args.dry_run)
+    if not result['archived']:
+        print(f"No near-duplicates among {result['before']} learnings.")
+        return
+    
+    verb = "Would merge" if args.dry_run else "Merged"
+    print(f"{verb} {result['before']} learnings into {result['after']} "
+          f"({result['archived']} archived, {len(result['clusters'])} clusters):")
+    for count, insight in result['clusters'][:10]:
+        safe = insight[:70].encode('ascii', 'ignore').decode('ascii')
+        print(f"   {count:>4}x  {safe}")
+    if len(result['clusters']) > 10:
+        print(f"   ... and {len(result['clusters']) - 10} more clusters")
+    if not args.dry_run:
+        print(f"\nArchived entries: {get_archive_path(ctx).relative_to(ctx.path)}")
+
+def cmd_reindex(args):
+    """Rebuild the embedding index over learnings, research and themes."""
+    from core.brain_index import BrainIndex, _np, save_rebuilt
+    from core.filelock import LockTimeout
+    ctx = context_manager.get_current_context()
+    if not ctx:
+        print("No active channel.")
+        return
+    
+    if _np() is None:
+        print("[!] The embedding index needs NumPy: pip install numpy")
+        return
+    
+    index = BrainIndex(ctx)
+    count = index.rebuild()   # Embedding runs outside the index lock
+    try:
+        save_rebuilt(ctx, index, replace=True)
+    except LockTimeout:
+        print("[X] The index is busy (another command is updating it). Try again.")
+        return
+    print(f"[OK] Indexed {count} chunks with {index.embedder}")
+    if index.pending:
+        print(f"[!] {len(index.pending)} chunks couldn't be embedded; they are retried on the next update")
+    
+    sources = {}
+    for chunk in index.chunks:
+        sources[chunk["source"]] = sources.get(chunk["source"], 0) + 1
+    for source, n in sorted(sources.items()):
+        print(f"   - {source:<20} {n:>4} chunks")
 
 def run(args):
     """Entry point for brain command."""
@@ -141,5 +226,9 @@ def run(args):
         cmd_learn(args)
     elif args.brain_action == 'context':
         cmd_context(args)
+    elif args.brain_action == 'reindex':
+        cmd_reindex(args)
+    elif args.brain_action == 'compact':
+        cmd_compact(args)
     else:
-        print("Usage: contentos brain {init|show|set-theme|learn|context}")
+        print("Usage: contentos brain {init|show|set-theme|learn|context|reindex|compact}")
@@ -27,6 +27,17 @@ def show_config():
     for name, enabled in features.items():
         status = "[ON] " if enabled else "[OFF]"
         print(f"  - {name:<15} {status}")
+    
+    print("\nLLM Driver:")
+    for name, value in cfg.llm.__dict__.items():
+        print(f"  - {name:<15} {value}")
+    
+    print("\nTask Routing (first installed model wins; '-' = best available):")
+    for name, route in cfg.tasks.items():
+        models = ", ".join(route.models) or "-"
+        timeout = f"{route.timeout:.0f}s" if route.timeout else "default"
+        temperature = route.temperature if route.temperature is not None else "default"
+        print(f"  - {name:<15} {models} (timeout {timeout}, temperature {temperature})")
     print("")
 
 def toggle_feature(feature_name: str, enable: bool):
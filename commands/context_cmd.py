@@ -28,7 +28,7 @@ def cmd_show(args):
     archived_size_kb = 0
     
     for kit in active_kits:
-        kit_path = production_path / f"{kit['id']}_{kit['name']}"
+        kit_path = kit['path']
         if kit_path.exists():
             for f in kit_path.glob('*'):
                 if f.is_file():
@@ -69,11 +69,11 @@ def cmd_optimize(args):
     print("=" * 40)
     
     # Check for large files
-    production_path = ctx.production_path
     large_files = []
     
-    for kit_folder in production_path.iterdir():
-        if kit_folder.is_dir() and kit_folder.name != 'archive':
+    for kit in list_production_kits(ctx):
+        kit_folder = kit['path']
+        if kit_folder.is_dir():
             for f in kit_folder.glob('*'):
                 if f.is_file() and f.stat().st_size > 10 * 1024:  # > 10KB
                     large_files.append((f.name, f.stat().st_size / 1024, kit_folder.name))
@@ -45,9 +45,9 @@ def check_brain_health(ctx) -> List[str]:
         if not themes:
             issues.append("[!] No themes found in brain/themes/")
             
-    # Check learnings.md
-    if not (brain_path / "learnings.md").exists():
-        issues.append("[X] brain/learnings.md missing")
+    # Check learnings (log, or a legacy learnings.md not yet imported)
+    if not (brain_path / "learnings.jsonl").exists() and not (brain_path / "learnings.md").exists():
+        issues.append("[X] brain/learnings.jsonl missing")
         
     return issues
 
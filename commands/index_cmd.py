@@ -1,198 +1,353 @@
-"""Index command - AI-friendly context surfing with progressive disclosure."""
+"""Index command - AI-friendly context surfing with progressive disclosure.
+
+Every path segment is served by a node provider from a small registry
+(`@provider("brain.themes.*", ...)`). Resolving a path runs only the
+provider it names; a parent lists its children through their cheap stubs,
+so `index brain.identity` never lists themes and `index` never walks
+production/.
+
+Every node carries `_path` and `_type`; list nodes add `_count` (total
+items), `_items` (one page) and `_next` (cursor for --after, None on the
+last page). --depth expands children inline: 0 = metadata only, 1 = the
+node with child stubs (default), N = children expanded N-1 levels.
+
+Providers that declare `deps` (the directories and files they read) are
+served from the persisted sitemap cache (core.sitemap) until one of those
+paths changes; --refresh rebuilds every node on the way.
+"""
+import heapq
+import os
 import sys
 import json
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.context import context_manager
 from core.config import load_global_config
-from core.brain import brain_exists, load_state, list_themes, get_themes_path, load_learnings
+from core.brain import (brain_exists, load_state, list_themes, load_theme, load_learnings,
+                        get_brain_path, get_themes_path, get_learning_log_path, get_learnings_path)
+from core.kit_catalog import kit_page, count_kits
+from core.ledger import resolve_kit_path
+from core.sitemap import get_sitemap, save_all
 
-def get_system_index() -> Dict[str, Any]:
-    """Build the root system index."""
-    global_cfg = load_global_config()
-    ctx = context_manager.get_current_context()
-    
-    # Count channels
-    channels_path = Path(__file__).parent.parent / "channels"
-    channels = [d.name for d in channels_path.iterdir() 
-                if d.is_dir() and not d.name.startswith('.')]
-    
+CHANNELS_PATH = Path(__file__).parent.parent / "channels"
+DEFAULT_LIMIT = 10
+DEFAULT_DEPTH = 1
+
+@dataclass
+class NodeProvider:
+    """Builds one kind of node. `build(ctx, args, page)` returns the node body;
+    `stub(ctx, args)` returns the cheap metadata shown in a parent listing;
+    `deps(ctx, args)` lists the paths both are derived from (enables caching)."""
+    pattern: Tuple[str, ...]
+    type: str
+    desc: str
+    build: Callable
+    stub: Optional[Callable] = None
+    needs_channel: bool = True
+    deps: Optional[Callable] = None
+
+_PROVIDERS: Dict[Tuple[str, ...], NodeProvider] = {}
+
+def provider(pattern: str, node_type: str, desc: str = "", stub: Optional[Callable] = None,
+             needs_channel: bool = True, deps: Optional[Callable] = None):
+    """Registers a node provider for a dot pattern ('*' matches one segment)."""
+    def register(build):
+        key = tuple(pattern.split('.')) if pattern else ()
+        _PROVIDERS[key] = NodeProvider(key, node_type, desc, build, stub, needs_channel, deps)
+        return build
+    return register
+
+def _match(parts: List[str]) -> Tuple[Optional[NodeProvider], List[str]]:
+    """Most specific provider for a path; returns it with the wildcard values."""
+    best, best_score = None, -1
+    for pattern, prov in _PROVIDERS.items():
+        if len(pattern) != len(parts) or not all(p in ('*', s) for p, s in zip(pattern, parts)):
+            continue
+        score = sum(p != '*' for p in pattern)
+        if score > best_score:
+            best, best_score = prov, score
+    if best is None:
+        return None, []
+    return best, [s for p, s in zip(best.pattern, parts) if p == '*']
+
+def _children(pattern: Tuple[str, ...]) -> List[NodeProvider]:
+    """Named (non-wildcard) children of a pattern, in registration order."""
+    return [prov for key, prov in _PROVIDERS.items()
+            if len(key) == len(pattern) + 1 and key[:-1] == pattern and key[-1] != '*']
+
+# --- Listing helpers ---
+
+def _dir_names(path: Path) -> List[str]:
+    """Visible sub-directory names (scandir d_type, no per-entry stat)."""
+    if not path.exists():
+        return []
+    with os.scandir(path) as entries:
+        return [e.name for e in entries if e.is_dir() and not e.name.startswith('.')]
+
+def _page(names: List[str], page: Dict[str, Any], newest_first: bool = False) -> Dict[str, Any]:
+    """One page of a list node; selects with a heap instead of sorting every name."""
+    after, limit = page.get('after'), page.get('limit') or DEFAULT_LIMIT
+    total = len(names)
+    if after is not None:
+        names = [n for n in names if (n < after if newest_first else n > after)]
+    pick = heapq.nlargest if newest_first else heapq.nsmallest
+    items = pick(limit + 1, names)
+    more = len(items) > limit
+    items = items[:limit]
+    return {"_count": total, "_items": items, "_next": items[-1] if more else None}
+
+# --- Root ---
+
+@provider("", "root", needs_channel=False)
+def _root(ctx, args, page):
     return {
-        "_path": "",
-        "_type": "root",
         "system": {
             "name": "ContentOS",
             "version": "4.0",
             "active_channel": ctx.name if ctx else None
-        },
-        "nodes": {
-            "channels": {"_type": "list", "_count": len(channels), "_items": channels},
-            "brain": {"_type": "object", "_desc": "Channel knowledge system"},
-            "kits": {"_type": "list", "_desc": "Production kits"},
-            "commands": {"_type": "list", "_count": 16, "_desc": "CLI commands"},
-            "config": {"_type": "object", "_desc": "System settings"}
         }
     }
 
-def get_brain_index(ctx) -> Dict[str, Any]:
-    """Build brain section index."""
-    if not brain_exists(ctx):
-        return {"_error": "Brain not initialized. Run: contentos brain init"}
-    
-    state = load_state(ctx)
-    themes = list_themes(ctx)
-    
+@provider("channels", "list", "Channels in this workspace",
+          stub=lambda ctx, args: {"_count": len(_dir_names(CHANNELS_PATH))}, needs_channel=False,
+          deps=lambda ctx, args: [CHANNELS_PATH])
+def _channels(ctx, args, page):
+    return _page(_dir_names(CHANNELS_PATH), page)
+
+# --- Brain ---
+
+def _brain_stub(ctx, args):
+    return {} if ctx and brain_exists(ctx) else {"_preview": "not initialized"}
+
+def _state_deps(ctx, args):
+    return [get_brain_path(ctx) / "state.json"]
+
+@provider("brain", "object", "Channel knowledge system", stub=_brain_stub)
+def _brain(ctx, args, page):
+    return {"_desc": f"Knowledge system for {ctx.name}"}
+
+@provider("brain.identity", "object", "Channel identity",
+          stub=lambda ctx, args: {"_preview": load_state(ctx).get('identity', {}).get('name', 'Unknown')},
+          deps=_state_deps)
+def _brain_identity(ctx, args, page):
+    identity = load_state(ctx).get('identity', {})
     return {
-        "_path": "brain",
-        "_type": "object",
-        "_desc": f"Knowledge system for {ctx.name}",
-        "identity": {
-            "_type": "object",
-            "_preview": state.get('identity', {}).get('name', 'Unknown'),
-            "name": state.get('identity', {}).get('name'),
-            "niche": state.get('identity', {}).get('niche'),
-            "audience": state.get('identity', {}).get('audience'),
-            "tone": state.get('identity', {}).get('tone')
-        },
-        "themes": {
-            "_type": "list",
-            "_count": len(themes),
-            "_items": themes,
-            "_active": state.get('active_theme', 'loop')
-        },
-        "audience": {
-            "_type": "object",
-            "_preview": f"Sentiment: {state.get('audience', {}).get('sentiment', 0)}",
-            "wants": state.get('audience', {}).get('wants', []),
-            "complaints": state.get('audience', {}).get('complaints', []),
-            "sentiment": state.get('audience', {}).get('sentiment', 0)
-        },
-        "learnings": {
-            "_type": "file",
-            "_size": len(load_learnings(ctx)),
-            "_desc": "Accumulated insights from agents"
-        }
+        "name": identity.get('name'),
+        "niche": identity.get('niche'),
+        "audience": identity.get('audience'),
+        "tone": identity.get('tone')
     }
 
-def get_theme_content(ctx, theme_name: str) -> Dict[str, Any]:
-    """Get specific theme file content."""
-    theme_path = get_themes_path(ctx) / f"{theme_name}.md"
-    if not theme_path.exists():
-        return {"_error": f"Theme '{theme_name}' not found"}
-    
-    content = theme_path.read_text(encoding='utf-8')
+def _themes_stub(ctx, args):
+    return {"_count": len(list_themes(ctx)), "_active": load_state(ctx).get('active_theme', 'loop')}
+
+@provider("brain.themes", "list", "Content themes", stub=_themes_stub,
+          deps=lambda ctx, args: [get_themes_path(ctx)] + _state_deps(ctx, args))
+def _brain_themes(ctx, args, page):
+    node = _page(list_themes(ctx), page)
+    node["_active"] = load_state(ctx).get('active_theme', 'loop')
+    return node
+
+@provider("brain.themes.*", "file", "Theme file",
+          deps=lambda ctx, args: [get_themes_path(ctx) / f"{args[0]}.md"])
+def _brain_theme(ctx, args, page):
+    content = load_theme(ctx, args[0])
+    if content is None:
+        return {"_error": f"Theme '{args[0]}' not found"}
+    return {"_format": "markdown", "content": content}
+
+@provider("brain.audience", "object", "Audience signals",
+          stub=lambda ctx, args: {"_preview": f"Sentiment: {load_state(ctx).get('audience', {}).get('sentiment', 0)}"},
+          deps=_state_deps)
+def _brain_audience(ctx, args, page):
+    audience = load_state(ctx).get('audience', {})
     return {
-        "_path": f"brain.themes.{theme_name}",
-        "_type": "file",
-        "_format": "markdown",
-        "content": content
+        "wants": audience.get('wants', []),
+        "complaints": audience.get('complaints', []),
+        "sentiment": audience.get('sentiment', 0)
     }
 
-def get_kits_index(ctx) -> Dict[str, Any]:
-    """Build kits section index."""
-    prod_path = ctx.production_path
-    if not prod_path.exists():
+def _learnings_stub(ctx, args):
+    # Size of the log itself; rendering the markdown view waits until it is opened
+    for path in (get_learning_log_path(ctx), get_learnings_path(ctx)):
+        if path.exists():
+            return {"_size": path.stat().st_size}
+    return {"_size": 0}
+
+@provider("brain.learnings", "file", "Accumulated insights from agents", stub=_learnings_stub,
+          deps=lambda ctx, args: [get_learning_log_path(ctx), get_learnings_path(ctx)])
+def _brain_learnings(ctx, args, page):
+    return {"_format": "markdown", "content": load_learnings(ctx)}
+
+# --- Kits ---
+
+def _kit_deps(ctx, args):
+    # The folder (files added/removed) and each file in it (edits)
+    kit_path = resolve_kit_path(ctx, args[0])
+    if kit_path is None:
+        return [ctx.production_path]
+    return [kit_path] + [kit_path / name for name in sorted(os.listdir(kit_path))]
+
+SUMMARY_FIELDS = ("id", "name", "kit_status", "theme", "formula", "video_id", "views_7d", "rating")
+
+def _kit_summary(kit: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {k: kit[k] for k in SUMMARY_FIELDS if kit.get(k) is not None}
+    summary["assets"] = "complete" if kit["has_script"] and kit["has_prompt"] and kit["has_assets"] else "incomplete"
+    return summary
+
+# Not cached in the sitemap: the catalog is already an indexed read, and it
+# notices kit.yaml edits that leave production/ untouched.
+@provider("kits", "list", "Production kits (newest first)",
+          stub=lambda ctx, args: {"_count": count_kits(ctx)} if ctx.production_path.exists() else {})
+def _kits(ctx, args, page):
+    """Kit ids with compact summaries from the kit catalog."""
+    if not ctx.production_path.exists():
         return {"_error": "No production folder"}
-    
-    kits = sorted([d.name for d in prod_path.iterdir() if d.is_dir()])
-    
+    filters = {k: page[k] for k in ('status', 'theme') if page.get(k)}
+    limit = page.get('limit') or DEFAULT_LIMIT
+    total, kits = kit_page(ctx, after=page.get('after'), limit=limit + 1, **filters)
+    cursor = None
+    if len(kits) > limit:
+        # A folder cursor when the page boundary splits folders sharing an id ('007_a', '0007_b')
+        last, following = kits[limit - 1], kits[limit]
+        cursor = last['folder'] if int(last['id']) == int(following['id']) else last['id']
+    kits = kits[:limit]
     return {
-        "_path": "kits",
-        "_type": "list",
-        "_count": len(kits),
-        "_items": kits[-10:],  # Last 10
-        "_note": f"Showing last 10 of {len(kits)}" if len(kits) > 10 else None
+        "_count": total,
+        "_items": [kit['id'] for kit in kits],
+        "_next": cursor,
+        "_filters": filters or None,
+        "summaries": [_kit_summary(kit) for kit in kits]
     }
 
-def get_kit_detail(ctx, kit_id: str) -> Dict[str, Any]:
-    """Get specific kit details."""
-    prod_path = ctx.production_path
-    matches = list(prod_path.glob(f"{kit_id}*"))
-    
-    if not matches:
-        return {"_error": f"Kit '{kit_id}' not found"}
-    
-    kit_path = matches[0]
-    files = {f.name: f.stat().st_size for f in kit_path.iterdir() if f.is_file()}
-    
-    result = {
-        "_path": f"kits.{kit_id}",
-        "_type": "object",
-        "name": kit_path.name,
-        "files": files
-    }
-    
+@provider("kits.*", "object", "Kit folder", deps=_kit_deps)
+def _kit(ctx, args, page):
+    kit_path = resolve_kit_path(ctx, args[0])
+    if kit_path is None:
+        return {"_error": f"Kit '{args[0]}' not found"}
+
+    with os.scandir(kit_path) as entries:
+        files = {e.name: e.stat().st_size for e in entries if e.is_file()}
+    result = {"name": kit_path.name, "files": files}
+
     # Include script preview if exists
-    script = kit_path / "script.txt"
-    if script.exists():
-        result["script_preview"] = script.read_text(encoding='utf-8')[:300]
-    
+    if "script.txt" in files:
+        with open(kit_path / "script.txt", encoding='utf-8') as f:
+            result["script_preview"] = f.read(300)
     return result
 
-def get_commands_index() -> Dict[str, Any]:
-    """List available commands."""
-    return {
-        "_path": "commands",
-        "_type": "list",
-        "categories": {
-            "channel": ["list", "use", "status", "create"],
-            "brain": ["init", "show", "set-theme", "learn", "context"],
-            "content": ["kit create", "kit list", "kit publish"],
-            "research": ["scout", "scan comments"],
-            "analytics": ["sync", "retention"],
-            "system": ["health", "boot", "index", "config"]
-        }
-    }
+# --- System ---
 
-def get_config_index() -> Dict[str, Any]:
-    """Get system config."""
+COMMAND_CATEGORIES = {
+    "channel": ["list", "use", "status", "create"],
+    "brain": ["init", "show", "set-theme", "learn", "context", "compact"],
+    "content": ["kit create", "kit list", "kit publish"],
+    "research": ["scout", "scan comments"],
+    "analytics": ["sync", "retention"],
+    "llm": ["stats", "warm", "bench"],
+    "system": ["health", "boot", "index", "config"]
+}
+
+@provider("commands", "object", "CLI commands",
+          stub=lambda ctx, args: {"_count": sum(len(v) for v in COMMAND_CATEGORIES.values())},
+          needs_channel=False)
+def _commands(ctx, args, page):
+    return {"categories": COMMAND_CATEGORIES}
+
+@provider("config", "object", "System settings", needs_channel=False)
+def _config(ctx, args, page):
     global_cfg = load_global_config()
     return {
-        "_path": "config",
-        "_type": "object",
         "features": {
             "llm_swarm": global_cfg.features.llm_swarm if hasattr(global_cfg, 'features') else False
         }
     }
 
-def resolve_path(path: str, ctx) -> Dict[str, Any]:
-    """Resolve dot-notation path to data."""
-    if not path:
-        return get_system_index()
-    
-    parts = path.split('.')
-    root = parts[0]
-    
-    if root == "channels":
-        return get_system_index()["nodes"]["channels"]
-    elif root == "brain":
-        if len(parts) == 1:
-            return get_brain_index(ctx)
-        elif parts[1] == "themes":
-            if len(parts) == 2:
-                return get_brain_index(ctx)["themes"]
-            else:
-                return get_theme_content(ctx, parts[2])
-        elif parts[1] == "identity":
-            return get_brain_index(ctx)["identity"]
-        elif parts[1] == "audience":
-            return get_brain_index(ctx)["audience"]
-        elif parts[1] == "learnings":
-            return {"_path": "brain.learnings", "_type": "file", "content": load_learnings(ctx)}
-    elif root == "kits":
-        if len(parts) == 1:
-            return get_kits_index(ctx)
+# --- Resolution ---
+
+def _cached(prov: NodeProvider, ctx, args: List[str], key: str, build: Callable) -> Dict[str, Any]:
+    """build(), served from the sitemap cache while the provider's deps are unchanged."""
+    if prov.deps is None:
+        return build()
+    cache = get_sitemap(ctx if prov.needs_channel else None)
+    deps = prov.deps(ctx, args)
+    value = cache.get(key, deps)
+    if value is None:
+        value = build()
+        if "_error" not in value:
+            cache.put(key, deps, value)
+    return value
+
+def _stub(prov: NodeProvider, ctx, args: List[str]) -> Dict[str, Any]:
+    node = {"_type": prov.type, "_desc": prov.desc}
+    if prov.stub and (ctx or not prov.needs_channel):
+        key = "stub:" + '.'.join(prov.pattern).replace('*', '{}').format(*args)
+        try:
+            node.update(_cached(prov, ctx, args, key, lambda: prov.stub(ctx, args)))
+        except (OSError, ValueError) as e:
+            node["_error"] = str(e)
+    return node
+
+def _resolve(parts: List[str], ctx, depth: int, page: Dict[str, Any]) -> Dict[str, Any]:
+    path = '.'.join(parts)
+    prov, args = _match(parts)
+    if prov is None:
+        return {"_path": path, "_error": f"Unknown path: {path}"}
+    if prov.needs_channel and not ctx:
+        return {"_path": path, "_error": "No active channel. Run: contentos channel use <name>"}
+    if parts and parts[0] == "brain" and not brain_exists(ctx):
+        return {"_path": path, "_error": "Brain not initialized. Run: contentos brain init"}
+
+    node = {"_path": path, "_type": prov.type}
+    if prov.desc:
+        node["_desc"] = prov.desc
+    if depth <= 0:
+        node.update(_stub(prov, ctx, args))
+        return node
+
+    if prov.type == "file":
+        # Contents are one read away; only summaries are worth persisting
+        node.update(prov.build(ctx, args, page))
+    else:
+        query = '&'.join(f"{k}={v}" for k, v in sorted(page.items()) if v is not None)
+        key = f"node:{path}?{query}"
+        node.update(_cached(prov, ctx, args, key, lambda: prov.build(ctx, args, page)))
+    if "_error" in node:
+        return node
+
+    # Named children as stubs, or expanded while depth remains
+    for child in _children(prov.pattern):
+        key = child.pattern[-1]
+        if depth > 1:
+            node[key] = _resolve(parts + [key], ctx, depth - 1, {})
         else:
-            return get_kit_detail(ctx, parts[1])
-    elif root == "commands":
-        return get_commands_index()
-    elif root == "config":
-        return get_config_index()
-    
-    return {"_error": f"Unknown path: {path}"}
+            node[key] = _stub(child, ctx, args)
+
+    # List items expand through the wildcard provider
+    if depth > 1 and prov.type == "list" and prov.pattern + ('*',) in _PROVIDERS:
+        for item in node.get("_items", []):
+            node[item] = _resolve(parts + [item], ctx, depth - 1, {})
+    return node
+
+def resolve_path(path: str, ctx, depth: int = DEFAULT_DEPTH, after: Optional[str] = None,
+                 limit: int = DEFAULT_LIMIT, refresh: bool = False, status: Optional[str] = None,
+                 theme: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Resolve dot-notation path to data (refresh=True drops the cached sitemap first).
+    after/limit page list nodes; status/theme filter the kits list.
+    """
+    if refresh:
+        get_sitemap(None).clear()
+        if ctx:
+            get_sitemap(ctx).clear()
+    parts = path.split('.') if path else []
+    data = _resolve(parts, ctx, depth, {"after": after, "limit": limit, "status": status, "theme": theme})
+    save_all()
+    return data
 
 def format_human(data: Dict[str, Any], indent: int = 0) -> str:
     """Format data for human reading."""
@@ -209,6 +364,19 @@ def format_human(data: Dict[str, Any], indent: int = 0) -> str:
         return "\n".join(lines)
     if "_desc" in data:
         lines.append(f"{prefix}DESC: {data['_desc']}")
+    if "_items" in data:
+        count = data.get('_count')
+        lines.append(f"{prefix}ITEMS: {', '.join(data['_items']) or '(none)'}"
+                     + (f"  [{len(data['_items'])} of {count}]" if count is not None else ""))
+        if data.get('_active'):
+            lines.append(f"{prefix}ACTIVE: {data['_active']}")
+        if data.get('_filters'):
+            lines.append(f"{prefix}FILTERS: {', '.join(f'{k}={v}' for k, v in data['_filters'].items())}")
+        if data.get('_next'):
+            flags = ''.join(f" --{k} {v}" for k, v in (data.get('_filters') or {}).items())
+            lines.append(f"{prefix}MORE: contentos index {data['_path']} --after {data['_next']}{flags}")
+    if data.get('_note'):
+        lines.append(f"{prefix}NOTE: {data['_note']}")
     
     lines.append("")
     
@@ -221,28 +389,36 @@ def format_human(data: Dict[str, Any], indent: int = 0) -> str:
             if "_type" in val:
                 # It's a node reference
                 node_type = val.get('_type', 'object')
-                count = val.get('_count', '')
+                count = val.get('_count')
                 preview = val.get('_preview', '')
                 items = val.get('_items', [])
                 active = val.get('_active', '')
+                meta = f"{node_type}, {count}" if count is not None else node_type
                 
                 if items:
                     items_str = ', '.join(items[:5])
                     if len(items) > 5:
                         items_str += f" (+{len(items)-5} more)"
-                    lines.append(f"{prefix}[{key}] ({node_type}, {count}) -> {items_str}")
-                    if active:
-                        lines.append(f"{prefix}  ACTIVE: {active}")
+                    lines.append(f"{prefix}[{key}] ({meta}) -> {items_str}")
                 elif preview:
-                    lines.append(f"{prefix}[{key}] ({node_type}) -> {preview}")
+                    lines.append(f"{prefix}[{key}] ({meta}) -> {preview}")
                 else:
-                    lines.append(f"{prefix}[{key}] ({node_type})")
-                lines.append(f"{prefix}  Drill: contentos index {data.get('_path', '')}.{key}".replace('..', '.').strip('.'))
+                    lines.append(f"{prefix}[{key}] ({meta})")
+                if active:
+                    lines.append(f"{prefix}  ACTIVE: {active}")
+                parent = data.get('_path', '')
+                lines.append(f"{prefix}  Drill: contentos index {parent + '.' if parent else ''}{key}")
             else:
                 # Regular dict
                 for k, v in val.items():
                     if not k.startswith('_'):
                         lines.append(f"{prefix}{k}: {v}")
+        elif isinstance(val, list) and val and isinstance(val[0], dict):
+            # Compact summaries, one per line
+            for entry in val:
+                head = entry.get('id', '')
+                rest = ', '.join(f"{k}={v}" for k, v in entry.items() if k not in ('id', 'name'))
+                lines.append(f"{prefix}{head} {entry.get('name', '')}" + (f" ({rest})" if rest else ""))
         elif isinstance(val, list):
             lines.append(f"{prefix}{key}: {', '.join(str(v) for v in val[:5])}")
         elif key == "content":
@@ -261,12 +437,12 @@ def run(args):
     ctx = context_manager.get_current_context()
     path = args.path if hasattr(args, 'path') and args.path else ""
     use_json = args.json if hasattr(args, 'json') and args.json else False
+    depth = getattr(args, 'depth', None)
     
-    if not ctx and path and path != "commands":
-        print("[!] No active channel. Run: contentos channel use <name>")
-        return
-    
-    data = resolve_path(path, ctx)
+    data = resolve_path(path, ctx, depth=DEFAULT_DEPTH if depth is None else depth,
+                        after=getattr(args, 'after', None), limit=getattr(args, 'limit', None) or DEFAULT_LIMIT,
+                        refresh=getattr(args, 'refresh', False),
+                        status=getattr(args, 'status', None), theme=getattr(args, 'theme', None))
     
     if use_json:
         print(json.dumps(data, indent=2))
@@ -277,7 +453,7 @@ def run(args):
         print(format_human(data))
         print("\n" + "-" * 50)
         if not path:
-            print("Navigate: contentos index <path>")
+            print("Navigate: contentos index <path> [--depth N] [--after CURSOR --limit N]")
             print("Examples:")
             print("  contentos index brain")
             print("  contentos index brain.themes.loop")
@@ -5,17 +5,40 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.context import context_manager
-from core.ledger import get_next_project_id, list_production_kits
+from core.ledger import list_production_kits, find_production_kit, create_kit_folder, format_kit_id
 from core.templates import create_kit_files
-from core.brain import brain_exists, get_prompt_context, init_brain, list_themes
+from core.brain import brain_exists, assemble_prompt_context, get_brain_path, init_brain, list_themes
+
+WILDCARD_STRATEGY = (
+    "## EXPERIMENTAL WILDCARD\n"
+    "DO NOT reuse past successful hooks or physics.\n"
+    "You must TRY SOMETHING NEW to discover new viral ingredients.\n"
+    "1. Use a completely new Hook type (e.g. 'Confrontational', 'Silent').\n"
+    "2. Invert the usual Physics (e.g. if we usually Melt, trying Shattering).\n"
+    "3. Change the Audio Landscape (e.g. Silence instead of Bass).\n\n"
+)
+
+def is_wildcard_id(project_id: str) -> bool:
+    """Every 5th kit explores instead of exploiting the Viral DNA."""
+    return project_id.isdigit() and int(project_id) > 0 and int(project_id) % 5 == 0
 
 def cmd_create(args):
-    """Create a new production kit."""
+    """Create a new production kit. Returns its path (None on failure)."""
     ctx = context_manager.get_current_context()
     if not ctx:
         print("No active channel. Run: contentos channel use <name>")
         return
     
+    if getattr(args, 'from_plan', None):
+        cmd_create_from_plan(args)
+        return
+    if not args.name:
+        print("Usage: contentos kit create <name> [--theme T] | --from plan.yaml|plan.csv")
+        return
+    if getattr(args, 'batch', None):
+        cmd_create_batch(args)
+        return
+    
     # --- Theme Selection ---
     if args.theme is None:
         if brain_exists(ctx):
@@ -44,53 +67,39 @@ def cmd_create(args):
         else:
             args.theme = "loop"
 
-    project_id = get_next_project_id(ctx)
-    folder_name = f"{project_id}_{args.name.lower().replace(' ', '_')}"
-    kit_path = ctx.production_path / folder_name
+    project_id, kit_path = create_kit_folder(ctx, args.name.lower().replace(' ', '_'))
     
     # Load Viral DNA Strategy & AI Tokens
     strategy_text = ""
     
     # --- WILDCARD PROTOCOL (Prevent Local Maximums) ---
-    is_wildcard = False
-    try:
-        pid_num = int(project_id)
-        if pid_num > 0 and pid_num % 5 == 0:
-            is_wildcard = True
-            print(f"WILDCARD TRIGGERED (Kit {pid_num})")
-            print("   • Ignoring Viral DNA")
-            print("   • Injecting Experimental Strategy")
-            
-            strategy_text += "## EXPERIMENTAL WILDCARD\n"
-            strategy_text += "DO NOT reuse past successful hooks or physics.\n"
-            strategy_text += "You must TRY SOMETHING NEW to discover new viral ingredients.\n"
-            strategy_text += "1. Use a completely new Hook type (e.g. 'Confrontational', 'Silent').\n"
-            strategy_text += "2. Invert the usual Physics (e.g. if we usually Melt, trying Shattering).\n"
-            strategy_text += "3. Change the Audio Landscape (e.g. Silence instead of Bass).\n\n"
-    except:
-        pass
+    is_wildcard = is_wildcard_id(project_id)
+    if is_wildcard:
+        print(f"WILDCARD TRIGGERED (Kit {int(project_id)})")
+        print("   • Ignoring Viral DNA")
+        print("   • Injecting Experimental Strategy")
+        strategy_text += WILDCARD_STRATEGY
 
     if not is_wildcard:
         # --- BRAIN INTEGRATION (Replaces legacy strategy loading) ---
-        if brain_exists(ctx):
-            # Pass the selected theme to ensure correct context is loaded
-            brain_context = get_prompt_context(ctx, theme_override=args.theme)
-            strategy_text += brain_context
-            print(f"Injected Channel Brain context (Theme: {args.theme})")
-            # Fallback: Initialize brain if not exists
+        if not brain_exists(ctx):
             print("Brain not found. Initializing...")
             init_brain(ctx)
-            brain_context = get_prompt_context(ctx, theme_override=args.theme)
-            strategy_text += brain_context
-            print(f"Brain initialized and context injected.")
+        
+        # Pass the selected theme to ensure correct context is loaded.
+        # Channel protocols are packed into the same token budget.
+        # Learnings/research most similar to this kit are retrieved first.
+        context = assemble_prompt_context(ctx, theme_override=args.theme, include_protocols=True,
+                                          query=f"{args.name.replace('_', ' ')} {args.theme}")
+        strategy_text += context["text"]
+        print(f"Injected Channel Brain context (Theme: {args.theme}, ~{context['used']}/{context['budget']} tokens)")
 
-        # --- LOAD CHANNEL PROTOCOLS ---
-        protocol_path = ctx.brain_path / "protocols.md"
+        # --- CHANNEL PROTOCOLS ---
+        protocol_path = get_brain_path(ctx) / "protocols.md"
         if protocol_path.exists():
             print(f"\n[!] CHANNEL PROTOCOL DETECTED: {protocol_path.name}")
             try:
                 proto_content = protocol_path.read_text(encoding='utf-8')
-                strategy_text += "\n\n## CHANNEL PROTOCOLS\n" + proto_content + "\n"
                 
                 # Extract and print critical sections for the AI/User to see IMMEDIATELY
                 print("    > MANDATORY RULES:")
@@ -108,7 +117,7 @@ def cmd_create(args):
         print(f"Error creating kit files: {e}")
         return
     
-    print(f"Created: {ctx.name}/production/{folder_name}/")
+    print(f"Created: {ctx.name}/{kit_path.relative_to(ctx.path).as_posix()}/")
     print(f"   • script.txt ({args.theme} template)")
     print(f"   • prompt.txt ({args.formula} formula)")
     
@@ -151,6 +160,190 @@ def cmd_create(args):
             f"Generate assets: generate_image ...",
             f"Update Task List: Add '{args.name}' to task.md"
         ])
+    return kit_path
+
+def _create_worker(name: str, theme: str, formula: str):
+    """
+    One concurrent creator for --batch (runs in its own process).
+    Returns (kit path, None) or (None, error) - never raises, so one failed
+    creator doesn't take the batch down.
+    """
+    import contextlib
+    import io
+    from argparse import Namespace
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            kit_path = cmd_create(Namespace(name=name, theme=theme, formula=formula, batch=None))
+    except Exception as e:
+        return None, repr(e)
+    if kit_path:
+        return str(kit_path), None
+    lines = output.getvalue().strip().splitlines()
+    return None, lines[-1] if lines else "no kit created"  # cmd_create reports its own errors
+
+def cmd_create_batch(args):
+    """
+    Create --batch N kits with N concurrent creator processes, then check
+    every kit got its own id. Doubles as a throughput test of the id allocator.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from core.ledger import parse_kit_folder
+    
+    ctx = context_manager.get_current_context()
+    theme = args.theme or ctx.global_config.default_theme
+    workers = args.workers or min(args.batch, 32)
+    names = [f"{args.name.lower().replace(' ', '_')}_{i + 1}" for i in range(args.batch)]
+    
+    if not brain_exists(ctx):
+        init_brain(ctx)  # Once, before the creators race to do it
+    
+    print(f"Creating {args.batch} kits with {workers} concurrent creators (Theme: {theme}, Formula: {args.formula})...")
+    started = time.perf_counter()
+    paths, failed = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(name, pool.submit(_create_worker, name, theme, args.formula)) for name in names]
+        for name, future in futures:
+            try:
+                path, error = future.result()
+            except Exception as e:  # The worker process itself died
+                path, error = None, repr(e)
+            if path:
+                paths.append(path)
+            else:
+                failed.append((name, error))
+    elapsed = time.perf_counter() - started
+    
+    created = [Path(p) for p in paths]
+    ids = [parse_kit_folder(p.name)[0] for p in created]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    
+    print(f"Created {len(created)}/{args.batch} kits in {elapsed:.2f}s ({len(created) / elapsed:.1f} kits/s)")
+    if ids:
+        print(f"   Ids: {min(ids, key=int)} - {max(ids, key=int)}")
+    if duplicates:
+        print(f"[X] Duplicate ids handed out: {', '.join(duplicates)}")
+    elif not failed:
+        print("[OK] Every kit got a unique id and its own folder.")
+    if failed:
+        print(f"[!] {len(failed)} creator(s) failed:")
+        for name, error in failed:
+            print(f"   {name}: {error}")
+
+def _load_plan(path: Path):
+    """
+    Kit plan entries [{'name', 'theme', 'formula'}]. YAML: a list of names or
+    mappings (optionally under 'kits:'); CSV: a header row with name[,theme,formula].
+    """
+    if path.suffix.lower() == '.csv':
+        import csv
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+        rows = data.get('kits', []) if isinstance(data, dict) else data
+    
+    entries = []
+    for i, row in enumerate(rows, 1):
+        if isinstance(row, str):
+            row = {'name': row}
+        if not isinstance(row, dict) or not str(row.get('name') or '').strip():
+            raise ValueError(f"entry {i} has no name")
+        entries.append({
+            'name': str(row['name']).strip(),
+            'theme': str(row.get('theme') or '').strip() or None,
+            'formula': str(row.get('formula') or '').strip() or None
+        })
+    return entries
+
+def cmd_create_from_plan(args):
+    """
+    Create every kit in a plan file: brain context and protocols are loaded
+    once per theme, ids are allocated in one step, kit files are rendered in
+    parallel and the database is synced once at the end.
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from core.ledger import allocate_kit_ids, kit_folder_path
+    from core.templates import FORMULAS
+    from core.database import sync_projects
+    
+    ctx = context_manager.get_current_context()
+    plan_path = Path(args.from_plan)
+    try:
+        plan = _load_plan(plan_path)
+    except Exception as e:
+        print(f"[X] Could not read plan {plan_path}: {e}")
+        return
+    if not plan:
+        print(f"Plan {plan_path} has no kits.")
+        return
+    
+    for entry in plan:
+        entry['theme'] = entry['theme'] or args.theme or ctx.global_config.default_theme
+        entry['formula'] = entry['formula'] or args.formula
+    unknown = sorted({e['formula'] for e in plan if e['formula'] not in FORMULAS})
+    if unknown:
+        print(f"[X] Unknown formula(s) in plan: {', '.join(unknown)}. Choose from: {', '.join(FORMULAS)}")
+        return
+    
+    started = time.perf_counter()
+    if not brain_exists(ctx):
+        print("Brain not found. Initializing...")
+        init_brain(ctx)
+    
+    # Brain context (with protocols) once per theme instead of once per kit
+    contexts = {}
+    for theme in sorted({e['theme'] for e in plan}):
+        context = assemble_prompt_context(ctx, theme_override=theme, include_protocols=True, query=theme)
+        contexts[theme] = context["text"]
+        print(f"Loaded Channel Brain context for theme '{theme}' (~{context['used']}/{context['budget']} tokens)")
+    
+    # One allocation for the whole plan
+    jobs = []
+    for kit_id, entry in zip(allocate_kit_ids(ctx, len(plan)), plan):
+        slug = entry['name'].lower().replace(' ', '_')
+        kit_path = kit_folder_path(ctx, kit_id, slug)
+        kit_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            kit_path.mkdir()
+        except FileExistsError:
+            kit_id, kit_path = create_kit_folder(ctx, slug)
+        strategy = WILDCARD_STRATEGY if is_wildcard_id(kit_id) else contexts[entry['theme']]
+        jobs.append((kit_id, kit_path, entry, strategy))
+    
+    def render(job):
+        kit_id, kit_path, entry, strategy = job
+        create_kit_files(kit_path, entry['name'], entry['theme'], entry['formula'], strategy=strategy)
+        return kit_path
+    
+    created, failed = [], []
+    with ThreadPoolExecutor(max_workers=args.workers or 8) as pool:
+        futures = [(job, pool.submit(render, job)) for job in jobs]
+        for job, future in futures:
+            try:
+                created.append(future.result())
+            except Exception as e:
+                failed.append((job, e))
+    
+    synced = sync_projects(ctx, created) if created else 0
+    elapsed = time.perf_counter() - started
+    
+    print(f"\nCreated {len(created)}/{len(plan)} kits from {plan_path.name} in {elapsed:.2f}s "
+          f"(ids {jobs[0][0]} - {jobs[-1][0]}, {synced} synced to the database)")
+    wildcards = [job[0] for job in jobs if is_wildcard_id(job[0])]
+    if wildcards:
+        more = f" (+{len(wildcards) - 10} more)" if len(wildcards) > 10 else ""
+        print(f"   Wildcard kits (experimental strategy): {', '.join(wildcards[:10])}{more}")
+    for kit_id, kit_path, entry, _ in jobs[:10]:
+        print(f"   {kit_id}  {entry['name']:<30} {entry['theme']:<10} {entry['formula']}")
+    if len(jobs) > 10:
+        print(f"   ... and {len(jobs) - 10} more (contentos kit list)")
+    for (kit_id, kit_path, entry, _), error in failed:
+        print(f"[X] {kit_id} {entry['name']}: {error}")
 
 def cmd_list(args):
     """List all production kits."""
@@ -224,14 +417,13 @@ def cmd_publish(args):
     
     print(f"Marking kit {args.id} as published...")
     
-    kits = list_production_kits(ctx)
-    kit = next((k for k in kits if k['id'] == args.id), None)
+    kit = find_production_kit(ctx, args.id)
     if not kit:
         print(f"Kit {args.id} not found")
         return
 
     import yaml
-    kit_path = ctx.production_path / f"{kit['id']}_{kit['name']}"
+    kit_path = kit['path']
     yaml_path = kit_path / "kit.yaml"
     
     if not yaml_path.exists():
@@ -295,12 +487,12 @@ def cmd_link(args):
                 print("No videos found on channel to link.")
                 return
 
-            kit = next((k for k in kits if k['id'] == args.kit_id), None)
+            kit = find_production_kit(ctx, format_kit_id(int(args.kit_id))) if args.kit_id.isdigit() else None
             if not kit:
                 print(f"Kit {args.kit_id} not found")
                 return
             
-            kit_path = ctx.production_path / f"{kit['id']}_{kit['name']}"
+            kit_path = kit['path']
             yaml_path = kit_path / "kit.yaml"
             
             with open(yaml_path, 'r', encoding='utf-8') as f:
@@ -333,7 +525,7 @@ def cmd_link(args):
         print("-" * 60)
         unlinked = []
         for kit in kits:
-            kit_path = ctx.production_path / f"{kit['id']}_{kit['name']}"
+            kit_path = kit['path']
             yaml_path = kit_path / "kit.yaml"
             
             if yaml_path.exists():
@@ -407,12 +599,123 @@ def cmd_link(args):
     except Exception as e:
         print(f"Error: {e}")
 
+# DNA ingredient fields the LLM extracts (value = instruction in the JSON template)
+INGREDIENT_FIELDS = {
+    "hook_type": '"<one of: POV_Emotional, POV_Relatable, Question, Statement, Confrontational, Silent, Tutorial>"',
+    "audio_style": '"<one of: ASMR_Purr, Ambient_Silence, Music_Emotional, Music_Upbeat, SFX_Heavy, Voiceover>"',
+    "visual_style": '"<one of: Macro_Closeup, Wide_Establishing, POV_FirstPerson, Handheld_Raw, Cinematic_Smooth, Loop_Seamless>"',
+    "physics_type": '"<one of: Organic_Motion, Rigid_Body, Fluid_Sim, Particle_FX, Static_Hold, None>"',
+    "emotion": '"<primary emotion: Trust, Love, Curiosity, Satisfaction, Nostalgia, FOMO, Humor>"',
+    "duration_seconds": '<number>',
+    "clip_count": '<number>'
+}
+ENRICH_SYSTEM = "You are a content analyst. Extract structured data from video prompts. Return only valid JSON."
+ENRICH_PROMPT_CHARS = 3000  # Prompt text sent per kit
+ENRICH_MIN_CONFIDENCE = 0.6  # Pattern fields at or above this skip the LLM
+
+def _schema(fields) -> str:
+    """Renders the JSON template for the requested ingredient fields."""
+    lines = [f'    "{f}": {INGREDIENT_FIELDS[f]}' for f in fields]
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+def _build_enrich_prompt(prompt_content: str, fields) -> str:
+    """Single-kit extraction prompt (instructions first, so kits share a prompt prefix)."""
+    return f"""Analyze the video production prompt below and extract the DNA ingredients.
+
+Extract these ingredients as a JSON object:
+{_schema(fields)}
+
+Return ONLY valid JSON, no explanation.
+
+PROMPT CONTENT:
+{prompt_content[:ENRICH_PROMPT_CHARS]}"""
+
+def _build_batch_enrich_prompt(items, fields) -> str:
+    """Multi-kit extraction prompt; the answer is keyed by kit id."""
+    blocks = "\n\n".join(
+        f"=== KIT {item['kit']['id']} ===\n{item['prompt'][:ENRICH_PROMPT_CHARS]}" for item in items
+    )
+    ids = ", ".join(f'"{item["kit"]["id"]}"' for item in items)
+    return f"""Analyze each of the video production prompts below and extract the DNA ingredients.
+
+For EVERY kit, extract these ingredients:
+{_schema(fields)}
+
+Return ONLY a JSON object of this shape, no explanation:
+{{"kits": [{{"kit_id": "<kit id>", ...ingredients}}]}}
+
+{blocks}
+
+Include exactly one entry per kit id ({len(items)} kits): {ids}."""
+
+def _parse_batch_response(response: str) -> dict:
+    """
+    Maps kit id -> ingredient dict from a batch response (tolerates dict-keyed
+    answers). Ids are normalized ('7' or 7 -> '007'); non-numeric ones are skipped.
+    """
+    import json
+    data = json.loads(response)
+    entries = data.get("kits", data) if isinstance(data, dict) else data
+    
+    results = {}
+    if isinstance(entries, dict):
+        entries = [dict(v, kit_id=k) for k, v in entries.items() if isinstance(v, dict)]
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        kit_id = str(entry.get("kit_id", "")).strip()
+        if kit_id.isdigit():
+            results[format_kit_id(int(kit_id))] = entry
+    return results
+
+def _llm_extract(items, batch_size: int) -> dict:
+    """
+    Extracts ingredients for many kits via the LLM.
+    
+    Each item carries the `fields` it still needs. Kits needing the same
+    fields are packed `batch_size` per request and the requests run
+    concurrently (llm.max_parallel). Returns kit id -> ingredient dict for
+    every kit that got a usable answer; missing ids are left for the
+    pattern values.
+    """
+    import json
+    from core.llm import ask_many
+    
+    batch_size = max(1, batch_size)
+    groups = {}
+    for item in items:
+        groups.setdefault(tuple(item['fields']), []).append(item)
+    
+    batches, prompts = [], []
+    for fields, group in groups.items():
+        for i in range(0, len(group), batch_size):
+            batch = group[i:i+batch_size]
+            batches.append(batch)
+            prompts.append(_build_enrich_prompt(batch[0]['prompt'], fields) if len(batch) == 1
+                           else _build_batch_enrich_prompt(batch, fields))
+    
+    print(f"[*] Asking LLM: {len(items)} kits in {len(batches)} requests...")
+    responses = ask_many(prompts, system=ENRICH_SYSTEM, json_mode=True, task="extract")
+    
+    extracted = {}
+    for batch, response in zip(batches, responses):
+        if response is None:
+            continue
+        try:
+            if len(batch) == 1:
+                result = json.loads(response)
+                if isinstance(result, dict):
+                    extracted[batch[0]['kit']['id']] = result
+            else:
+                extracted.update(_parse_batch_response(response))
+        except (ValueError, AttributeError, TypeError):
+            continue
+    return extracted
+
 def cmd_enrich(args):
     """Use LLM to extract DNA ingredients from prompt.txt and update kit.yaml."""
     import yaml
-    import json
-    import re
-    from core.llm import ask, ensure_ollama_running
+    from core.llm import ensure_ollama_running
     
     ctx = context_manager.get_current_context()
     if not ctx:
@@ -424,19 +727,20 @@ def cmd_enrich(args):
     if not llm_available:
         print("[!] LLM not available. Using pattern-based extraction.")
     
-    kits = list_production_kits(ctx)
-    
     # If specific kit ID provided, only process that one
     if hasattr(args, 'kit_id') and args.kit_id:
-        kits = [k for k in kits if k['id'] == args.kit_id]
+        kit = find_production_kit(ctx, args.kit_id)
+        kits = [kit] if kit else []
         if not kits:
             print(f"Kit {args.kit_id} not found")
             return
+    else:
+        kits = list_production_kits(ctx)
     
-    enriched_count = 0
-    
+    # 1. Collect kits that need (re-)analysis
+    pending = []
     for kit in kits:
-        kit_path = ctx.production_path / f"{kit['id']}_{kit['name']}"
+        kit_path = kit['path']
         prompt_path = kit_path / "prompt.txt"
         yaml_path = kit_path / "kit.yaml"
         
@@ -462,42 +766,43 @@ def cmd_enrich(args):
                 print(f"[✓] {kit['id']} already enriched, skipping (use --force to re-analyze)")
                 continue
         
-        print(f"[*] Analyzing {kit['id']}_{kit['name']}...")
-        
-        extracted = None
-        
-        # Try LLM first if available
-        if llm_available:
-            extraction_prompt = f"""Analyze this video production prompt and extract the DNA ingredients.
-
-PROMPT CONTENT:
-{prompt_content[:3000]}
-
-Extract these ingredients as a JSON object:
-{{
-    "hook_type": "<one of: POV_Emotional, POV_Relatable, Question, Statement, Confrontational, Silent, Tutorial>",
-    "audio_style": "<one of: ASMR_Purr, Ambient_Silence, Music_Emotional, Music_Upbeat, SFX_Heavy, Voiceover>",
-    "visual_style": "<one of: Macro_Closeup, Wide_Establishing, POV_FirstPerson, Handheld_Raw, Cinematic_Smooth, Loop_Seamless>",
-    "physics_type": "<one of: Organic_Motion, Rigid_Body, Fluid_Sim, Particle_FX, Static_Hold, None>",
-    "emotion": "<primary emotion: Trust, Love, Curiosity, Satisfaction, Nostalgia, FOMO, Humor>",
-    "duration_seconds": <number>,
-    "clip_count": <number>
-}}
-
-Return ONLY valid JSON, no explanation."""
-
-            try:
-                result = ask(extraction_prompt, 
-                            system="You are a content analyst. Extract structured data from video prompts. Return only valid JSON.",
-                            temperature=0.3,
-                            json_mode=True)
-                extracted = json.loads(result)
-            except:
-                print("   [!] LLM failed, falling back to pattern extraction")
+        pending.append({'kit': kit, 'yaml_path': yaml_path, 'data': kit_data, 'prompt': prompt_content})
+    
+    # 2. Pattern pass; only low-confidence fields go to the LLM
+    threshold = getattr(args, 'min_confidence', None)
+    if threshold is None:
+        threshold = ENRICH_MIN_CONFIDENCE
+    from core.keywords import get_ingredient_engine
+    scans = get_ingredient_engine().scan_many(item['prompt'] for item in pending)
+    for item, scan in zip(pending, scans):
+        item['patterns'], confidence = _extract_patterns(item['prompt'], with_confidence=True, scan=scan)
+        item['fields'] = [f for f in INGREDIENT_FIELDS if confidence[f] < threshold]
+    
+    uncertain = [item for item in pending if item['fields']]
+    if pending:
+        print(f"[*] Patterns resolved {len(pending) - len(uncertain)}/{len(pending)} kits outright")
+    
+    # 3. LLM extraction for the rest (batched + concurrent)
+    llm_results = {}
+    if llm_available and uncertain:
+        llm_results = _llm_extract(uncertain, getattr(args, 'batch', 1) or 1)
+    
+    # 4. Write results, falling back to patterns per kit
+    enriched_count = 0
+    for item in pending:
+        kit = item['kit']
+        kit_data = item['data']
+        print(f"[*] {kit['id']}_{kit['name']}")
         
-        # Fallback: Pattern-based extraction
-        if not extracted:
-            extracted = _extract_patterns(prompt_content)
+        extracted = dict(item['patterns'])
+        answer = llm_results.get(kit['id'])
+        resolved = [f for f in item['fields'] if answer and answer.get(f) is not None]
+        if resolved:
+            extracted.update({f: answer[f] for f in resolved})
+            print(f"   (LLM resolved: {', '.join(resolved)})")
+        elif item['fields'] and llm_available:
+            print("   [!] LLM failed, falling back to pattern extraction")
+        else:
             print("   (Using pattern-based extraction)")
         
         if extracted:
@@ -514,7 +819,7 @@ Return ONLY valid JSON, no explanation."""
             kit_data['ingredients']['clip_count'] = extracted.get('clip_count', 2)
             
             # Write updated kit.yaml
-            with open(yaml_path, 'w', encoding='utf-8') as f:
+            with open(item['yaml_path'], 'w', encoding='utf-8') as f:
                 yaml.dump(kit_data, f, default_flow_style=False, allow_unicode=True)
             
             print(f"   ✓ Extracted: {extracted.get('hook_type')} + {extracted.get('emotion')} + {extracted.get('audio_style')}")
@@ -533,79 +838,76 @@ Return ONLY valid JSON, no explanation."""
             "View updated kits: python contentos.py kit list"
         ])
 
-def _extract_patterns(prompt_content: str) -> dict:
-    """Fallback pattern-based extraction when LLM is unavailable."""
-    import re
+def _keyword_confidence(hits: int, rivals: int = 0, default: float = 0.2) -> float:
+    """Confidence for a keyword-derived value: more hits raise it, competing labels lower it."""
+    if hits == 0:
+        return default if rivals == 0 else 0.2
+    return round(max(0.3, min(0.95, 0.5 + 0.2 * hits) - 0.15 * rivals), 2)
+
+def _label_confidence(hits: dict, label: str, default: float = 0.2) -> float:
+    """_keyword_confidence for `label` against the other labels hit in its group."""
+    return _keyword_confidence(hits.get(label, 0), sum(1 for k in hits if k != label), default)
+
+def _extract_patterns(prompt_content: str, with_confidence: bool = False, scan: dict = None):
+    """
+    Pattern-based extraction from keyword hits (see core.keywords).
+    
+    Returns the ingredient dict, or (ingredients, confidence) with a 0-1
+    score per field when with_confidence is set. Pass a precomputed `scan`
+    from KeywordEngine.scan_many to skip re-scanning.
+    """
+    from core.keywords import get_ingredient_engine
     
-    content_lower = prompt_content.lower()
+    if scan is None:
+        scan = get_ingredient_engine().scan(prompt_content)
+    groups = scan['groups']
+    confidence = {}
     
     # Hook Type Detection
     hook_type = "Unknown"
-    if "pov" in content_lower or "pov:" in content_lower:
-        if any(w in content_lower for w in ["adopt", "chose", "love", "trust", "emotional"]):
+    confidence['hook_type'] = 0.0
+    if "POV" in groups['hook']:
+        emotional = groups['hook_cue'].get("Emotional", 0)
+        if emotional:
             hook_type = "POV_Emotional"
+            confidence['hook_type'] = _keyword_confidence(1 + emotional)
         else:
             hook_type = "POV_Relatable"
+            confidence['hook_type'] = 0.5  # POV without emotional cues is a guess
     elif "?" in prompt_content[:200]:
         hook_type = "Question"
-    elif "tutorial" in content_lower or "how to" in content_lower:
+        confidence['hook_type'] = 0.7
+    elif "Tutorial" in groups['hook']:
         hook_type = "Tutorial"
+        confidence['hook_type'] = _keyword_confidence(groups['hook']["Tutorial"])
     
     # Audio Style Detection
-    audio_style = "Ambient_Silence"
-    if "asmr" in content_lower or "purr" in content_lower:
-        audio_style = "ASMR_Purr"
-    elif "music" in content_lower:
-        audio_style = "Music_Emotional"
-    elif "voiceover" in content_lower or "narrator" in content_lower:
-        audio_style = "Voiceover"
+    audio_style = next(iter(groups['audio']), "Ambient_Silence")
+    confidence['audio_style'] = _label_confidence(groups['audio'], audio_style)
+    if audio_style == "Music_Emotional":
+        confidence['audio_style'] = min(confidence['audio_style'], 0.5)  # Emotional vs upbeat is ambiguous
     
     # Visual Style Detection
-    visual_style = "Handheld_Raw"
-    if "macro" in content_lower or "close-up" in content_lower or "closeup" in content_lower:
-        visual_style = "Macro_Closeup"
-    elif "pov" in content_lower or "first person" in content_lower:
-        visual_style = "POV_FirstPerson"
-    elif "loop" in content_lower or "seamless" in content_lower:
-        visual_style = "Loop_Seamless"
-    elif "cinematic" in content_lower:
-        visual_style = "Cinematic_Smooth"
-    elif "handheld" in content_lower or "home video" in content_lower:
-        visual_style = "Handheld_Raw"
+    visual_style = next(iter(groups['visual']), "Handheld_Raw")
+    confidence['visual_style'] = _label_confidence(groups['visual'], visual_style)
     
     # Physics Type Detection
-    physics_type = "Organic_Motion"
-    if "rigid" in content_lower:
-        physics_type = "Rigid_Body"
-    elif "fluid" in content_lower or "water" in content_lower:
-        physics_type = "Fluid_Sim"
-    elif "particle" in content_lower:
-        physics_type = "Particle_FX"
-    elif "static" in content_lower:
-        physics_type = "Static_Hold"
+    physics_type = next(iter(groups['physics']), "Organic_Motion")
+    confidence['physics_type'] = _label_confidence(groups['physics'], physics_type,
+                                                   default=0.6)  # Most footage is organic motion
     
     # Emotion Detection
-    emotion = "Trust"
-    emotion_map = {
-        "love": "Love", "trust": "Trust", "curious": "Curiosity",
-        "satisfy": "Satisfaction", "nostalg": "Nostalgia", 
-        "fomo": "FOMO", "humor": "Humor", "funny": "Humor",
-        "adopt": "Love", "emotional": "Love", "dream": "Curiosity"
-    }
-    for keyword, emo in emotion_map.items():
-        if keyword in content_lower:
-            emotion = emo
-            break
-    
-    # Duration Detection
-    duration_match = re.search(r'(\d+)\s*(?:second|sec|s\b)', content_lower)
-    duration = int(duration_match.group(1)) if duration_match else 16
+    emotion = next(iter(groups['emotion']), "Trust")
+    confidence['emotion'] = _label_confidence(groups['emotion'], emotion)
     
-    # Clip Count Detection
-    clip_match = re.search(r'(\d+)\s*(?:clip|scene|segment)', content_lower)
-    clip_count = int(clip_match.group(1)) if clip_match else 2
+    # Duration / Clip Count Detection
+    captures = scan['captures']
+    duration = int(captures['duration']) if 'duration' in captures else 16
+    confidence['duration_seconds'] = 0.9 if 'duration' in captures else 0.3
+    clip_count = int(captures['clips']) if 'clips' in captures else 2
+    confidence['clip_count'] = 0.9 if 'clips' in captures else 0.3
     
-    return {
+    result = {
         "hook_type": hook_type,
         "audio_style": audio_style,
         "visual_style": visual_style,
@@ -614,6 +916,9 @@ def _extract_patterns(prompt_content: str) -> dict:
         "duration_seconds": duration,
         "clip_count": clip_count
     }
+    if with_confidence:
+        return result, confidence
+    return result
 
 def cmd_suggest(args):
     """Get kit suggestions based on performance data."""
@@ -706,6 +1011,77 @@ def cmd_suggest(args):
     conn.close()
 
 
+def cmd_migrate(args):
+    """Move kit folders into production/<bucket>/ folders (or back to flat with --shard-size 0)."""
+    ctx = context_manager.get_current_context()
+    if not ctx:
+        print("No active channel.")
+        return
+    if args.shard_size < 0:
+        print("--shard-size must be 0 (flat) or a positive number of kits per folder")
+        return
+    
+    if not ctx.production_path.exists():
+        print("No production folder yet - nothing to migrate.")
+        return
+    
+    from core.ledger import kit_bucket, BUCKET_RE, KIT_COUNTER_FILE
+    from core.filelock import file_lock
+    from core.config import save_channel_config
+    layout = f"buckets of {args.shard_size}" if args.shard_size else "a flat production/ folder"
+    
+    # Holding the id allocator's lock keeps 'kit create' from adding kits mid-move
+    with file_lock(ctx.path / KIT_COUNTER_FILE, timeout=60):
+        moves = []
+        for kit in list_production_kits(ctx):
+            bucket = kit_bucket(kit['id'], args.shard_size)
+            parent = ctx.production_path / bucket if bucket else ctx.production_path
+            dest = parent / kit['path'].name
+            if dest != kit['path']:
+                moves.append((kit['path'], dest))
+        
+        print(f"Migrating {ctx.name} to {layout}: {len(moves)} kit(s) to move")
+        for src, dest in moves[:10]:
+            print(f"   {src.relative_to(ctx.production_path).as_posix()} -> {dest.relative_to(ctx.production_path).as_posix()}")
+        if len(moves) > 10:
+            print(f"   ... and {len(moves) - 10} more")
+        if args.dry_run:
+            print("\n(dry run - nothing moved)")
+            return
+        
+        moved, skipped, failed = 0, [], []
+        for src, dest in moves:
+            if dest.exists():
+                skipped.append(dest)
+                continue
+            try:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                src.rename(dest)
+                moved += 1
+            except OSError as e:
+                failed.append((src, e))
+        
+        # Drop buckets left empty
+        for bucket_dir in ctx.production_path.iterdir():
+            if bucket_dir.is_dir() and BUCKET_RE.match(bucket_dir.name) and not any(bucket_dir.iterdir()):
+                bucket_dir.rmdir()
+        
+        # With failures some kits are still in the old layout: keep the old setting so a rerun finishes the job
+        if not failed:
+            ctx.config.production_shard_size = args.shard_size
+            save_channel_config(ctx.name, ctx.config)
+    
+    if failed:
+        print(f"\n[!] Moved {moved} kit(s), {len(failed)} failed; the layout setting was not changed. Fix and rerun:")
+        for src, error in failed:
+            print(f"[X] {src.relative_to(ctx.production_path).as_posix()}: {error}")
+    else:
+        print(f"\n[OK] Moved {moved} kit(s); new kits will be created in {layout}.")
+    for dest in skipped:
+        print(f"[!] Skipped, already exists: {dest.relative_to(ctx.production_path).as_posix()}")
+    if moved:
+        print("   Asset paths in the database still point at the old folders. Run: contentos db sync")
+
 def run(args):
     """Main entry point for kit command."""
     if args.kit_action == 'create':
@@ -720,5 +1096,7 @@ def run(args):
         cmd_enrich(args)
     elif args.kit_action == 'suggest':
         cmd_suggest(args)
+    elif args.kit_action == 'migrate':
+        cmd_migrate(args)
     else:
-        print("Usage: contentos kit {create|list|publish|link|enrich|suggest}")
+        print("Usage: contentos kit {create|list|publish|link|enrich|suggest|migrate}")
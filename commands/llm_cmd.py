@@ -0,0 +1,128 @@
+"""LLM command - Inspect local model usage."""
+import time
+
+from core import llm_telemetry
+
+def run(args):
+    """Entry point for llm command."""
+    if args.llm_action == 'stats':
+        cmd_stats(args)
+    elif args.llm_action == 'warm':
+        cmd_warm(args)
+    elif args.llm_action == 'fake-server':
+        cmd_fake_server(args)
+    elif args.llm_action == 'bench':
+        cmd_bench(args)
+    else:
+        print("Usage: contentos llm {stats|warm|fake-server|bench}")
+
+def _fake_config(args):
+    from core.fake_ollama import FakeOllamaConfig
+    return FakeOllamaConfig(
+        load_ms=args.load_ms,
+        latency_ms=args.latency_ms,
+        tokens_per_sec=args.tps,
+        response_tokens=args.response_tokens,
+        num_parallel=args.server_parallel
+    )
+
+def cmd_stats(args):
+    """Latency and throughput per command and model from the telemetry log."""
+    if getattr(args, 'clear', False):
+        llm_telemetry.clear()
+        print("[OK] LLM telemetry cleared.")
+        return
+
+    since = time.time() - args.days * 86400 if args.days else None
+    rows = llm_telemetry.summarize(since)
+    if not rows:
+        print("No LLM calls recorded yet.")
+        print("   (Calls are logged to .contentos/llm_telemetry.db unless llm.telemetry_enabled is off)")
+        return
+
+    window = f"last {args.days} days" if args.days else "all time"
+    print(f"\nLLM TELEMETRY ({window})")
+    print("=" * 100)
+    print(f"{'Command':<18} {'Model':<24} {'Calls':>5} {'Cache':>5} {'Err':>4} "
+          f"{'p50':>7} {'p95':>7} {'Total':>8} {'In tok':>7} {'Out tok':>7} {'tok/s':>6}")
+    print("-" * 100)
+    for r in rows:
+        print(f"{r['command'][:18]:<18} {r['model'][:24]:<24} {r['calls']:>5} {r['cache_hits']:>5} {r['errors']:>4} "
+              f"{r['p50_ms'] / 1000:>6.1f}s {r['p95_ms'] / 1000:>6.1f}s {r['total_s']:>7.1f}s "
+              f"{r['avg_prompt_tokens']:>7.0f} {r['avg_output_tokens']:>7.0f} {r['tokens_per_sec']:>6.1f}")
+    print("-" * 100)
+    print("p50/p95: wall-clock latency of uncached calls | In/Out tok: average per call")
+    print("tok/s: output tokens per second of model eval time (excludes load and prompt processing)")
+
+    total_load = sum(r['load_s'] for r in rows)
+    if total_load > 1:
+        print(f"\n[!] {total_load:.1f}s spent loading models. Keep them warm between calls to avoid this.")
+
+def cmd_warm(args):
+    """Load the model now so the next commands skip the load (held for llm.keep_alive)."""
+    from core import llm
+    context = ""
+    if args.brain:
+        from core.context import context_manager
+        from core.brain import brain_exists, get_prompt_context
+        ctx = context_manager.get_current_context()
+        if not ctx or not brain_exists(ctx):
+            print("No brain for the active channel; loading the model only.")
+        else:
+            context = get_prompt_context(ctx)
+    
+    if not llm.ensure_ollama_running():
+        print("[X] Ollama is not reachable.")
+        return
+    
+    result = llm.warm(args.model, context=context, task=args.task)
+    if not result['ok']:
+        print(f"[X] Could not load {result['model']}: {result['error']}")
+        return
+    keep_alive = llm._llm_config().keep_alive or "server default"
+    print(f"[OK] {result['model']} loaded in {result['wall_s']:.1f}s "
+          f"(model load {result['load_s']:.1f}s, kept for {keep_alive}).")
+    if context:
+        print(f"   Brain context evaluated: {result['prompt_tokens']} prompt tokens now cached for "
+              f"calls that share it.")
+
+def cmd_fake_server(args):
+    """Serve the fake Ollama API in the foreground (Ctrl+C to stop)."""
+    from core.fake_ollama import FakeOllama
+    server = FakeOllama(_fake_config(args), port=args.port)
+    print(f"Fake Ollama listening on {server.url} (model: {', '.join(server.config.models)})")
+    print(f"   Point ContentOS at it: OLLAMA_HOST={server.url} python contentos.py ...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.stop()
+
+def cmd_bench(args):
+    """Run real commands against the fake server in a sandbox channel."""
+    from core.llm_bench import run_benchmark, SCENARIOS
+    scenarios = args.scenarios.split(',') if args.scenarios else SCENARIOS
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}. Choose from: {', '.join(SCENARIOS)}")
+        return
+
+    fake = _fake_config(args)
+    print(f"\nPIPELINE BENCHMARK (fake Ollama: {fake.latency_ms:.0f}ms latency, {fake.tokens_per_sec:.0f} tok/s, "
+          f"{fake.num_parallel} parallel slots)")
+    print(f"Sandbox: {args.kits} kits, {args.comments} comments, enrich batch {args.batch}, "
+          f"client parallel {args.parallel or 'config'}, cache {'on' if args.cache else 'off'}")
+    rows = run_benchmark(scenarios, fake, kits=args.kits, comments=args.comments, batch=args.batch,
+                         parallel=args.parallel, cache=args.cache, verbose=args.verbose)
+
+    print("=" * 78)
+    print(f"{'Scenario':<12} {'Calls':>6} {'Err':>4} {'Wall':>8} {'Model':>8} {'Overhead':>10} {'Calls/s':>8} {'Peak':>5}")
+    print("-" * 78)
+    for r in rows:
+        rate = r['calls'] / r['wall_s'] if r['wall_s'] else 0.0
+        print(f"{r['scenario']:<12} {r['calls']:>6} {r['errors']:>4} {r['wall_s']:>7.2f}s {r['server_s']:>7.2f}s "
+              f"{r['overhead_ms']:>8.1f}ms {rate:>8.1f} {r['peak_parallel']:>5}")
+    print("-" * 78)
+    print("Model: simulated server time summed over calls | Overhead: mean client wall minus server time per call")
+    print("Peak: most requests the server saw at once (concurrency actually achieved)")
@@ -9,7 +9,29 @@ from core.context import context_manager
 from core.community import fetch_comments, analyze_community_sentiment
 from core.database import get_db_path
 
-BATCH_SIZE = 50  # Comments per LLM batch
+COMMENT_LIMIT = 500  # Most-liked comments analyzed by default (--limit)
+MAP_BATCH_TOKENS = 1500  # Comment text packed into each MAP prompt
+COMMENT_MAX_CHARS = 400  # Longer comments are clipped
+REDUCE_INPUT_TOKENS = 3000  # Summaries per REDUCE prompt; above this, reduce in a tree
+MAX_REDUCE_LEVELS = 6
+
+# Shared instructions go first (as llm context) so every batch prompt starts
+# with the same prefix and Ollama only evaluates the comments themselves.
+MAP_INSTRUCTIONS = """Analyze the YouTube comments you are given.
+Extract:
+1. Top 3 themes/topics mentioned.
+2. Key audience requests or questions.
+3. Negative feedback or complaints.
+
+Output: Concise bullet points only."""
+
+MERGE_INSTRUCTIONS = """You are given partial analyses of YouTube comments, separated by ---.
+Merge them into ONE concise summary keeping:
+1. Top themes/topics (with rough frequency).
+2. Audience requests or questions.
+3. Negative feedback or complaints.
+
+Output: Concise bullet points only."""
 
 def cmd_comments(args):
     """Scan recent video comments."""
@@ -40,19 +62,81 @@ def cmd_comments(args):
     # --- LLM ANALYST INJECTION ---
     if ctx.global_config.features.llm_swarm:
         print("\nActivating The Analyst (Map-Reduce)...")
-        run_analyst(ctx)
+        run_analyst(ctx, limit=getattr(args, 'limit', None) or COMMENT_LIMIT)
     else:
         print("\nThe Analyst disabled (Feature: llm_swarm=OFF).")
         print("Use 'contentos config enable llm_swarm' to unlock AI insights.")
 
-def run_analyst(ctx):
+def pack_batches(comments, budget: int = MAP_BATCH_TOKENS):
+    """
+    Greedily packs comments into batches of about `budget` tokens.
+    Short comments share a round trip; a batch always holds at least one.
+    """
+    from core.brain import estimate_tokens
+    batches, current, used = [], [], 0
+    for comment in comments:
+        line = f"- {comment[:COMMENT_MAX_CHARS]}"
+        cost = estimate_tokens(line) + 1
+        if current and used + cost > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def reduce_tree(summaries, total_comments: int, budget: int = REDUCE_INPUT_TOKENS):
+    """
+    Condenses summaries until they fit one REDUCE prompt.
+    
+    Each level groups neighbouring summaries up to `budget` tokens and merges
+    every group with one LLM call (concurrently), so per-call prompt size
+    stays bounded however many MAP batches there were.
+    """
+    from core.llm import ask_many
+    from core.brain import estimate_tokens
+    
+    level = 0
+    while estimate_tokens("\n\n---\n\n".join(summaries)) > budget and level < MAX_REDUCE_LEVELS:
+        level += 1
+        groups, current, used = [], [], 0
+        for summary in summaries:
+            cost = estimate_tokens(summary) + 2
+            if current and used + cost > budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(summary)
+            used += cost
+        groups.append(current)
+        
+        prompts = []
+        for group in groups:
+            group_text = "\n\n---\n\n".join(group)
+            prompts.append(f"Partial analyses (covering part of {total_comments} comments):\n\n{group_text}")
+        
+        print(f"   REDUCE level {level}: {len(summaries)} summaries -> {len(groups)} partial reductions...")
+        # Partial merges are bulk work, so they run on the batch-summary route
+        results = ask_many(prompts, system="You are a community analyst.", context=MERGE_INSTRUCTIONS,
+                           cache=True, task="summarize-batch")
+        # A failed group keeps its inputs so nothing is silently dropped
+        merged = []
+        for group, result in zip(groups, results):
+            merged.extend([result] if result is not None else group)
+        if len(merged) >= len(summaries):
+            print("   [!] Partial reductions made no progress; reducing what we have.")
+            break
+        summaries = merged
+    return summaries
+
+def run_analyst(ctx, limit: int = COMMENT_LIMIT):
     """Map-Reduce pattern for comment analysis."""
-    from core.llm import ask
+    from core.llm import ask, ask_many, is_error
     
-    # 1. Load ALL comments from DB
+    # 1. Load the most-liked comments from DB
     conn = sqlite3.connect(get_db_path(ctx))
     cursor = conn.cursor()
-    cursor.execute('SELECT text_original FROM comments ORDER BY like_count DESC LIMIT 500')
+    cursor.execute('SELECT text_original FROM comments ORDER BY like_count DESC LIMIT ?', (limit,))
     all_comments = [row[0] for row in cursor.fetchall()]
     conn.close()
     
@@ -62,32 +146,34 @@ def run_analyst(ctx):
 
     print(f"   Loaded {len(all_comments)} comments.")
     
-    # 2. MAP PHASE: Batch summaries
-    batches = [all_comments[i:i+BATCH_SIZE] for i in range(0, len(all_comments), BATCH_SIZE)]
-    batch_summaries = []
+    # 2. MAP PHASE: Token-packed batch summaries (run concurrently, collected in order)
+    batches = pack_batches(all_comments)
+    prompts = []
+    for batch in batches:
+        batch_text = "\n".join(batch)
+        prompts.append(f"Comments ({len(batch)}):\n{batch_text}")
     
-    print(f"   Running MAP phase ({len(batches)} batches)...")
-    for i, batch in enumerate(batches):
-        batch_text = "\n".join([f"- {c[:100]}" for c in batch])
-        
-        prompt = f"""
-        Analyze these {len(batch)} YouTube comments.
-        Extract: 
-        1. Top 3 themes/topics mentioned.
-        2. Key audience requests or questions.
-        3. Negative feedback or complaints.
-        
-        Comments:
-        {batch_text}
-        
-        Output: Concise bullet points only.
-        """
-        
-        summary = ask(prompt, system="You are a community analyst.", temperature=0.5)
-        batch_summaries.append(summary)
-        print(f"     Batch {i+1}/{len(batches)} processed.")
+    workers = min(ctx.global_config.llm.max_parallel, len(batches))
+    print(f"   Running MAP phase ({len(batches)} batches of ~{MAP_BATCH_TOKENS} tokens, {workers} in parallel)...")
+    
+    def report(i, ok):
+        status = "processed" if ok else "FAILED"
+        print(f"     Batch {i+1}/{len(batches)} {status}.")
+    
+    # Same comments -> same batch prompt, so re-scans reuse cached summaries
+    results = ask_many(prompts, system="You are a community analyst.", context=MAP_INSTRUCTIONS,
+                       cache=True, max_workers=workers, on_done=report, task="summarize-batch")
+    batch_summaries = [r for r in results if r is not None]
+    
+    failed = len(results) - len(batch_summaries)
+    if not batch_summaries:
+        print("   [!] Every MAP batch failed. Is Ollama running? Aborting analysis.")
+        return
+    if failed:
+        print(f"   [!] {failed}/{len(batches)} batches failed; reducing the remaining {len(batch_summaries)}.")
 
-    # 3. REDUCE PHASE: Aggregate
+    # 3. REDUCE PHASE: Tree-reduce until the summaries fit one prompt, then aggregate
+    batch_summaries = reduce_tree(batch_summaries, len(all_comments))
     print("   Running REDUCE phase...")
     all_summaries = "\n\n---\n\n".join(batch_summaries)
     
@@ -106,14 +192,13 @@ def run_analyst(ctx):
     Output: Clean Markdown.
     """
     
-    final_report = ask(reduce_prompt, system="You are a senior content strategist.", temperature=0.7)
-    
-    # 4. Print & Save
     print("\nANALYST REPORT:")
-    safe_report = final_report.encode('ascii', 'ignore').decode('ascii')
-    print(safe_report)
+    final_report = ask(reduce_prompt, system="You are a senior content strategist.", stream=True, task="reduce")
+    if is_error(final_report):
+        print(f"   [!] REDUCE phase failed ({final_report}). Report not saved.")
+        return
     
-    # Save to strategy folder
+    # 4. Save to strategy folder
     import datetime
     report_path = ctx.strategy_path / "analyst_report.md"
     with open(report_path, 'a', encoding='utf-8') as f:
@@ -122,11 +207,13 @@ def run_analyst(ctx):
         f.write(final_report + "\n")
     
     print(f"\nReport saved to: {report_path.name}")
+    from core.brain_index import index_file
+    index_file(ctx, "analyst_report")
     
     # --- BRAIN INTEGRATION ---
     from core.brain import add_learning, brain_exists
     if brain_exists(ctx):
-        add_learning(ctx, "audience", f"Analyst processed {len(all_comments)} comments - see analyst_report.md", evidence="Analyst Agent")
+        add_learning(ctx, "audience", f"Analyst processed {len(all_comments)} comments - see analyst_report.md", evidence="Analyst Agent", source="scan comments")
         print("Brain updated with audience insight.")
 
 def run(args):
@@ -8,6 +8,7 @@ from core.context import context_manager
 from core.auth import get_youtube_for_channel
 from core.ledger import append_to_file
 from core.brain import add_learning, brain_exists
+from core.brain_index import index_file
 
 DEFAULT_KEYWORDS = ["satisfying loop", "macro food", "asmr cooking", "slime mixing", "oddly satisfying"]
 
@@ -100,7 +101,7 @@ def run(args):
         # --- LLM INTELLIGENCE INJECTION ---
         if ctx.global_config.features.llm_swarm:
             print("\nSummoning DeepSeek (The Scout)...")
-            from core.llm import ask
+            from core.llm import ask, is_error
             
             # Prepare context for LLM
             video_data = "\n".join([f"- {v['title']} ({v['views']} views)" for v in sorted(unique, key=lambda x: x['views'], reverse=True)[:20]])
@@ -119,11 +120,12 @@ def run(args):
             Output format: Clean Markdown.
             """
             
-            analysis = ask(prompt, system="You are a strategic AI analyst.", temperature=0.7)
             print("\nSCOUT REPORT:")
-            # Safe print for Windows Console
-            safe_analysis = analysis.encode('ascii', 'ignore').decode('ascii')
-            print(safe_analysis)
+            analysis = ask(prompt, system="You are a strategic AI analyst.", stream=True, task="strategy")
+            if is_error(analysis):
+                # Keep the raw data, but no error text in the research the brain indexes
+                print(f"\n[!] Scout analysis failed ({analysis}). Saving raw data only.")
+                analysis = "(AI analysis unavailable)"
     
             # Append to market research
             import datetime
@@ -140,11 +142,12 @@ def run(args):
                     f.write(f"| {v['channel']} | {v['title']}... | {link} | {v['views']:,} | {v['likes']:,} | {score} |\n")
             
             print(f"\nMarket research updated with AI analysis!")
+            index_file(ctx, "market_research")
             
             # --- BRAIN INTEGRATION ---
             if brain_exists(ctx):
                 # Extract key insight from LLM analysis for brain
-                add_learning(ctx, "gaps", f"Scout analyzed '{args.keyword}' niche - see market_research.md", evidence="Scout Agent")
+                add_learning(ctx, "gaps", f"Scout analyzed '{args.keyword}' niche - see market_research.md", evidence="Scout Agent", source="scout")
                 print("Brain updated with market gap insight.")
         else:
             print("\nDeepSeek Scout Analysis disabled (Feature Flag: llm_swarm=False).")
@@ -160,6 +163,7 @@ def run(args):
                     link = f"[Link](https://www.youtube.com/watch?v={v['id']})"
                     f.write(f"| {v['channel']} | {v['title']}... | {link} | {v['views']:,} | {v['likes']:,} | {score} |\n")
             print(f"\nMarket research updated (Raw Data Only).")
+            index_file(ctx, "market_research")
         
     except FileNotFoundError as e:
         print(f"Error: {e}")
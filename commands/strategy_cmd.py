@@ -13,8 +13,9 @@ from core.ledger import read_file, append_to_file
 from core.llm import ask
 
 def generate_channel_state(ctx, metrics, top_videos):
-    """Generates the 'Brain' file for the channel."""
-    state_path = ctx.path / "brain" / "learnings.md"
+    """Generates the channel state file (learnings.md is rendered from the learnings log)."""
+    state_path = ctx.path / "brain" / "channel_state.md"
+    state_path.parent.mkdir(exist_ok=True)
     
     totals = metrics.get('totals', {})
     avg_duration = totals.get('averageViewDuration', 0) / len(metrics.get('daily', [1]))
@@ -42,7 +43,7 @@ def generate_channel_state(ctx, metrics, top_videos):
     """
     
     print("   AI Analyst is thinking...")
-    analysis = ask(prompt, system="You are a YouTube Strategist. Be concise and actionable.")
+    analysis = ask(prompt, system="You are a YouTube Strategist. Be concise and actionable.", task="strategy")
     
     content = f"""# {ctx.name.upper()} CHANNEL STATE
 Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
@@ -115,28 +116,30 @@ def cmd_suggest(args):
     """Suggest next video based on Channel State."""
     ctx = context_manager.get_current_context()
     
-    state_path = ctx.path / "brain" / "learnings.md"
-    if not state_path.exists():
+    from core.brain import brain_exists, load_learnings, get_prompt_context
+    state_path = ctx.path / "brain" / "channel_state.md"
+    if not state_path.exists() and not brain_exists(ctx):
         print("No Channel State found. Run: python contentos.py strategy update")
         return
         
-    state_content = read_file(state_path)
+    channel_state = read_file(state_path) if state_path.exists() else ""
     
     print(f"\nPREDICTIVE ENGINE ({ctx.name})\n")
-    print(state_content)
+    print(channel_state or load_learnings(ctx))
     
     print(f"\nRECOMMENDATION:")
     
-    # LLM Suggestion
+    # LLM Suggestion. The brain context is the same for every call on this
+    # channel, so it goes first (see 'llm warm --brain'); the latest
+    # channel state follows in the prompt.
     prompt = f"""
-    Based on these channel learnings:
-    {state_content}
+    {channel_state}
     
-    Suggest 3 specific video ideas (Title + Theme) that would perform well next.
+    Based on the channel brain above, suggest 3 specific video ideas (Title + Theme)
+    that would perform well next.
     Format as bullet points.
     """
-    suggestion = ask(prompt)
-    print(suggestion)
+    ask(prompt, context=get_prompt_context(ctx), stream=True, task="strategy")
 
 def run(args):
     try:
@@ -153,7 +153,7 @@ def run(args):
         
         print("\n>> Mapping videos to valid Kits...")
         for kit in kits:
-            kit_path = ctx.production_path / f"{kit['id']}_{kit['name']}"
+            kit_path = kit['path']
             yaml_path = kit_path / 'kit.yaml'
             
             if not yaml_path.exists():
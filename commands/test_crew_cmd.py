@@ -1,7 +1,7 @@
 """
 Test command for LLM integration.
 """
-from core.llm import check_connection, list_models, ask
+from core.llm import check_connection, list_models, ask, get_last_stats, format_stats
 
 def run(args):
     """Diagnose LLM connection."""
@@ -39,5 +39,23 @@ def run(args):
             prompt="Say 'Auto-selection working' and nothing else."
         )
         print(f"   Response: {best} says: {response}")
+        print(f"   Timing: {format_stats(get_last_stats())}")
     except Exception as e:
         print(f"Error: {e}")
+
+    print(f"\nTesting Streaming (using {best})...")
+    try:
+        print("   Response: ", end="")
+        ask(prompt="Count from 1 to 5, separated by spaces.", stream=True)
+    except Exception as e:
+        print(f"Error: {e}")
+
+    # 4. Response Cache
+    from core import llm_cache
+    stats = llm_cache.get_stats()
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = (stats['hits'] / lookups * 100) if lookups else 0.0
+    print("\nResponse Cache:")
+    print(f"   Entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB)")
+    print(f"   Hits: {stats['hits']} | Misses: {stats['misses']} | Hit rate: {hit_rate:.0f}%")
+    print(f"   Evictions: {stats['evictions']}")
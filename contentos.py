@@ -15,7 +15,8 @@ Commands:
 import argparse
 import sys
 
-from commands import channel_cmd, kit_cmd, sync_cmd, strategy_cmd, retention_cmd, health_cmd, scout_cmd, asset_cmd, db_cmd, scan_cmd, test_crew_cmd, config_cmd, archive_cmd, context_cmd, brain_cmd, boot_cmd, index_cmd, setup_cmd
+from commands import channel_cmd, kit_cmd, sync_cmd, strategy_cmd, retention_cmd, health_cmd, scout_cmd, asset_cmd, db_cmd, scan_cmd, test_crew_cmd, config_cmd, archive_cmd, context_cmd, brain_cmd, boot_cmd, index_cmd, setup_cmd, llm_cmd
+from core import llm_telemetry
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -37,6 +38,12 @@ def main() -> None:
     index_parser = subparsers.add_parser('index', help='Navigate system context')
     index_parser.add_argument('path', nargs='?', default='', help='Dot-notation path (e.g., brain.themes.loop)')
     index_parser.add_argument('--json', action='store_true', help='Output as JSON')
+    index_parser.add_argument('--depth', type=int, help='Levels of children to expand (0 = metadata only, default 1)')
+    index_parser.add_argument('--after', help='List nodes: continue after this cursor (the _next of the previous page)')
+    index_parser.add_argument('--limit', type=int, help='List nodes: items per page (default 10)')
+    index_parser.add_argument('--refresh', action='store_true', help='Rebuild the cached sitemap')
+    index_parser.add_argument('--status', help='kits: only kits with this status (e.g. draft, published)')
+    index_parser.add_argument('--theme', help='kits: only kits with this theme')
     index_parser.set_defaults(func=index_cmd.run)
 
     # --- Config Command ---
@@ -84,7 +91,14 @@ def main() -> None:
     
     brain_subparsers.add_parser('init', help='Initialize brain for current channel')
     brain_subparsers.add_parser('show', help='Show brain state')
-    brain_subparsers.add_parser('context', help='Show full prompt context')
+    brain_context = brain_subparsers.add_parser('context', help='Show full prompt context')
+    brain_context.add_argument('--budget', type=int, default=None, help='Token budget (default: config brain.context_budget)')
+    brain_context.add_argument('--query', '-q', type=str, default=None, help='Retrieve learnings/research relevant to this text')
+    brain_subparsers.add_parser('reindex', help='Rebuild the semantic search index')
+    brain_compact = brain_subparsers.add_parser('compact', help='Merge near-duplicate learnings')
+    brain_compact.add_argument('--threshold', type=float, default=None,
+                               help='Similarity 0-1 to merge (default: config brain.compact_similarity)')
+    brain_compact.add_argument('--dry-run', action='store_true', help='Only show what would be merged')
     
     brain_theme = brain_subparsers.add_parser('set-theme', help='Set active theme')
     brain_theme.add_argument('theme_name', type=str, help='Theme name (loop, advice, cinematic)')
@@ -151,6 +165,7 @@ def main() -> None:
     # --- Scan Command (Community) ---
     scan_parser = subparsers.add_parser('scan', help='Scan community & trends')
     scan_parser.add_argument('scan_target', type=str, choices=['comments'], help='Target to scan')
+    scan_parser.add_argument('--limit', type=int, default=None, help='Most-liked comments to analyze (default 500)')
     scan_parser.set_defaults(func=scan_cmd.run)
 
     # --- Kit Command ---
@@ -158,12 +173,16 @@ def main() -> None:
     kit_subparsers = kit_parser.add_subparsers(dest='kit_action')
     
     kit_create = kit_subparsers.add_parser('create', help='Create a new kit')
-    kit_create.add_argument('name', type=str, help='Kit name')
+    kit_create.add_argument('name', type=str, nargs='?', help='Kit name (omit with --from)')
     kit_create.add_argument('--theme', '-t', type=str, 
                             default=None, help='Theme (default: interactive selection)')
     kit_create.add_argument('--formula', '-f', type=str,
                             choices=['stitch_2clip', 'loop_circular', 'loop_boomerang', 'cinematic_4shot', 'fpp_narrative', 'fpp_short'],
                             default='stitch_2clip', help='Production Formula')
+    kit_create.add_argument('--batch', type=int, help='Create N kits (<name>_1..N) with concurrent creators and verify unique ids')
+    kit_create.add_argument('--workers', type=int, help='Concurrent creator processes for --batch (default: one per kit, up to 32); render threads for --from (default 8)')
+    kit_create.add_argument('--from', dest='from_plan', metavar='PLAN',
+                            help='Create every kit in a plan file (YAML list or CSV with name,theme,formula columns)')
     
     kit_subparsers.add_parser('list', help='List all kits')
     
@@ -180,11 +199,20 @@ def main() -> None:
     kit_enrich = kit_subparsers.add_parser('enrich', help='Use AI to extract DNA ingredients from prompts')
     kit_enrich.add_argument('--kit', '-k', dest='kit_id', type=str, help='Specific kit ID to enrich')
     kit_enrich.add_argument('--force', '-f', action='store_true', help='Re-analyze already enriched kits')
+    kit_enrich.add_argument('--batch', '-b', type=int, default=1,
+                            help='Kits per LLM request (batches also run concurrently)')
+    kit_enrich.add_argument('--min-confidence', type=float, default=None,
+                            help='Pattern confidence (0-1) needed to skip the LLM for a field (default 0.6)')
     
     # Tier 3: Predictive Engine
     kit_suggest = kit_subparsers.add_parser('suggest', help='Get kit suggestions based on performance data')
     kit_suggest.add_argument('--predict', '-p', action='store_true', help='Show predicted success score for ingredient combos')
     
+    kit_migrate = kit_subparsers.add_parser('migrate', help='Shard kit folders into production/<bucket>/ folders')
+    kit_migrate.add_argument('--shard-size', type=int, required=True,
+                             help='Kits per bucket folder, e.g. 1000 (0 = move everything back to a flat folder)')
+    kit_migrate.add_argument('--dry-run', action='store_true', help='Show the moves without making them')
+    
     kit_parser.set_defaults(func=kit_cmd.run)
 
     # --- Strategy Command ---
@@ -230,6 +258,40 @@ def main() -> None:
     test_crew_parser = subparsers.add_parser('test-crew', help='Test LLM Swarm connectivity')
     test_crew_parser.set_defaults(func=test_crew_cmd.run)
 
+    # --- LLM Command ---
+    llm_parser = subparsers.add_parser('llm', help='Local LLM usage and tuning')
+    llm_subparsers = llm_parser.add_subparsers(dest='llm_action')
+    
+    llm_stats = llm_subparsers.add_parser('stats', help='Latency/throughput per command and model')
+    llm_stats.add_argument('--days', type=int, default=None, help='Only calls from the last N days')
+    llm_stats.add_argument('--clear', action='store_true', help='Delete recorded telemetry')
+    
+    llm_warm = llm_subparsers.add_parser('warm', help='Preload the model (and brain context) into Ollama')
+    llm_warm.add_argument('--model', type=str, default=None, help='Model to load (default: auto-selected)')
+    llm_warm.add_argument('--brain', action='store_true', help="Also evaluate the channel's brain context prefix")
+    llm_warm.add_argument('--task', type=str, default=None, help='Load the model routed for this task (config tasks)')
+    
+    fake_args = argparse.ArgumentParser(add_help=False)
+    fake_args.add_argument('--latency-ms', type=float, default=20.0, help='Fake per-request overhead')
+    fake_args.add_argument('--load-ms', type=float, default=0.0, help='Fake one-time model load')
+    fake_args.add_argument('--tps', type=float, default=200.0, help='Fake generation tokens/sec')
+    fake_args.add_argument('--response-tokens', type=int, default=64, help='Length of canned text answers')
+    fake_args.add_argument('--server-parallel', type=int, default=4, help='Requests the fake serves at once')
+    
+    llm_fake = llm_subparsers.add_parser('fake-server', parents=[fake_args], help='Run a fake Ollama API for offline testing')
+    llm_fake.add_argument('--port', type=int, default=11435, help='Port to listen on')
+    
+    llm_bench = llm_subparsers.add_parser('bench', parents=[fake_args], help='Benchmark commands against the fake Ollama')
+    llm_bench.add_argument('--scenarios', type=str, default=None, help='Comma list: test-crew,enrich,scan,strategy')
+    llm_bench.add_argument('--kits', type=int, default=20, help='Sandbox kits for enrich')
+    llm_bench.add_argument('--comments', type=int, default=300, help='Sandbox comments for scan')
+    llm_bench.add_argument('--batch', type=int, default=1, help='Kits per enrich request')
+    llm_bench.add_argument('--parallel', type=int, default=None, help='Client concurrency (default: llm.max_parallel)')
+    llm_bench.add_argument('--cache', action='store_true', help='Keep the response cache on')
+    llm_bench.add_argument('--verbose', '-v', action='store_true', help='Show command output')
+    
+    llm_parser.set_defaults(func=llm_cmd.run)
+
 
 
 
@@ -246,6 +308,10 @@ def main() -> None:
         print("   contentos kit create 'neon_jelly' --theme loop")
         sys.exit(0)
     
+    # Tag LLM telemetry with the command being served (e.g. "kit enrich")
+    action = getattr(args, f"{args.command.replace('-', '_')}_action", None)
+    llm_telemetry.set_command(f"{args.command} {action}" if action else args.command)
+    
     args.func(args)
 
 if __name__ == '__main__':
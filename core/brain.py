@@ -1,12 +1,22 @@
 """
 Channel Brain Module
 The unified knowledge system for each channel.
-Contains: state.json (facts), playbook.md (prompts), learnings.md (insights)
+Contains: state.json (facts), playbook.md (prompts), learnings.jsonl (insights)
+
+Learnings are an append-only JSONL log; learnings.md is a rendered view,
+regenerated from the log when it is read after new entries were appended.
 """
+import copy
 import json
+import os
+import re
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
+
+from core.kit_catalog import MTIME_SLACK_NS
 
 # Default brain templates
 DEFAULT_STATE = {
@@ -63,25 +73,22 @@ DEFAULT_THEME_TEMPLATE = """# {theme_name} Theme
 (Any learnings specific to this theme)
 """
 
-DEFAULT_LEARNINGS = """# {channel_name} Learnings
+LEARNINGS_HEADER = """# {channel_name} Learnings
 
 > Auto-generated insights from Scout, Analyst, and performance data.
-> DO NOT EDIT MANUALLY - AI maintains this file.
+> DO NOT EDIT MANUALLY - rendered from learnings.jsonl (use 'brain learn').
 > Last updated: {date}
-
-## Performance Insights
-- (Auto-populated after sync runs)
-
-## Audience Insights
-- (Auto-populated after scan runs)
-
-## Market Gaps
-- (Auto-populated after scout runs)
-
-## Failed Experiments
-- (Track what didn't work to avoid repeating)
 """
 
+# Category -> (section title, placeholder shown while empty), in render order
+LEARNING_SECTIONS = {
+    "performance": ("Performance Insights", "- (Auto-populated after sync runs)"),
+    "audience": ("Audience Insights", "- (Auto-populated after scan runs)"),
+    "gaps": ("Market Gaps", "- (Auto-populated after scout runs)"),
+    "failures": ("Failed Experiments", "- (Track what didn't work to avoid repeating)"),
+}
+OTHER_SECTION = "Other"
+
 # Built-in theme definitions for quick setup
 BUILTIN_THEMES = {
     "loop": {
@@ -191,48 +198,118 @@ def init_brain(ctx) -> bool:
             with open(theme_path, 'w', encoding='utf-8') as f:
                 f.write(theme_content)
     
-    # Create learnings.md
-    learnings_path = brain_path / "learnings.md"
-    if not learnings_path.exists():
-        learnings = DEFAULT_LEARNINGS.format(channel_name=channel_name, date=date_str)
-        with open(learnings_path, 'w', encoding='utf-8') as f:
-            f.write(learnings)
+    # Create the learnings log (an existing learnings.md is imported) and its view
+    _ensure_learning_log(ctx)
+    render_learnings(ctx)
     
     return True
 
+class BrainRepository:
+    """
+    In-process cache of parsed brain files.
+    
+    Entries are keyed by path and validated against (mtime_ns, size) on every
+    read, so a file changed by another process or agent is re-read, while
+    repeated reads within a command cost one stat() each. A file modified
+    within MTIME_SLACK_NS of the read is not cached: a same-size rewrite in
+    the same mtime tick (state.json after a flipped value) would look unchanged.
+    """
+    
+    def __init__(self):
+        self._cache: Dict[Path, Any] = {}
+        self._lock = threading.Lock()
+    
+    def read(self, path: Path, parse: Callable[[str], Any] = None, default: Any = None) -> Any:
+        """Parsed content of path (raw text without parse); default if missing."""
+        try:
+            st = path.stat()
+        except OSError:
+            return default
+        key = (path, parse)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        value = parse(text) if parse else text
+        if time.time_ns() - st.st_mtime_ns >= MTIME_SLACK_NS:
+            with self._lock:
+                self._cache[key] = (stamp, value)
+        return value
+    
+    def invalidate(self, path: Path = None) -> None:
+        """Drops cached entries for path (or everything)."""
+        with self._lock:
+            for key in [k for k in self._cache if path is None or k[0] == path]:
+                del self._cache[key]
+    
+    # --- State ---
+    
+    def load_state(self, ctx) -> Dict[str, Any]:
+        """Brain state; a private copy the caller may modify."""
+        state = self.read(get_brain_path(ctx) / "state.json", json.loads)
+        return copy.deepcopy(state if state is not None else DEFAULT_STATE)
+    
+    def save_state(self, ctx, state: Dict[str, Any]) -> bool:
+        state['updated_at'] = datetime.now().isoformat()
+        state_path = get_brain_path(ctx) / "state.json"
+        
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        self.invalidate(state_path)
+        return True
+    
+    def mutate_state(self, ctx, fn: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+        """
+        Applies fn to the state with one load and one save, under a file lock
+        so concurrent writers don't lose each other's updates. fn edits the
+        dict in place (or returns a replacement). Returns the saved state.
+        """
+        from core.filelock import file_lock
+        get_brain_path(ctx).mkdir(parents=True, exist_ok=True)
+        with file_lock(get_brain_path(ctx) / "state.json"):
+            state = self.load_state(ctx)
+            result = fn(state)
+            if isinstance(result, dict):
+                state = result
+            self.save_state(ctx, state)
+        return state
+
+_REPOSITORY = BrainRepository()
+
+def get_repository() -> BrainRepository:
+    """The process-wide brain repository."""
+    return _REPOSITORY
+
 def load_state(ctx) -> Dict[str, Any]:
     """Load current brain state (JSON)."""
-    state_path = get_brain_path(ctx) / "state.json"
-    if not state_path.exists():
-        return DEFAULT_STATE.copy()
-    
-    with open(state_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _REPOSITORY.load_state(ctx)
 
 def save_state(ctx, state: Dict[str, Any]) -> bool:
     """Save brain state (JSON)."""
-    state['updated_at'] = datetime.now().isoformat()
-    state_path = get_brain_path(ctx) / "state.json"
-    
-    with open(state_path, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2)
-    return True
+    return _REPOSITORY.save_state(ctx, state)
+
+def mutate_state(ctx, fn: Callable[[Dict[str, Any]], Any]) -> Dict[str, Any]:
+    """Batched state update: one load, fn(state), one save (see BrainRepository)."""
+    return _REPOSITORY.mutate_state(ctx, fn)
+
+def load_theme(ctx, theme_name: str) -> Optional[str]:
+    """A theme file's markdown, or None if the theme doesn't exist."""
+    return _REPOSITORY.read(get_themes_path(ctx) / f"{theme_name}.md")
 
-def load_playbook(ctx) -> str:
+def load_playbook(ctx, state: Dict[str, Any] = None) -> str:
     """Load the active theme's markdown content."""
-    state = load_state(ctx)
+    state = state or load_state(ctx)
     active_theme = state.get('active_theme', 'loop')
     
-    theme_path = get_themes_path(ctx) / f"{active_theme}.md"
-    if not theme_path.exists():
-        # Fallback to loop if active theme doesn't exist
-        theme_path = get_themes_path(ctx) / "loop.md"
-    
-    if not theme_path.exists():
-        return ""
-    
-    with open(theme_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    # Fallback to loop if active theme doesn't exist
+    playbook = load_theme(ctx, active_theme)
+    if playbook is None:
+        playbook = load_theme(ctx, "loop")
+    return playbook or ""
 
 def list_themes(ctx) -> List[str]:
     """List all available themes for this channel."""
@@ -241,142 +318,419 @@ def list_themes(ctx) -> List[str]:
         return []
     return [f.stem for f in themes_path.glob("*.md")]
 
-def load_learnings(ctx) -> str:
-    """Load learnings markdown content."""
-    learnings_path = get_brain_path(ctx) / "learnings.md"
-    if not learnings_path.exists():
-        return ""
+def get_learnings_path(ctx) -> Path:
+    """Rendered markdown view of the learnings."""
+    return get_brain_path(ctx) / "learnings.md"
+
+def get_learning_log_path(ctx) -> Path:
+    """Append-only learnings log (one JSON object per line)."""
+    return get_brain_path(ctx) / "learnings.jsonl"
+
+def format_learning(entry: Dict[str, str]) -> str:
+    """Markdown bullet for one log entry: '- [date] insight (Source: evidence)'."""
+    line = f"- [{entry['date']}] {entry['insight']}" if entry.get("date") else f"- {entry['insight']}"
+    if entry.get("count", 1) > 1:
+        line += f" (seen {entry['count']}x since {entry['first_seen']})" if entry.get("first_seen") \
+            else f" (seen {entry['count']}x)"
+    if entry.get("evidence"):
+        line += f" (Source: {entry['evidence']})"
+    return line
+
+def _parse_learnings_markdown(markdown: str) -> List[Dict[str, str]]:
+    """Log entries from a hand-maintained learnings.md, in file order."""
+    categories = {title: category for category, (title, _) in LEARNING_SECTIONS.items()}
+    entries = []
+    category = "other"
+    for line in markdown.splitlines():
+        if line.startswith("## "):
+            category = categories.get(line[3:].strip(), "other")
+            continue
+        text = line.strip()
+        if not text.startswith("- ") or text.startswith("- ("):
+            continue
+        match = re.match(r'- (?:\[(\d{4}-\d{2}-\d{2})\] )?(.*?)(?: \(Source: ([^()]*)\))?$', text)
+        entries.append({
+            "category": category,
+            "date": match.group(1) or "",
+            "insight": match.group(2),
+            "evidence": match.group(3) or "",
+            "source": "learnings.md"
+        })
+    return entries
+
+def _ensure_learning_log(ctx) -> Path:
+    """
+    Creates the log if missing. A pre-existing learnings.md is imported
+    once (and kept as learnings.md.bak) so no insight is lost.
+    """
+    from core.filelock import file_lock
+    log_path = get_learning_log_path(ctx)
+    if log_path.exists():
+        return log_path
+    
+    get_brain_path(ctx).mkdir(parents=True, exist_ok=True)
+    with file_lock(log_path):
+        if log_path.exists():
+            return log_path
+        md_path = get_learnings_path(ctx)
+        entries = []
+        if md_path.exists():
+            markdown = md_path.read_text(encoding='utf-8')
+            entries = _parse_learnings_markdown(markdown)
+            md_path.with_name(md_path.name + ".bak").write_text(markdown, encoding='utf-8')
+        tmp_path = log_path.with_name(log_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, log_path)
+    return log_path
+
+def read_learning_log(ctx) -> List[Dict[str, str]]:
+    """All logged learnings, oldest first (unreadable lines are skipped)."""
+    log_path = get_learning_log_path(ctx)
+    if not log_path.exists():
+        return []
+    entries = []
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # e.g. a torn final line after a crash
+            if isinstance(entry, dict) and entry.get("insight"):
+                entries.append(entry)
+    return entries
+
+def render_learnings(ctx, force: bool = False) -> Path:
+    """
+    Regenerates learnings.md from the log if the log changed since the
+    last render (or force). Returns the markdown path.
+    """
+    from core.filelock import file_lock
+    md_path = get_learnings_path(ctx)
+    log_path = get_learning_log_path(ctx)
+    if not log_path.exists():
+        return md_path
+    if not force and md_path.exists() and md_path.stat().st_mtime_ns > log_path.stat().st_mtime_ns:
+        return md_path
     
-    with open(learnings_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    with file_lock(log_path):
+        sections = {category: [] for category in LEARNING_SECTIONS}
+        for entry in read_learning_log(ctx):
+            category = entry.get("category")
+            sections.setdefault(category if category in LEARNING_SECTIONS else "other", []).append(entry)
+        
+        parts = [LEARNINGS_HEADER.format(channel_name=ctx.name.replace('_', ' ').title(),
+                                         date=datetime.now().strftime('%Y-%m-%d'))]
+        for category, entries in sections.items():
+            title, placeholder = LEARNING_SECTIONS.get(category, (OTHER_SECTION, None))
+            if not entries and not placeholder:
+                continue
+            lines = [format_learning(e) for e in entries] or [placeholder]
+            parts.append(f"## {title}\n" + "\n".join(lines) + "\n")
+        
+        tmp_path = md_path.with_name(md_path.name + ".tmp")
+        tmp_path.write_text("\n".join(parts), encoding='utf-8')
+        os.replace(tmp_path, md_path)
+    return md_path
 
-def add_learning(ctx, category: str, insight: str, evidence: str = "") -> bool:
+def load_learnings(ctx) -> str:
+    """Load learnings markdown content (re-rendered first if the log has new entries)."""
+    return _REPOSITORY.read(render_learnings(ctx), default="")
+
+def add_learning(ctx, category: str, insight: str, evidence: str = "", source: str = "") -> bool:
     """
-    Add a new learning to the learnings.md file.
+    Appends a learning to the log (one line, under a file lock).
     Categories: performance, audience, gaps, failures
+    
+    learnings.md is not rewritten here; it is re-rendered on next read.
     """
-    learnings_path = get_brain_path(ctx) / "learnings.md"
-    if not learnings_path.exists():
+    from core.filelock import file_lock
+    if not brain_exists(ctx):
         init_brain(ctx)
+    log_path = _ensure_learning_log(ctx)
     
-    content = load_learnings(ctx)
-    
-    # Map category to section header
-    section_map = {
-        "performance": "## Performance Insights",
-        "audience": "## Audience Insights", 
-        "gaps": "## Market Gaps",
-        "failures": "## Failed Experiments"
+    entry = {
+        "category": category,
+        "date": datetime.now().strftime('%Y-%m-%d'),
+        "insight": insight,
+        "evidence": evidence,
+        "source": source
     }
+    with file_lock(log_path):
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
     
-    section_header = section_map.get(category, "## Other")
-    date_str = datetime.now().strftime('%Y-%m-%d')
+    # Keep the embedding index current (embeds just this entry)
+    from core.brain_index import index_learning
+    index_learning(ctx, format_learning(entry))
     
-    # Build learning entry
-    entry = f"\n- [{date_str}] {insight}"
-    if evidence:
-        entry += f" (Source: {evidence})"
-    
-    # Find section and append
-    if section_header in content:
-        # Insert after section header
-        parts = content.split(section_header)
-        if len(parts) >= 2:
-            # Find the next section or end
-            rest = parts[1]
-            next_section = rest.find("\n## ")
-            if next_section > 0:
-                # Insert before next section
-                new_rest = rest[:next_section].rstrip() + entry + rest[next_section:]
-            else:
-                # Append at end of section
-                new_rest = rest.rstrip() + entry + "\n"
-            content = parts[0] + section_header + new_rest
-    else:
-        # Section doesn't exist, add it
-        content += f"\n\n{section_header}\n{entry}\n"
-    
-    with open(learnings_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Merge near-duplicates once the log has grown enough (brain.compact_at_kb)
+    from core.brain_compact import maybe_compact
+    maybe_compact(ctx)
     
     return True
 
 def update_performance(ctx, stats: Dict[str, Any]) -> bool:
     """Update performance section of brain state."""
-    state = load_state(ctx)
-    state['performance'].update(stats)
-    return save_state(ctx, state)
+    mutate_state(ctx, lambda state: state['performance'].update(stats))
+    return True
 
 def update_audience(ctx, wants: List[str] = None, complaints: List[str] = None, sentiment: float = None) -> bool:
     """Update audience section of brain state."""
-    state = load_state(ctx)
-    if wants:
-        # Merge, avoiding duplicates
-        existing = set(state['audience'].get('wants', []))
-        state['audience']['wants'] = list(existing.union(set(wants)))
-    if complaints:
-        existing = set(state['audience'].get('complaints', []))
-        state['audience']['complaints'] = list(existing.union(set(complaints)))
-    if sentiment is not None:
-        state['audience']['sentiment'] = sentiment
-    return save_state(ctx, state)
+    def apply(state):
+        if wants:
+            # Merge, avoiding duplicates
+            existing = set(state['audience'].get('wants', []))
+            state['audience']['wants'] = list(existing.union(set(wants)))
+        if complaints:
+            existing = set(state['audience'].get('complaints', []))
+            state['audience']['complaints'] = list(existing.union(set(complaints)))
+        if sentiment is not None:
+            state['audience']['sentiment'] = sentiment
+    mutate_state(ctx, apply)
+    return True
 
 def set_active_theme(ctx, theme_name: str) -> bool:
     """Set the active theme in brain state."""
-    state = load_state(ctx)
-    state['active_theme'] = theme_name
-    return save_state(ctx, state)
+    mutate_state(ctx, lambda state: state.update(active_theme=theme_name))
+    return True
 
-def get_prompt_context(ctx, theme_override: str = None) -> str:
+# Rough token estimate, same ratio as `context show` (1KB ~ 250 tokens)
+CHARS_PER_TOKEN = 4
+
+# Packing order when the budget is tight (lower = kept first)
+CONTEXT_PRIORITIES = {
+    "identity": 0,
+    "theme": 1,
+    "protocols": 2,
+    "complaints": 3,
+    "wants": 4,
+    "learnings": 5,
+    "research": 6
+}
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer dependency)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _split_sections(markdown: str) -> List[str]:
+    """Splits markdown into whole '## ' sections (the preamble is the first item)."""
+    items = []
+    current = []
+    for line in markdown.strip().splitlines():
+        if line.startswith("## ") and current:
+            items.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        items.append("\n".join(current).strip())
+    return [item for item in items if item]
+
+def _rank_learnings(learnings: str) -> List[Dict[str, str]]:
     """
-    Generate the full prompt context from brain for kit creation.
-    This is injected into kit prompts.
+    Extracts learning bullets with their section, newest first.
+    Entries look like '- [YYYY-MM-DD] insight'; undated bullets rank last.
+    """
+    entries = []
+    section = "Other"
+    for index, line in enumerate(learnings.splitlines()):
+        if line.startswith("## "):
+            section = line[3:].strip()
+            continue
+        text = line.strip()
+        if not text.startswith("- ") or text.startswith("- ("):
+            continue  # Skip prose and '(Auto-populated ...)' placeholders
+        match = re.match(r'- \[(\d{4}-\d{2}-\d{2})\]', text)
+        entries.append({
+            "section": section,
+            "text": text,
+            "date": match.group(1) if match else "",
+            "order": index
+        })
+    # Same-day entries: later in the file means appended later
+    entries.sort(key=lambda e: (e["date"], e["order"]), reverse=True)
+    return entries
+
+def assemble_prompt_context(ctx, theme_override: str = None, budget: int = None,
+                            include_protocols: bool = False, query: str = None) -> Dict[str, Any]:
+    """
+    Build the brain prompt context within a token budget.
+    
+    Each section is split into whole items (theme/protocol '## ' blocks,
+    audience bullets, individual learnings ranked newest first). Sections are
+    packed in CONTEXT_PRIORITIES order and an item is either included whole
+    or left out, so nothing is cut mid-line.
+    
+    With a query (e.g. kit name + theme), the learnings most similar to it
+    (core.brain_index) are packed first, and the top market research /
+    analyst report chunks are added as a "Relevant Research" section.
+    
+    Returns:
+        {"text": str, "budget": int, "used": int, "sections": [per-section report]}
     """
+    if budget is None:
+        from core.context import context_manager
+        budget = context_manager.global_config.brain.context_budget
+    
     state = load_state(ctx)
     
     # Use override if provided, otherwise active theme, otherwise loop fallback
     target_theme = theme_override or state.get('active_theme', 'loop')
     
     # Load specific theme file
-    theme_path = get_themes_path(ctx) / f"{target_theme}.md"
-    if theme_path.exists():
-        with open(theme_path, 'r', encoding='utf-8') as f:
-            playbook = f.read()
-    else:
-        playbook = load_playbook(ctx) # Fallback to active theme logic
-        
-    learnings = load_learnings(ctx)
+    playbook = load_theme(ctx, target_theme)
+    if playbook is None:
+        playbook = load_playbook(ctx, state) # Fallback to active theme logic
     
-    # Extract identity
     identity = state.get('identity', {})
-    
-    # Extract audience insights
     audience = state.get('audience', {})
-    wants = audience.get('wants', [])
-    complaints = audience.get('complaints', [])
+    learnings = list(_REPOSITORY.read(render_learnings(ctx), _rank_learnings, default=[]))
+    research = []
     
-    # Build context string
-    context = f"""
-## Channel Identity
-- Name: {identity.get('name', 'Unknown')}
-- Niche: {identity.get('niche', 'Not defined')}
-- Audience: {identity.get('audience', 'Not defined')}
-- Tone: {identity.get('tone', 'Not defined')}
-
-## Active Theme: {state.get('active_theme', 'loop')}
-
-{playbook}
-
-## Audience Wants
-{chr(10).join(['- ' + w for w in wants]) if wants else '- (No data yet)'}
-
-## Audience Complaints (Avoid These)
-{chr(10).join(['- ' + c for c in complaints]) if complaints else '- (No complaints recorded)'}
+    if query:
+        from core.brain_index import load_index, RESEARCH_SOURCES
+        from core.context import context_manager
+        k = context_manager.global_config.brain.retrieval_k
+        index = load_index(ctx)
+        if index:
+            # Most relevant learnings first, the rest stay newest first
+            relevant = [hit["text"] for hit in index.search(query, k, sources=["learnings"])]
+            rank = {text: i for i, text in enumerate(relevant)}
+            learnings.sort(key=lambda e: rank.get(e["text"], len(rank)))
+            
+            # Only research/reports: learnings and the theme are already sections of their own
+            research_sources = [s for s in RESEARCH_SOURCES if any(c["source"] == s for c in index.chunks)]
+            if research_sources:
+                research = [f"[{hit['source']}]\n{hit['text']}"
+                            for hit in index.search(query, k, sources=research_sources)]
+    
+    sections = {
+        "identity": {
+            "header": "## Channel Identity",
+            "items": [
+                f"- Name: {identity.get('name', 'Unknown')}\n"
+                f"- Niche: {identity.get('niche', 'Not defined')}\n"
+                f"- Audience: {identity.get('audience', 'Not defined')}\n"
+                f"- Tone: {identity.get('tone', 'Not defined')}"
+            ],
+            "empty": ""
+        },
+        "theme": {
+            "header": f"## Active Theme: {target_theme}",
+            "items": _split_sections(playbook),
+            "empty": "(No theme file)"
+        },
+        "wants": {
+            "header": "## Audience Wants",
+            "items": [f"- {w}" for w in audience.get('wants', [])],
+            "empty": "- (No data yet)"
+        },
+        "complaints": {
+            "header": "## Audience Complaints (Avoid These)",
+            "items": [f"- {c}" for c in audience.get('complaints', [])],
+            "empty": "- (No complaints recorded)"
+        },
+        "learnings": {
+            "header": "## Recent Learnings",
+            "items": [e["text"] for e in learnings],
+            "empty": "(No learnings yet)"
+        }
+    }
+    
+    if research:
+        sections["research"] = {
+            "header": "## Relevant Research",
+            "items": research,
+            "empty": ""
+        }
+    
+    protocols = _REPOSITORY.read(get_brain_path(ctx) / "protocols.md", _split_sections) if include_protocols else None
+    if protocols is not None:
+        sections["protocols"] = {
+            "header": "## CHANNEL PROTOCOLS",
+            "items": list(protocols),
+            "empty": ""
+        }
+    
+    # Greedy whole-item packing, highest priority first.
+    # Costs include the separators used when rendering, so the result fits.
+    used = 0
+    kept: Dict[str, List[int]] = {}
+    included = set()
+    groups_used = set()
+    for name in sorted(sections, key=lambda n: CONTEXT_PRIORITIES[n]):
+        section = sections[name]
+        kept[name] = []
+        header_cost = estimate_tokens(section["header"] + "\n\n")
+        if not section["items"]:
+            cost = header_cost + estimate_tokens(section["empty"])
+            if used + cost <= budget:
+                used += cost
+                included.add(name)
+            continue
+        for i, item in enumerate(section["items"]):
+            cost = estimate_tokens(item + "\n\n")
+            if not kept[name]:
+                cost += header_cost
+            if name == "learnings" and learnings[i]["section"] not in groups_used:
+                cost += estimate_tokens(f"### {learnings[i]['section']}\n\n")
+            # Identity is tiny and always sent, even if the budget is absurdly low
+            if used + cost <= budget or name == "identity":
+                kept[name].append(i)
+                used += cost
+                included.add(name)
+                if name == "learnings":
+                    groups_used.add(learnings[i]["section"])
+    
+    # Render in reading order
+    parts = []
+    report = []
+    for name in ["identity", "theme", "wants", "complaints", "learnings", "research", "protocols"]:
+        if name not in sections:
+            continue
+        section = sections[name]
+        items = [section["items"][i] for i in kept[name]]
+        
+        if name == "learnings" and items:
+            # Regroup the chosen learnings under their original categories
+            by_section: Dict[str, List[str]] = {}
+            for i in kept[name]:
+                by_section.setdefault(learnings[i]["section"], []).append(learnings[i]["text"])
+            body = "\n\n".join(f"### {sec}\n" + "\n".join(lines) for sec, lines in by_section.items())
+        elif items:
+            body = "\n\n".join(items) if name in ("theme", "protocols", "research") else "\n".join(items)
+        else:
+            body = section["empty"]
+        
+        text = f"{section['header']}\n{body}"
+        if name in included:
+            parts.append(text)
+        
+        report.append({
+            "section": name,
+            "tokens": estimate_tokens(text) if name in included else 0,
+            "tokens_total": estimate_tokens(section["header"]) + (
+                sum(estimate_tokens(i) + 1 for i in section["items"]) if section["items"]
+                else estimate_tokens(section["empty"]) + 1),
+            "items_kept": len(items),
+            "items_total": len(section["items"])
+        })
+    
+    return {
+        "text": "\n" + "\n\n".join(parts) + "\n",
+        "budget": budget,
+        "used": sum(r["tokens"] for r in report),
+        "sections": report
+    }
 
-## Recent Learnings
-{learnings[:2000] if learnings else '(No learnings yet)'}
-"""
-    return context
+def get_prompt_context(ctx, theme_override: str = None, include_protocols: bool = False,
+                       query: str = None) -> str:
+    """
+    Generate the full prompt context from brain for kit creation.
+    This is injected into kit prompts (packed to the configured token budget).
+    """
+    return assemble_prompt_context(ctx, theme_override, include_protocols=include_protocols, query=query)["text"]
 
 def brain_exists(ctx) -> bool:
     """Check if brain folder exists for this channel."""
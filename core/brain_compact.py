@@ -0,0 +1,190 @@
+"""
+Learnings Compaction
+Clusters near-duplicate learnings (e.g. the "Scout analyzed 'x' niche" line
+appended on every run) and keeps one entry per cluster.
+
+Each learning becomes a MinHash signature of its character shingles
+(lowercased, digits folded, so "processed 500 comments" matches "processed
+1200 comments"). Locality-sensitive hashing over signature bands finds
+candidate pairs without comparing every pair; a pair joins a cluster when
+its estimated Jaccard similarity reaches the threshold. Only learnings of
+the same category are merged.
+
+The newest entry of a cluster is kept with the cluster's occurrence count
+and first date; the others move to brain/learnings.archive.jsonl.
+"""
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import List, Dict, Any
+
+SHINGLE_CHARS = 5
+NUM_PERM = 32
+BANDS = 8                  # BANDS * ROWS == NUM_PERM; candidate threshold ~ (1/BANDS) ** (1/ROWS)
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.6
+_PRIME = 4294967311        # Smallest prime above 2**32
+
+# Fixed affine permutations (a * h + b) mod _PRIME, seeded so signatures are
+# stable. a < 2**31 keeps a * h + b inside uint64 for the NumPy path.
+_PERMS = [(1 + zlib.crc32(f"a{i}".encode()) % (2 ** 31 - 1), zlib.crc32(f"b{i}".encode()) % _PRIME)
+          for i in range(NUM_PERM)]
+
+def _perm_arrays():
+    from core.brain_index import _np
+    np = _np()
+    if np is None:
+        return None, None
+    return (np.asarray([a for a, _ in _PERMS], dtype=np.uint64),
+            np.asarray([b for _, b in _PERMS], dtype=np.uint64))
+
+_PERM_A, _PERM_B = _perm_arrays()
+
+def get_archive_path(ctx):
+    from core.brain import get_brain_path
+    return get_brain_path(ctx) / "learnings.archive.jsonl"
+
+def shingles(text: str, k: int = SHINGLE_CHARS) -> set:
+    """Character k-grams of normalized text."""
+    norm = re.sub(r'\d+', '0', re.sub(r'\s+', ' ', text.lower())).strip()
+    if len(norm) <= k:
+        return {norm}
+    return {norm[i:i + k] for i in range(len(norm) - k + 1)}
+
+def signature(text: str) -> List[int]:
+    """MinHash signature (NUM_PERM values); vectorized when NumPy is available."""
+    from core.brain_index import _np
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text)]
+    np = _np()
+    if np is not None:
+        h = np.asarray(hashes, dtype=np.uint64)
+        return ((_PERM_A[:, None] * h[None, :] + _PERM_B[:, None]) % np.uint64(_PRIME)).min(axis=1).tolist()
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+def cluster(entries: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """Groups entry indices into near-duplicate clusters (singletons included), in log order."""
+    sigs = [signature(e.get("insight", "")) for e in entries]
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Each bucket keeps one member per cluster, so a run of duplicates
+    # costs one comparison per band instead of one per earlier duplicate.
+    buckets: Dict[tuple, List[int]] = {}
+    for i, sig in enumerate(sigs):
+        category = entries[i].get("category", "")
+        for band in range(BANDS):
+            key = (category, band, tuple(sig[band * ROWS:(band + 1) * ROWS]))
+            members, roots = [], set()
+            for j in buckets.get(key, []):
+                if find(j) not in roots:
+                    roots.add(find(j))
+                    members.append(j)
+            for j in members:
+                if find(i) != find(j) and similarity(sig, sigs[j]) >= threshold:
+                    parent[find(i)] = find(j)
+            members.append(i)
+            buckets[key] = members
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(entries)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda g: g[-1])
+
+def plan(entries: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD):
+    """
+    Returns (kept, archived, merged): one entry per cluster, in the position
+    of its newest member, carrying the summed count and earliest date; the
+    superseded entries; and (count, insight) per cluster that was merged.
+    """
+    kept, archived, merged = [], [], []
+    for group in cluster(entries, threshold):
+        newest = dict(entries[group[-1]])
+        if len(group) > 1:
+            members = [entries[i] for i in group]
+            newest["count"] = sum(m.get("count", 1) for m in members)
+            dates = [m.get("first_seen") or m.get("date") for m in members if m.get("first_seen") or m.get("date")]
+            if dates:
+                newest["first_seen"] = min(dates)
+            archived.extend(dict(m, merged_into=newest["insight"]) for m in members[:-1])
+            merged.append((newest["count"], newest["insight"]))
+        kept.append(newest)
+    return kept, archived, merged
+
+def compact(ctx, threshold: float = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Compacts the channel's learnings log in place (under its file lock).
+    threshold defaults to brain.compact_similarity.
+
+    Returns {'before', 'after', 'archived', 'clusters': [(count, insight)], 'bytes'}
+    where clusters lists the merged groups, largest first.
+    """
+    from core.filelock import file_lock
+    from core.brain import get_learning_log_path, read_learning_log, render_learnings, mutate_state
+
+    if threshold is None:
+        from core.context import context_manager
+        threshold = context_manager.global_config.brain.compact_similarity
+
+    log_path = get_learning_log_path(ctx)
+    if not log_path.exists():
+        return {'before': 0, 'after': 0, 'archived': 0, 'clusters': [], 'bytes': 0}
+
+    with file_lock(log_path):
+        entries = read_learning_log(ctx)
+        kept, archived, merged = plan(entries, threshold)
+        if not dry_run and archived:
+            now = datetime.now().isoformat(timespec='seconds')
+            with open(get_archive_path(ctx), 'a', encoding='utf-8') as f:
+                for entry in archived:
+                    f.write(json.dumps(dict(entry, archived_at=now), ensure_ascii=False) + "\n")
+            tmp_path = log_path.with_name(log_path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, log_path)
+        size = log_path.stat().st_size
+
+    if not dry_run:
+        mutate_state(ctx, lambda state: state.update(learnings_compacted_bytes=size))
+        if archived:
+            render_learnings(ctx, force=True)
+            from core.brain_index import index_file
+            index_file(ctx, "learnings")
+
+    return {
+        'before': len(entries),
+        'after': len(kept),
+        'archived': len(archived),
+        'clusters': sorted(merged, reverse=True),
+        'bytes': size
+    }
+
+def maybe_compact(ctx) -> bool:
+    """
+    Auto-compaction after an append: runs once the log passes
+    brain.compact_at_kb and has doubled since the last compaction, so
+    appends stay cheap on logs that are simply large.
+    """
+    from core.context import context_manager
+    from core.brain import get_learning_log_path, load_state
+
+    limit_kb = context_manager.global_config.brain.compact_at_kb
+    log_path = get_learning_log_path(ctx)
+    if not limit_kb or not log_path.exists():
+        return False
+    size = log_path.stat().st_size
+    if size < limit_kb * 1024 or size < 2 * load_state(ctx).get("learnings_compacted_bytes", 0):
+        return False
+    compact(ctx)
+    return True
@@ -0,0 +1,388 @@
+"""
+Brain Embedding Index
+Semantic retrieval over a channel's learnings, research and report files.
+
+Chunks are embedded with Ollama (/api/embeddings, llm.embedding_model) or, when
+that is unavailable, a local hashing vectorizer. Vectors are L2-normalized rows
+of one NumPy matrix (brain/.index/vectors.npy) with a parallel id map
+(brain/.index/chunks.json), so a query is a single matrix-vector product.
+
+The index is updated incrementally: add_learning() embeds just the new entry
+and report appends re-chunk only their file, embedding chunks not seen before.
+New chunks are embedded outside the index lock (an Ollama call can take a
+while), then the index is re-read, merged by chunk id and saved under the lock
+(brain/.index/chunks.json.lock); both files are replaced atomically, so
+concurrent writers don't drop each other's chunks. Chunks that couldn't be
+embedded (embedder down) are kept as pending and retried by the next update
+or load.
+"""
+import hashlib
+import json
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+HASH_DIM = 1024          # Hashing-vectorizer width
+CHUNK_CHARS = 1200       # Max chars per research/report chunk
+RESEARCH_SOURCES = ["market_research", "analyst_report"]  # Retrieved as "Relevant Research"
+
+def _np():
+    """NumPy is needed for the index; without it retrieval is simply skipped."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+def get_index_path(ctx) -> Path:
+    from core.brain import get_brain_path
+    return get_brain_path(ctx) / ".index"
+
+def _index_lock(ctx):
+    from core.filelock import file_lock
+    return file_lock(get_index_path(ctx) / "chunks.json")
+
+def get_sources(ctx) -> Dict[str, Path]:
+    """Indexed files by source name (themes are 'theme:<name>')."""
+    from core.brain import get_brain_path, get_themes_path
+    sources = {
+        "learnings": get_brain_path(ctx) / "learnings.md",
+        "market_research": ctx.strategy_path / "market_research.md",
+        "analyst_report": ctx.strategy_path / "analyst_report.md",
+    }
+    themes_path = get_themes_path(ctx)
+    if themes_path.exists():
+        for theme in sorted(themes_path.glob("*.md")):
+            sources[f"theme:{theme.stem}"] = theme
+    return sources
+
+# ============ CHUNKING ============
+
+def chunk_learnings(markdown: str) -> List[str]:
+    """One chunk per learning bullet."""
+    from core.brain import _rank_learnings
+    return [entry["text"] for entry in _rank_learnings(markdown)]
+
+def chunk_markdown(markdown: str, max_chars: int = CHUNK_CHARS) -> List[str]:
+    """'## ' sections, split further on blank lines when longer than max_chars."""
+    from core.brain import _split_sections
+    chunks = []
+    for section in _split_sections(markdown):
+        if len(section) <= max_chars:
+            chunks.append(section)
+            continue
+        current = ""
+        for para in re.split(r'\n\s*\n', section):
+            if current and len(current) + len(para) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{para}" if current else para
+        if current:
+            chunks.append(current[:max_chars * 2])
+    return [c.strip() for c in chunks if c.strip()]
+
+def chunk_source(source: str, text: str) -> List[str]:
+    return chunk_learnings(text) if source == "learnings" else chunk_markdown(text)
+
+def _chunk_id(source: str, text: str) -> str:
+    return f"{source}#{hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]}"
+
+# ============ EMBEDDING ============
+
+def hash_embed(texts: List[str], dim: int = HASH_DIM):
+    """
+    Local fallback: signed hashing of word unigrams and bigrams with
+    sublinear term frequency. Returns an (n, dim) float32 matrix.
+    """
+    np = _np()
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not features:
+            continue
+        hashes = np.fromiter((zlib.crc32(f.encode('utf-8')) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(matrix[row], hashes % dim, signs)
+    return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+def ollama_embed(texts: List[str], model: str):
+    """Embeds via Ollama /api/embeddings (one request per text); None if unavailable."""
+    np = _np()
+    import requests
+    from core.llm import OLLAMA_HOST, get_session, _timeout, _llm_config, _keep_alive
+
+    vectors = []
+    keep_alive = _keep_alive()
+    try:
+        for text in texts:
+            body = {"model": model, "prompt": text}
+            if keep_alive is not None:
+                body["keep_alive"] = keep_alive
+            response = get_session().post(f"{OLLAMA_HOST}/api/embeddings", json=body,
+                                          timeout=_timeout(_llm_config().request_timeout))
+            response.raise_for_status()
+            embedding = response.json().get("embedding")
+            if not embedding:
+                return None
+            vectors.append(embedding)
+    except (requests.RequestException, ValueError):
+        return None
+    return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+def _normalize(matrix):
+    np = _np()
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+class BrainIndex:
+    """Embedding matrix + id map for one channel, persisted under brain/.index/."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.path = get_index_path(ctx)
+        self.embedder = None     # "ollama:<model>" or "hashing:<dim>"
+        self.chunks: List[Dict[str, str]] = []  # {id, source, text}, row-aligned with vectors
+        self.vectors = None
+        self.pending: List[Dict[str, str]] = []  # Chunks not embedded yet, retried on the next update
+        self.built = False       # Loaded from disk (possibly empty) or rebuilt
+        self._load()
+
+    # --- Persistence ---
+
+    def _load(self) -> None:
+        np = _np()
+        meta_path, vec_path = self.path / "chunks.json", self.path / "vectors.npy"
+        if not (meta_path.exists() and vec_path.exists()):
+            return
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            vectors = np.load(vec_path)
+        except (OSError, ValueError):
+            return
+        if len(meta.get("chunks", [])) == len(vectors):
+            self.embedder, self.chunks, self.vectors = meta.get("embedder"), meta["chunks"], vectors
+            self.pending = meta.get("pending", [])
+            self.built = True
+
+    def save(self) -> None:
+        """Writes both files via tmp + os.replace (callers hold the index lock)."""
+        np = _np()
+        self.path.mkdir(parents=True, exist_ok=True)
+        vec_tmp, meta_tmp = self.path / "vectors.npy.tmp", self.path / "chunks.json.tmp"
+        with open(vec_tmp, 'wb') as f:
+            np.save(f, self.vectors if self.vectors is not None else np.zeros((0, 0), dtype=np.float32))
+        meta_tmp.write_text(json.dumps({"embedder": self.embedder, "chunks": self.chunks, "pending": self.pending},
+                                       ensure_ascii=False), encoding='utf-8')
+        os.replace(vec_tmp, self.path / "vectors.npy")
+        os.replace(meta_tmp, self.path / "chunks.json")
+        self.built = True
+
+    # --- Embedding ---
+
+    def _embed(self, texts: List[str]):
+        """Embeds with the index's embedder (choosing one on first use)."""
+        from core.llm import _llm_config
+        model = _llm_config().embedding_model
+
+        if self.embedder is None:
+            vectors = ollama_embed(texts, model) if model else None
+            if vectors is not None:
+                self.embedder = f"ollama:{model}"
+                return _normalize(vectors)
+            self.embedder = f"hashing:{HASH_DIM}"
+
+        kind, _, name = self.embedder.partition(":")
+        if kind == "ollama":
+            vectors = ollama_embed(texts, name)
+            return _normalize(vectors) if vectors is not None else None
+        return _normalize(hash_embed(texts, int(name)))
+
+    # --- Updates ---
+
+    def new_chunks(self, source: str, texts: List[str]) -> List[Dict[str, str]]:
+        """Chunks of texts not indexed yet, plus the pending ones (deduplicated by id)."""
+        known = {c["id"] for c in self.chunks}
+        new = {c["id"]: c for c in self.pending}
+        for text in texts:
+            chunk_id = _chunk_id(source, text)
+            if chunk_id not in known:
+                new.setdefault(chunk_id, {"id": chunk_id, "source": source, "text": text})
+        return list(new.values())
+
+    def merge(self, embedder: Optional[str], new: List[Dict[str, str]], vectors,
+              source: Optional[str] = None, current: Optional[set] = None) -> int:
+        """
+        Merges chunks embedded elsewhere (vectors row-aligned with new, or None
+        if embedding failed) by chunk id. With current, the source's chunks not
+        in it are dropped first. Returns the number of chunks removed, added or
+        newly pending.
+        """
+        np = _np()
+        changed = 0
+        if current is not None:
+            keep = [i for i, c in enumerate(self.chunks) if c["source"] != source or c["id"] in current]
+            changed += len(self.chunks) - len(keep)
+            if len(keep) < len(self.chunks):
+                self.chunks = [self.chunks[i] for i in keep]
+                self.vectors = self.vectors[np.asarray(keep, dtype=int)] if keep else None
+            self.pending = [c for c in self.pending if c["source"] != source or c["id"] in current]
+
+        known = {c["id"] for c in self.chunks}
+        rows = [i for i, c in enumerate(new) if c["id"] not in known
+                and (current is None or c["source"] != source or c["id"] in current)]
+        if vectors is not None and self.embedder in (None, embedder):
+            if rows:
+                self.embedder = embedder
+                added = vectors[np.asarray(rows, dtype=int)]
+                self.vectors = added if self.vectors is None or not len(self.vectors) else np.vstack([self.vectors, added])
+                self.chunks.extend(new[i] for i in rows)
+                changed += len(rows)
+            done = {c["id"] for c in new}
+            changed += len([c for c in self.pending if c["id"] in done])
+            self.pending = [c for c in self.pending if c["id"] not in done]
+        else:
+            # Not embedded, or embedded with a model the index no longer uses: retry later
+            waiting = {c["id"] for c in self.pending}
+            for i in rows:
+                if new[i]["id"] not in waiting:
+                    self.pending.append(new[i])
+                    changed += 1
+        return changed
+
+    def add(self, source: str, texts: List[str]) -> int:
+        """Embeds and appends chunks not already indexed. Returns how many were added."""
+        new = self.new_chunks(source, texts)
+        if not new:
+            return 0
+        vectors = self._embed([c["text"] for c in new])
+        before = len(self.chunks)
+        self.merge(self.embedder, new, vectors)  # Embedder down: kept as pending for the next update
+        return len(self.chunks) - before
+
+    def rebuild(self) -> int:
+        """Re-embeds every source from scratch (re-picks the embedder)."""
+        self.embedder, self.chunks, self.vectors, self.pending = None, [], None, []
+        total = 0
+        from core.brain import load_learnings
+        for source, path in get_sources(self.ctx).items():
+            if source == "learnings":
+                total += self.add(source, chunk_learnings(load_learnings(self.ctx)))
+            elif path.exists():
+                total += self.add(source, chunk_source(source, path.read_text(encoding='utf-8')))
+        return total
+
+    # --- Search ---
+
+    def search(self, query: str, k: int = 5, sources: Optional[List[str]] = None,
+               min_score: float = None) -> List[Dict[str, Any]]:
+        """
+        Top-k chunks by cosine similarity: [{id, source, text, score}], best first.
+        sources=None searches everything, [] nothing. Chunks scoring below
+        min_score (default brain.retrieval_min_score) are dropped.
+        """
+        np = _np()
+        if sources is not None and not sources:
+            return []
+        if self.vectors is None or not len(self.chunks) or not query.strip():
+            return []
+        q = self._embed([query])
+        if q is None or q.shape[1] != self.vectors.shape[1]:
+            return []
+        if min_score is None:
+            from core.context import context_manager
+            min_score = context_manager.global_config.brain.retrieval_min_score
+
+        scores = self.vectors @ q[0]
+        if sources is not None:
+            allowed = np.fromiter((c["source"] in sources for c in self.chunks), dtype=bool, count=len(self.chunks))
+            scores = np.where(allowed, scores, -np.inf)
+        scores = np.where(scores >= min_score, scores, -np.inf)
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [dict(self.chunks[i], score=float(scores[i])) for i in top]
+
+def save_rebuilt(ctx, index: BrainIndex, replace: bool = False) -> BrainIndex:
+    """
+    Saves an index rebuilt outside the lock. Unless replace, an index another
+    process saved meanwhile wins (and is returned). A busy lock leaves the
+    rebuilt index unsaved: raises LockTimeout only when replace.
+    """
+    from core.filelock import LockTimeout
+    try:
+        with _index_lock(ctx):
+            if not replace:
+                current = BrainIndex(ctx)
+                if current.built:
+                    return current
+            index.save()
+    except LockTimeout:
+        if replace:
+            raise
+    return index
+
+def _update(ctx, source: Optional[str] = None, texts: List[str] = (),
+            replace: bool = False) -> Optional[BrainIndex]:
+    """
+    Incremental update: embeds the source's new chunks (and any pending ones)
+    outside the lock, then re-reads, merges and saves under it. replace drops
+    the source's chunks that are no longer in texts. Never raises LockTimeout:
+    a busy index skips the update (the next one re-syncs, or 'brain reindex').
+    Returns the saved index, or None if nothing was saved.
+    """
+    from core.filelock import LockTimeout
+    snapshot = BrainIndex(ctx)
+    if not snapshot.built:
+        return None
+    new = snapshot.new_chunks(source, texts) if source else list(snapshot.pending)
+    vectors = snapshot._embed([c["text"] for c in new]) if new else None
+    current = {_chunk_id(source, t) for t in texts} if replace else None
+    try:
+        with _index_lock(ctx):
+            index = BrainIndex(ctx)
+            if not index.built or not index.merge(snapshot.embedder, new, vectors, source, current):
+                return None
+            index.save()
+            return index
+    except LockTimeout:
+        return None
+
+def load_index(ctx) -> Optional[BrainIndex]:
+    """
+    The channel's index, built on first use (an empty build is saved too, so
+    it isn't retried on every call); None without NumPy. Pending chunks are
+    retried first.
+    """
+    if _np() is None:
+        return None
+    index = BrainIndex(ctx)
+    if not index.built:
+        index.rebuild()
+        index = save_rebuilt(ctx, index)
+    elif index.pending:
+        index = _update(ctx) or index
+    return index
+
+def index_learning(ctx, entry: str) -> None:
+    """Incremental update after add_learning(). Only an existing index is touched."""
+    if _np() is None or not (get_index_path(ctx) / "chunks.json").exists():
+        return
+    _update(ctx, "learnings", chunk_learnings(entry))
+
+def index_file(ctx, source: str) -> None:
+    """Incremental update after a research/report file was appended to."""
+    path = get_sources(ctx).get(source)
+    if _np() is None or path is None or not path.exists() or not (get_index_path(ctx) / "chunks.json").exists():
+        return
+    _update(ctx, source, chunk_source(source, path.read_text(encoding='utf-8')), replace=True)
+
+def search(ctx, query: str, k: int = 5, sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Convenience wrapper: top-k chunks for query (empty if the index is unavailable)."""
+    index = load_index(ctx)
+    return index.search(query, k, sources) if index else []
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from core.auth import get_youtube_for_channel
 from core.database import get_db_path
+from core.keywords import sentiment_scores
 
 def fetch_comments(context, video_id=None, max_results=20):
     """
@@ -58,7 +59,12 @@ def fetch_comments(context, video_id=None, max_results=20):
             )
             response = request.execute()
             
-            for item in response.get('items', []):
+            items = response.get('items', [])
+            texts = [item['snippet']['topLevelComment']['snippet']['textDisplay'] for item in items]
+            # Keyword sentiment for the whole page in one engine call (core.keywords)
+            sentiments = sentiment_scores(texts)
+            
+            for item, sentiment in zip(items, sentiments):
                 snippet = item['snippet']['topLevelComment']['snippet']
                 
                 comment_id = item['id']
@@ -68,15 +74,6 @@ def fetch_comments(context, video_id=None, max_results=20):
                 like_count = snippet['likeCount']
                 reply_count = item['snippet']['totalReplyCount']
                 
-                # Mock Sentiment (To avoid installing NLTK/TextBlob for now)
-                # We can add a simple keyword scanner
-                sentiment = 0.0
-                lower_text = text.lower()
-                if any(w in lower_text for w in ['love', 'great', 'awesome', 'good', 'best']):
-                    sentiment = 0.8
-                elif any(w in lower_text for w in ['hate', 'bad', 'worst', 'boring']):
-                    sentiment = -0.8
-                
                 # Upsert into DB
                 cursor.execute('''
                     INSERT OR REPLACE INTO comments 
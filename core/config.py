@@ -18,6 +18,48 @@ class FeaturesConfig:
     scout_agent: bool = True     # Enable YouTube Data API research
     cloud_sync: bool = False     # Enable remote database sync
 
+@dataclass
+class LLMConfig:
+    """Ollama driver tuning (connection pool and timeouts, in seconds)."""
+    pool_size: int = 8             # Keep-alive connections shared by worker threads
+    connect_timeout: float = 3.0   # TCP connect to the Ollama host
+    probe_timeout: float = 2.0     # /api/tags and other cheap status calls
+    request_timeout: float = 120.0 # Full chat inference
+    max_parallel: int = 4          # Concurrent requests for map phases (match OLLAMA_NUM_PARALLEL)
+    model_cache_ttl: int = 86400   # Reuse the persisted model selection this long (.contentos/llm_model.json)
+    cache_enabled: bool = True     # Persistent response cache (.contentos/llm_cache.db)
+    cache_max_mb: float = 64.0     # LRU eviction beyond this size
+    cache_max_temperature: float = 0.3  # Auto-cache calls at or below this temperature
+    telemetry_enabled: bool = True # Per-call timings/tokens (.contentos/llm_telemetry.db)
+    embedding_model: str = "nomic-embed-text"  # Brain index embeddings ("" = local hashing only)
+    keep_alive: str = "30m"        # How long Ollama keeps the model loaded after a call ("-1" = forever, "" = server default)
+
+@dataclass
+class BrainConfig:
+    """Channel brain settings."""
+    context_budget: int = 3000     # Max tokens of brain context injected into kit prompts
+    retrieval_k: int = 5           # Chunks retrieved from the embedding index per kit
+    retrieval_min_score: float = 0.15  # Cosine similarity below which a retrieved chunk is dropped
+    compact_at_kb: int = 64        # Auto-compact near-duplicate learnings past this log size (0 = off)
+    compact_similarity: float = 0.6  # Estimated Jaccard at which two learnings count as duplicates
+
+@dataclass
+class TaskRoute:
+    """Model choice and sampling for one kind of LLM call (see GlobalConfig.tasks)."""
+    models: List[str] = field(default_factory=list)  # Priority list; empty = the global best model
+    timeout: Optional[float] = None      # Seconds per call (None = llm.request_timeout)
+    temperature: Optional[float] = None  # None = the caller's default
+
+def default_task_routes() -> Dict[str, TaskRoute]:
+    """Small local models for bulk extraction/summaries, the best model for synthesis."""
+    return {
+        "extract": TaskRoute(models=["qwen2.5:3b", "llama3.2:3b", "llama3.2:1b"], timeout=60, temperature=0.1),
+        "summarize-batch": TaskRoute(models=["qwen2.5:7b", "llama3.1:8b", "llama3.2:3b", "llama3.2:1b"],
+                                     timeout=180, temperature=0.5),
+        "reduce": TaskRoute(timeout=300, temperature=0.7),
+        "strategy": TaskRoute(temperature=0.7),
+    }
+
 @dataclass
 class GlobalConfig:
     version: str = "1.1.0"
@@ -25,6 +67,9 @@ class GlobalConfig:
     default_theme: str = "loop"
     auto_sync_on_publish: bool = True
     features: FeaturesConfig = field(default_factory=FeaturesConfig)
+    llm: LLMConfig = field(default_factory=LLMConfig)
+    brain: BrainConfig = field(default_factory=BrainConfig)
+    tasks: Dict[str, TaskRoute] = field(default_factory=default_task_routes)
 
 @dataclass
 class ChannelConfig:
@@ -34,6 +79,7 @@ class ChannelConfig:
     themes: List[str] = field(default_factory=lambda: ["loop", "cinematic", "voxel"])
     production_prefix: str = "project"
     default_script_style: str = "adrenaline_hook"
+    production_shard_size: int = 0   # Kits per production/<bucket>/ folder (0 = flat); change with `kit migrate`
 
 def load_global_config() -> GlobalConfig:
     """Loads global config from .contentos/config.json"""
@@ -47,8 +93,15 @@ def load_global_config() -> GlobalConfig:
     # Handle nested feature config manually if needed, or let dataclass handle it if straightforward
     # For safety with simple json load, we parse the sub-dict
     features_data = data.pop('features', {})
+    llm_data = data.pop('llm', {})
+    brain_data = data.pop('brain', {})
+    tasks_data = data.pop('tasks', {})
     config = GlobalConfig(**data)
     config.features = FeaturesConfig(**features_data)
+    config.llm = LLMConfig(**llm_data)
+    config.brain = BrainConfig(**brain_data)
+    # Configured routes override the defaults task by task
+    config.tasks.update({name: TaskRoute(**route) for name, route in tasks_data.items()})
     return config
 
 def save_global_config(config: GlobalConfig) -> None:
@@ -59,6 +112,9 @@ def save_global_config(config: GlobalConfig) -> None:
     # Convert to dict and handle nested dataclass
     data = config.__dict__.copy()
     data['features'] = config.features.__dict__
+    data['llm'] = config.llm.__dict__
+    data['brain'] = config.brain.__dict__
+    data['tasks'] = {name: route.__dict__ for name, route in config.tasks.items()}
     
     with open(config_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2)
@@ -161,12 +161,13 @@ def check_migrations(context):
     conn.commit()
     conn.close()
 
-def sync_project_to_db(context, project_path: Path):
-    """Sync a single project folder to database."""
+def sync_project_to_db(context, project_path: Path, conn=None):
+    """Sync a single project folder to database (inside the caller's transaction if conn is given)."""
     import yaml
     
-    db_path = get_db_path(context)
-    conn = sqlite3.connect(db_path)
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(get_db_path(context))
     cursor = conn.cursor()
     
     project_id = project_path.name.split('_')[0]
@@ -252,22 +253,31 @@ def sync_project_to_db(context, project_path: Path):
                 INSERT INTO assets (project_id, slot, filename) VALUES (?, ?, ?)
             ''', (project_id, slot_name, str(asset_path)))
     
-    conn.commit()
-    conn.close()
+    if own_conn:
+        conn.commit()
+        conn.close()
     return True
 
-def sync_all_projects(context):
-    """Sync all project folders to database."""
+def sync_projects(context, project_paths) -> int:
+    """Sync several project folders in one connection and one commit."""
     init_db(context)
-    
-    count = 0
-    for project_dir in context.production_path.iterdir():
-        if project_dir.is_dir() and project_dir.name[0].isdigit():
-            sync_project_to_db(context, project_dir)
+    conn = sqlite3.connect(get_db_path(context))
+    try:
+        count = 0
+        for project_path in project_paths:
+            sync_project_to_db(context, project_path, conn)
             count += 1
-    
+        conn.commit()
+    finally:
+        conn.close()
     return count
 
+def sync_all_projects(context):
+    """Sync all project folders to database."""
+    from core.ledger import iter_kit_folders
+    return sync_projects(context, [context.production_path / folder
+                                   for folder, _ in iter_kit_folders(context.production_path)])
+
 def query_projects(context, sql_where="1=1"):
     """Query projects from database."""
     db_path = get_db_path(context)
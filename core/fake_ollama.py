@@ -0,0 +1,304 @@
+"""
+Fake Ollama Server
+Local stand-in for the Ollama HTTP API, used to benchmark ContentOS's own
+pipeline overhead and concurrency without real models.
+
+Implements /api/tags, /api/show, /api/chat (streaming and non-streaming,
+format="json") and /api/embeddings. Timing is simulated from the configured
+model load time, prompt processing rate and generation rate, and responses
+carry Ollama's eval_count / *_duration fields so telemetry works unchanged.
+
+Like Ollama, a loaded model stays in memory for the request's keep_alive
+(default 5m), a chat with no messages only loads the model, and the longest
+prompt prefix shared with a recent request is not re-evaluated (one cached
+prompt per parallel slot).
+
+Responses are canned text, or, in JSON mode, a template filled from the
+prompt: every `"field": <...>` line of the requested schema gets a value
+(first listed option, or 1 for numbers), and multi-kit prompts
+("=== KIT <id> ===") get one entry per kit.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+CHARS_PER_TOKEN = 4
+DEFAULT_KEEP_ALIVE = 300.0  # Ollama's default, seconds
+CANNED_TEXT = ("Audiences respond to short emotional hooks, satisfying loops and clear payoffs. "
+               "Recommend testing a POV format with ASMR audio and a macro close-up opener. ")
+
+@dataclass
+class FakeOllamaConfig:
+    """Simulated server behaviour."""
+    models: List[str] = field(default_factory=lambda: ["fake-bench"])
+    load_ms: float = 0.0            # One-time model load on first request per model
+    latency_ms: float = 20.0        # Fixed per-request overhead
+    prompt_tps: float = 2000.0      # Prompt tokens processed per second
+    tokens_per_sec: float = 200.0   # Generated tokens per second (per request)
+    response_tokens: int = 64       # Length of canned text responses
+    num_parallel: int = 4           # Requests served at once (OLLAMA_NUM_PARALLEL)
+    embedding_dim: int = 64
+    responder: Optional[Callable[[dict], Optional[str]]] = None  # Custom answer hook
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def _fill_json_template(prompt: str) -> str:
+    """Answers a JSON-mode prompt by filling the schema it describes."""
+    entry = {}
+    for name, spec in re.findall(r'"(\w+)":\s*(<[^>\n]*>|"<[^>\n]*>")', prompt):
+        if name == "kit_id":
+            continue
+        spec = spec.strip('"<>')
+        if spec == "number":
+            entry[name] = 1
+        else:
+            options = spec.split(":", 1)[-1].split(",")
+            entry[name] = options[0].strip()
+
+    kit_ids = re.findall(r'=== KIT (\S+) ===', prompt)
+    if kit_ids:
+        return json.dumps({"kits": [dict(entry, kit_id=kit_id) for kit_id in kit_ids]})
+    return json.dumps(entry or {"ok": True})
+
+def _keep_alive_seconds(value) -> float:
+    """Ollama keep_alive ('30m', '1h', '45s', seconds, negative = forever) in seconds."""
+    if value is None or value == "":
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r'\s*(-?[\d.]+)\s*(ms|s|m|h)?\s*', str(value))
+        if not match:
+            return DEFAULT_KEEP_ALIVE
+        unit = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2) or "s"]
+        seconds = float(match.group(1)) * unit
+    return float("inf") if seconds < 0 else seconds
+
+def _shared_prefix(a: str, b: str) -> int:
+    """Length of the common prefix of two strings (binary search on slices)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _canned_text(tokens: int) -> str:
+    words = CANNED_TEXT.split()
+    return " ".join(words[i % len(words)] for i in range(tokens))
+
+def _embedding(text: str, dim: int) -> List[float]:
+    """Deterministic pseudo-embedding (same text, same vector)."""
+    digest = b""
+    counter = 0
+    while len(digest) < dim:
+        digest += hashlib.sha256(f"{counter}:{text}".encode('utf-8')).digest()
+        counter += 1
+    return [(b - 128) / 128 for b in digest[:dim]]
+
+class FakeOllama:
+    """Threaded fake server; use start()/stop() or as a context manager."""
+
+    def __init__(self, config: Optional[FakeOllamaConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeOllamaConfig()
+        self._slots = threading.Semaphore(self.config.num_parallel)
+        self._loaded: Dict[str, float] = {}      # model -> unload time
+        self._prompts: List[str] = []            # Recent prompts, one per slot (KV cache)
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.peak_active = 0
+        self._active = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Simulation ---
+
+    def _count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def _answer(self, body: dict) -> str:
+        if self.config.responder:
+            custom = self.config.responder(body)
+            if custom is not None:
+                return custom
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        if body.get("format") == "json":
+            return _fill_json_template(prompt)
+        limit = (body.get("options") or {}).get("num_predict")
+        return _canned_text(min(self.config.response_tokens, limit) if limit else self.config.response_tokens)
+
+    def _acquire(self, model: str, keep_alive=None) -> float:
+        """Waits for a parallel slot; returns simulated load seconds."""
+        self._slots.acquire()
+        now = time.monotonic()
+        with self._lock:
+            self._active += 1
+            self.peak_active = max(self.peak_active, self._active)
+            first = self._loaded.get(model, 0.0) <= now
+            self._loaded[model] = now + _keep_alive_seconds(keep_alive)
+        return self.config.load_ms / 1000 if first else 0.0
+
+    def _cached_tokens(self, model: str, prompt: str) -> int:
+        """Prompt tokens reusable from a recent request's KV cache; remembers this prompt."""
+        key = f"{model}\0{prompt}"
+        with self._lock:
+            best = max((_shared_prefix(key, p) for p in self._prompts), default=0)
+            self._prompts.append(key)
+            del self._prompts[:-self.config.num_parallel]
+        return max(0, best - len(model) - 1) // CHARS_PER_TOKEN
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, obj, status: int = 200):
+                data = json.dumps(obj).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _chunk(self, obj):
+                data = (json.dumps(obj) + "\n").encode('utf-8')
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def _body(self) -> dict:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    return json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return {}
+
+            def do_GET(self):
+                fake._count(self.path)
+                if self.path == "/api/tags":
+                    self._json({"models": [{"name": m, "model": m, "digest": hashlib.sha1(m.encode()).hexdigest()}
+                                           for m in fake.config.models]})
+                elif self.path in ("/", "/api/version"):
+                    self._json({"version": "0.0.0-fake"})
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                fake._count(self.path)
+                body = self._body()
+                model = body.get("model") or body.get("name", "")
+                if self.path == "/api/show":
+                    if model in fake.config.models:
+                        self._json({"modelfile": "", "details": {"family": "fake"}})
+                    else:
+                        self._json({"error": f"model '{model}' not found"}, 404)
+                elif self.path == "/api/embeddings":
+                    time.sleep(fake.config.latency_ms / 1000)
+                    self._json({"embedding": _embedding(body.get("prompt", ""), fake.config.embedding_dim)})
+                elif self.path == "/api/chat":
+                    if model not in fake.config.models:
+                        self._json({"error": f"model '{model}' not found"}, 404)
+                        return
+                    self._chat(body, model)
+                else:
+                    self._json({"error": "not found"}, 404)
+
+            def _chat(self, body: dict, model: str):
+                cfg = fake.config
+                if not body.get("messages"):
+                    # Load-only request (how clients preload a model)
+                    load_s = fake._acquire(model, body.get("keep_alive"))
+                    try:
+                        time.sleep(load_s)
+                        self._json({"model": model, "message": {"role": "assistant", "content": ""},
+                                    "done": True, "done_reason": "load",
+                                    "load_duration": int(load_s * 1e9), "total_duration": int(load_s * 1e9)})
+                    finally:
+                        fake._release()
+                    return
+
+                prompt_text = "".join(m.get("content", "") for m in body["messages"])
+                answer = fake._answer(body)
+                output_tokens = _estimate_tokens(answer)
+
+                load_s = fake._acquire(model, body.get("keep_alive"))
+                try:
+                    started = time.perf_counter()
+                    # Only the part not shared with a cached prompt is evaluated
+                    prompt_tokens = max(1, _estimate_tokens(prompt_text) - fake._cached_tokens(model, prompt_text))
+                    prompt_s = prompt_tokens / cfg.prompt_tps if cfg.prompt_tps else 0.0
+                    time.sleep(cfg.latency_ms / 1000 + load_s + prompt_s)
+                    per_token = 1 / cfg.tokens_per_sec if cfg.tokens_per_sec else 0.0
+                    stats = {
+                        "prompt_eval_count": prompt_tokens,
+                        "eval_count": output_tokens,
+                        "load_duration": int(load_s * 1e9),
+                        "prompt_eval_duration": int(prompt_s * 1e9),
+                        "eval_duration": int(output_tokens * per_token * 1e9),
+                    }
+
+                    if body.get("stream", True):
+                        self.send_response(200)
+                        self.send_header("Content-Type", "application/x-ndjson")
+                        self.send_header("Transfer-Encoding", "chunked")
+                        self.end_headers()
+                        pieces = re.findall(r'\S+\s*', answer) or [answer]
+                        step = per_token * output_tokens / len(pieces)
+                        for piece in pieces:
+                            time.sleep(step)
+                            self._chunk({"model": model, "message": {"role": "assistant", "content": piece},
+                                         "done": False})
+                        stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                        self._chunk(dict(stats, model=model, message={"role": "assistant", "content": ""},
+                                         done=True))
+                        self.wfile.write(b"0\r\n\r\n")
+                    else:
+                        time.sleep(per_token * output_tokens)
+                        stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                        self._json(dict(stats, model=model, message={"role": "assistant", "content": answer},
+                                        done=True))
+                finally:
+                    fake._release()
+
+        return Handler
@@ -0,0 +1,62 @@
+"""
+Inter-process File Lock
+Advisory lock on a sidecar '<name>.lock' file, so several ContentOS
+processes (agents, scheduled jobs) can safely update the same file.
+Uses fcntl on POSIX and msvcrt on Windows.
+"""
+import contextlib
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+POLL_SECONDS = 0.05
+
+class LockTimeout(TimeoutError):
+    """Raised when the lock could not be acquired in time."""
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def _unlock(fd: int) -> None:
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextlib.contextmanager
+def file_lock(path: Path, timeout: float = 10.0) -> Iterator[None]:
+    """
+    Holds an exclusive lock for `path` (via path + '.lock') for the with-block.
+    Raises LockTimeout after `timeout` seconds of waiting.
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Timed out waiting for {lock_path}")
+            time.sleep(POLL_SECONDS)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
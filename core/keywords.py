@@ -0,0 +1,237 @@
+"""
+Keyword Engine
+Single-pass multi-pattern matching for ingredient, emotion and sentiment keywords.
+
+A keyword table (group -> keyword -> label) is compiled once: each distinct
+keyword is matched a single time per text and every hit maps straight to its
+(group, label) tags. Large tables use one trie-shaped regex pass; numeric
+captures (durations, clip counts) are precompiled.
+
+Run `python -m core.keywords` for a micro-benchmark against plain `in` loops.
+"""
+import re
+import time
+from typing import Dict, List, Optional, Iterable
+
+REGEX_MIN_KEYWORDS = 64  # Below this, per-keyword `in` probes beat one regex pass
+
+# group -> {keyword: label}; keyword order is priority order (first wins)
+INGREDIENT_KEYWORDS = {
+    "hook": {"pov": "POV", "tutorial": "Tutorial", "how to": "Tutorial"},
+    "hook_cue": {"adopt": "Emotional", "chose": "Emotional", "love": "Emotional",
+                 "trust": "Emotional", "emotional": "Emotional"},
+    "audio": {"asmr": "ASMR_Purr", "purr": "ASMR_Purr", "music": "Music_Emotional",
+              "voiceover": "Voiceover", "narrator": "Voiceover"},
+    "visual": {"macro": "Macro_Closeup", "close-up": "Macro_Closeup", "closeup": "Macro_Closeup",
+               "pov": "POV_FirstPerson", "first person": "POV_FirstPerson",
+               "loop": "Loop_Seamless", "seamless": "Loop_Seamless",
+               "cinematic": "Cinematic_Smooth",
+               "handheld": "Handheld_Raw", "home video": "Handheld_Raw"},
+    "physics": {"rigid": "Rigid_Body", "fluid": "Fluid_Sim", "water": "Fluid_Sim",
+                "particle": "Particle_FX", "static": "Static_Hold"},
+    "emotion": {"love": "Love", "trust": "Trust", "curious": "Curiosity",
+                "satisfy": "Satisfaction", "nostalg": "Nostalgia",
+                "fomo": "FOMO", "humor": "Humor", "funny": "Humor",
+                "adopt": "Love", "emotional": "Love", "dream": "Curiosity"}
+}
+
+# name -> regex with one capture group; the first match per text is kept
+INGREDIENT_CAPTURES = {
+    "duration": r'(\d+)\s*(?:second|sec|s\b)',
+    "clips": r'(\d+)\s*(?:clip|scene|segment)'
+}
+
+SENTIMENT_KEYWORDS = {
+    "sentiment": {"love": "positive", "great": "positive", "awesome": "positive",
+                  "good": "positive", "best": "positive",
+                  "hate": "negative", "bad": "negative", "worst": "negative", "boring": "negative"}
+}
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Builds a regex alternation shaped like a prefix trie (longest match first)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node) -> str:
+        end = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            # Single-char branches can use ? directly; longer ones need a group
+            return (body + '?') if len(branches) == 1 and len(body) == 1 else f'(?:{body})?'
+        return body
+
+    return render(trie)
+
+class KeywordEngine:
+    """
+    Compiled keyword table: one scan yields hit counts per group/label.
+
+    Matching is case-insensitive substring matching (like `kw in text.lower()`).
+    Each distinct keyword is tested once even if several groups use it. Tables
+    with at least REGEX_MIN_KEYWORDS keywords are matched by a single trie regex
+    pass; smaller ones probe each keyword with `in`, which CPython runs faster
+    than the regex engine at that size (see benchmark()).
+    """
+
+    def __init__(self, table: Dict[str, Dict[str, str]], captures: Optional[Dict[str, str]] = None,
+                 strategy: Optional[str] = None):
+        self.table = table
+        self.captures = {name: re.compile(pattern) for name, pattern in (captures or {}).items()}
+
+        # keyword -> [(rank, group, label)], rank = position in its group
+        self._tags: Dict[str, List[tuple]] = {}
+        for group, keywords in table.items():
+            for rank, (keyword, label) in enumerate(keywords.items()):
+                self._tags.setdefault(keyword.lower(), []).append((rank, group, label))
+        self._keywords = list(self._tags)
+
+        self.strategy = strategy or ('regex' if len(self._keywords) >= REGEX_MIN_KEYWORDS else 'probe')
+        self._regex = re.compile(_trie_pattern(self._keywords))
+        # A regex match also implies every keyword it contains
+        self._implied = {
+            kw: [other for other in self._keywords if other != kw and other in kw]
+            for kw in self._keywords
+        }
+
+    def _matched(self, lower: str) -> set:
+        if self.strategy == 'probe':
+            return {kw for kw in self._keywords if kw in lower}
+        found = set(self._regex.findall(lower))
+        for kw in list(found):
+            found.update(self._implied[kw])
+        return found
+
+    def scan(self, text: str) -> dict:
+        """
+        Scans one text.
+
+        Returns {'groups': {group: {label: distinct keyword hits}},
+                 'captures': {name: first captured string}}.
+        Labels appear in priority order (earliest keyword in the table first).
+        """
+        lower = text.lower()
+        tagged = sorted(tag for kw in self._matched(lower) for tag in self._tags[kw])
+
+        groups = {group: {} for group in self.table}
+        for rank, group, label in tagged:
+            groups[group][label] = groups[group].get(label, 0) + 1
+
+        captures = {}
+        for name, pattern in self.captures.items():
+            match = pattern.search(lower)
+            if match:
+                captures[name] = match.group(1)
+        return {'groups': groups, 'captures': captures}
+
+    def scan_many(self, texts: Iterable[str]) -> List[dict]:
+        """Scans many texts with the compiled table."""
+        return [self.scan(text) for text in texts]
+
+    def first_label(self, scan_result: dict, group: str, default: Optional[str] = None) -> Optional[str]:
+        """Highest-priority label hit in a group, or default."""
+        return next(iter(scan_result['groups'][group]), default)
+
+_ENGINES: Dict[str, KeywordEngine] = {}
+
+def get_ingredient_engine() -> KeywordEngine:
+    """Shared engine for kit prompt DNA extraction (compiled on first use)."""
+    if 'ingredients' not in _ENGINES:
+        _ENGINES['ingredients'] = KeywordEngine(INGREDIENT_KEYWORDS, INGREDIENT_CAPTURES)
+    return _ENGINES['ingredients']
+
+def get_sentiment_engine() -> KeywordEngine:
+    """Shared engine for comment sentiment (compiled on first use)."""
+    if 'sentiment' not in _ENGINES:
+        _ENGINES['sentiment'] = KeywordEngine(SENTIMENT_KEYWORDS)
+    return _ENGINES['sentiment']
+
+def _score(scan_result: dict) -> float:
+    labels = scan_result['groups']['sentiment']
+    if 'positive' in labels:
+        return 0.8
+    if 'negative' in labels:
+        return -0.8
+    return 0.0
+
+def sentiment_score(text: str) -> float:
+    """Keyword sentiment: 0.8 if any positive word, -0.8 if any negative word, else 0.0."""
+    return _score(get_sentiment_engine().scan(text))
+
+def sentiment_scores(texts: List[str]) -> List[float]:
+    """Bulk sentiment_score in one pass."""
+    return [_score(r) for r in get_sentiment_engine().scan_many(texts)]
+
+# ============ MICRO-BENCHMARK ============
+
+def _loop_scan(text: str, table: Dict[str, Dict[str, str]], captures: Dict[str, str]) -> dict:
+    """Baseline: today's approach, one `in` test per keyword per group plus a regex per capture."""
+    lower = text.lower()
+    groups = {}
+    for group, keywords in table.items():
+        hits = groups[group] = {}
+        for keyword, label in keywords.items():
+            if keyword in lower:
+                hits[label] = hits.get(label, 0) + 1
+    found = {}
+    for name, pattern in captures.items():
+        match = re.search(pattern, lower)
+        if match:
+            found[name] = match.group(1)
+    return {'groups': groups, 'captures': found}
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def benchmark(count: int = 5000) -> List[dict]:
+    """
+    Times per-keyword loops against both engine strategies.
+
+    Cases: kit prompts with the ingredient table, comments with the sentiment
+    table, and prompts with a synthetic 10x ingredient table to show how each
+    approach scales with keyword count.
+    """
+    prompt = ("POV: you adopted a shy kitten and she chose you. Macro close-up of tiny paws, "
+              "soft ASMR purr, warm handheld light. 2 clips, 8 seconds each. ") * 4
+    comment = "Honestly not sure what to think about this one, the ending was a bit slow"
+    prompts = [f"{prompt} #{i}" for i in range(count)]
+    comments = [f"{comment} {i}" for i in range(count)]
+
+    large = {f"{group}_{n}": {f"{kw}{n}" if n else kw: label for kw, label in keywords.items()}
+             for n in range(10) for group, keywords in INGREDIENT_KEYWORDS.items()}
+
+    cases = [
+        ("prompts", prompts, INGREDIENT_KEYWORDS, INGREDIENT_CAPTURES),
+        ("comments", comments, SENTIMENT_KEYWORDS, {}),
+        ("prompts10x", prompts, large, INGREDIENT_CAPTURES),
+    ]
+
+    rows = []
+    for name, texts, table, captures in cases:
+        probe = KeywordEngine(table, captures, strategy='probe')
+        regex = KeywordEngine(table, captures, strategy='regex')
+        assert probe.scan(texts[0]) == regex.scan(texts[0]) == _loop_scan(texts[0], table, captures)
+        loop_s = _time(lambda: [_loop_scan(t, table, captures) for t in texts])
+        probe_s = _time(lambda: probe.scan_many(texts))
+        regex_s = _time(lambda: regex.scan_many(texts))
+        rows.append({'case': name, 'texts': len(texts), 'keywords': len(probe._keywords),
+                     'loop_s': loop_s, 'probe_s': probe_s, 'regex_s': regex_s,
+                     'auto': KeywordEngine(table, captures).strategy})
+    return rows
+
+if __name__ == "__main__":
+    print(f"{'Case':<11} {'Texts':>6} {'Keywords':>8} {'Loops':>8} {'probe':>8} {'regex':>8} {'Auto':>6}")
+    for row in benchmark():
+        print(f"{row['case']:<11} {row['texts']:>6} {row['keywords']:>8} {row['loop_s']:>7.3f}s "
+              f"{row['probe_s']:>7.3f}s {row['regex_s']:>7.3f}s {row['auto']:>6}")
@@ -0,0 +1,317 @@
+"""
+Kit Catalog
+Per-channel index of production kits in <channel>/.kit_catalog.db, so
+listing or finding kits doesn't re-walk production/ and re-parse every
+kit.yaml each time.
+
+One row per kit folder: id, name, kit.yaml status/theme/formula/video id,
+performance and asset completeness, plus a signature of the paths it was
+read from (the kit folder, kit.yaml and the formula's asset folders).
+
+Folders are stored relative to production/ ('1234_name', or
+'1000-1999/1234_name' when sharded). Revalidation is by mtime only:
+  - production/ and its bucket folders unchanged -> the set of kit folders
+    is taken from the table (no directory listing);
+  - a kit's signature unchanged -> its row is used as is (a few stats, no
+    YAML parsing, no asset directory listing).
+Only new or changed kits are re-read. Directory stats include the link
+count (it grows with each subfolder on most filesystems, where the size
+often doesn't), and a signature taken within MTIME_SLACK_NS of one of its
+mtimes is not trusted: a folder added in the same clock tick as a sync
+would otherwise leave the mtime unchanged and go unseen.
+
+list_kits() and filtered pages revalidate every row; get_kit() and
+unfiltered pages only the rows they return (their total is exact from the
+folder set alone).
+"""
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from core.ledger import KIT_DIR_RE, BUCKET_RE, iter_kit_folders, parse_kit_folder
+
+CATALOG_FILE = ".kit_catalog.db"
+
+COLUMNS = ["folder", "id", "name", "kit_status", "status", "theme", "formula", "video_id",
+           "published_at", "views_7d", "rating", "has_script", "has_prompt", "has_assets", "sig"]
+MTIME_SLACK_NS = 2_000_000_000   # Coarsest common mtime granularity (FAT: 2 s)
+
+def get_catalog_path(ctx) -> Path:
+    return ctx.path / CATALOG_FILE
+
+def _connect(ctx) -> sqlite3.Connection:
+    """Opens the catalog, creating the schema on first use."""
+    conn = sqlite3.connect(get_catalog_path(ctx), timeout=10)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS kits (
+            folder TEXT PRIMARY KEY,
+            id TEXT,
+            name TEXT,
+            kit_status TEXT,
+            status TEXT,
+            theme TEXT,
+            formula TEXT,
+            video_id TEXT,
+            published_at TEXT,
+            views_7d INTEGER,
+            rating TEXT,
+            has_script INTEGER,
+            has_prompt INTEGER,
+            has_assets INTEGER,
+            sig TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_kits_num ON kits(CAST(id AS INTEGER))')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_kits_status ON kits(kit_status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_kits_theme ON kits(theme)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+    return conn
+
+def _stat(path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size, st.st_nlink]
+    except OSError:
+        return None
+
+def _racy(stats) -> bool:
+    """True if a stat is too recent for a later change to be sure to move its mtime."""
+    now = time.time_ns()
+    return any(s is not None and now - s[0] < MTIME_SLACK_NS for s in stats)
+
+def _trusted(stats) -> str:
+    """Signature string, or '' (never matches) when racy, so the next call re-reads."""
+    return '' if _racy(stats) else json.dumps(stats)
+
+def _formula_dirs(formula: str) -> List[str]:
+    from core.templates import FORMULAS
+    return FORMULAS.get(formula, FORMULAS['stitch_2clip']).get('dirs', [])
+
+def _kit_stats(kit_path, formula: str) -> List[Optional[List[int]]]:
+    """Folder (files added/removed), kit.yaml (edits) and asset folders (assets placed)."""
+    # Plain string joins: this runs for every kit on every listing
+    base = str(kit_path) + os.sep
+    paths = [kit_path, base + 'kit.yaml'] + [base + d for d in _formula_dirs(formula)]
+    return [_stat(p) for p in paths]
+
+def _signature(kit_path, formula: str) -> str:
+    return json.dumps(_kit_stats(kit_path, formula))
+
+def _has_files(path: Path) -> bool:
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except OSError:
+        return False
+
+def _read_kit(kit_path: Path, folder: str) -> Optional[Dict[str, Any]]:
+    """Builds a catalog row from a kit folder (one kit.yaml parse)."""
+    match = KIT_DIR_RE.match(kit_path.name)
+    if not match:
+        return None
+
+    import yaml
+    data = {}
+    yaml_path = kit_path / 'kit.yaml'
+    if yaml_path.exists():
+        try:
+            with open(yaml_path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+        except Exception:
+            data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    ingredients = data.get('ingredients') or {}
+    formula = ingredients.get('formula', 'stitch_2clip')
+    video_id = data.get('video_id')
+    has_script = (kit_path / 'script.txt').exists()
+    has_prompt = (kit_path / 'prompt.txt').exists()
+    has_assets = any(_has_files(kit_path / d) for d in _formula_dirs(formula))
+
+    status = '[SETUP]'
+    if has_script and has_prompt and has_assets:
+        if video_id and video_id != 'TBD':
+            status = '[PUBLISHED]'
+        else:
+            status = '[PENDING]'
+    elif not has_script:
+        status = '[EMPTY]'
+
+    return {
+        'folder': folder,
+        'id': match.group(1),
+        'name': match.group(2),
+        'kit_status': data.get('status', 'setup'),
+        'status': status,
+        'theme': ingredients.get('theme') or data.get('theme'),
+        'formula': formula,
+        'video_id': video_id,
+        'published_at': str(data['published_at']) if data.get('published_at') else None,
+        'views_7d': (data.get('performance') or {}).get('views_7d'),
+        'rating': (data.get('ratings') or {}).get('overall'),
+        'has_script': int(has_script),
+        'has_prompt': int(has_prompt),
+        'has_assets': int(has_assets),
+        'sig': _trusted(_kit_stats(kit_path, formula))   # An edit during this read is still recent, so racy
+    }
+
+def _upsert(cursor, row: Dict[str, Any]) -> None:
+    cursor.execute(f'INSERT OR REPLACE INTO kits ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                   [row[c] for c in COLUMNS])
+
+def _to_kit(ctx, row) -> Dict[str, Any]:
+    """Catalog row -> the dict shape list_production_kits has always returned (plus extras)."""
+    kit = dict(row)
+    kit.pop('sig', None)
+    kit['path'] = ctx.production_path.joinpath(kit['folder'])
+    for flag in ('has_script', 'has_prompt', 'has_assets'):
+        kit[flag] = bool(kit[flag])
+    return kit
+
+def _production_stats(ctx, buckets: List[str]) -> List[Optional[List[int]]]:
+    base = str(ctx.production_path) + os.sep
+    return [_stat(ctx.production_path)] + [_stat(base + b) for b in buckets]
+
+def _production_sig(ctx, buckets: List[str]) -> str:
+    return json.dumps([buckets, _production_stats(ctx, buckets)])
+
+def _sync_folders(ctx, conn) -> None:
+    """Adds/removes rows when production/ or a bucket changed (folders created, renamed, deleted)."""
+    stored = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('production_sig', 'buckets')"))
+    buckets = json.loads(stored.get('buckets', '[]'))
+    if stored.get('production_sig') == _production_sig(ctx, buckets):
+        return
+
+    # Each folder is stat'ed before it is listed, so a change in between moves the signature
+    prod_stat = _stat(ctx.production_path)
+    buckets = sorted(n for n in os.listdir(ctx.production_path)
+                     if BUCKET_RE.match(n) and os.path.isdir(os.path.join(ctx.production_path, n))) \
+        if prod_stat else []
+    stats = [prod_stat] + _production_stats(ctx, buckets)[1:]
+    prod_sig = '' if _racy(stats) else json.dumps([buckets, stats])
+    on_disk = dict(iter_kit_folders(ctx.production_path))
+    known = {r[0] for r in conn.execute('SELECT folder FROM kits')}
+    cursor = conn.cursor()
+    cursor.executemany('DELETE FROM kits WHERE folder = ?', [(f,) for f in known - on_disk.keys()])
+    for folder in on_disk.keys() - known:
+        row = _read_kit(ctx.production_path / folder, folder)
+        if row:
+            _upsert(cursor, row)
+    cursor.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                       [('production_sig', prod_sig), ('buckets', json.dumps(buckets))])
+    conn.commit()
+
+def _revalidate(ctx, conn, rows) -> bool:
+    """Re-reads rows whose signature changed; returns True if any did."""
+    cursor = conn.cursor()
+    changed = False
+    base = str(ctx.production_path) + os.sep
+    for row in rows:
+        if _signature(base + row['folder'], row['formula']) == row['sig']:
+            continue
+        kit_path = ctx.production_path / row['folder']
+        fresh = _read_kit(kit_path, row['folder']) if kit_path.is_dir() else None
+        if fresh:
+            _upsert(cursor, fresh)
+        else:
+            cursor.execute('DELETE FROM kits WHERE folder = ?', (row['folder'],))
+        changed = True
+    if changed:
+        conn.commit()
+    return changed
+
+def list_kits(ctx) -> List[Dict[str, Any]]:
+    """All kits, ordered by id, each revalidated against its folder."""
+    conn = _connect(ctx)
+    try:
+        _sync_folders(ctx, conn)
+        query = 'SELECT * FROM kits ORDER BY CAST(id AS INTEGER), folder'
+        rows = conn.execute(query).fetchall()
+        if _revalidate(ctx, conn, rows):
+            rows = conn.execute(query).fetchall()
+        return [_to_kit(ctx, r) for r in rows]
+    finally:
+        conn.close()
+
+def get_kit(ctx, kit_id: str) -> Optional[Dict[str, Any]]:
+    """One kit by id, compared numerically ('18' finds 018); first folder if several share it."""
+    if not str(kit_id).isdigit():
+        return None
+    conn = _connect(ctx)
+    try:
+        _sync_folders(ctx, conn)
+        query = 'SELECT * FROM kits WHERE CAST(id AS INTEGER) = ? ORDER BY folder LIMIT 1'
+        rows = conn.execute(query, (int(kit_id),)).fetchall()
+        if _revalidate(ctx, conn, rows):
+            rows = conn.execute(query, (int(kit_id),)).fetchall()
+        return _to_kit(ctx, rows[0]) if rows else None
+    finally:
+        conn.close()
+
+def max_kit_id(ctx) -> int:
+    """Highest kit id in production/ (0 when there are none)."""
+    conn = _connect(ctx)
+    try:
+        _sync_folders(ctx, conn)
+        return conn.execute('SELECT MAX(CAST(id AS INTEGER)) FROM kits').fetchone()[0] or 0
+    finally:
+        conn.close()
+
+def count_kits(ctx) -> int:
+    conn = _connect(ctx)
+    try:
+        _sync_folders(ctx, conn)
+        return conn.execute('SELECT COUNT(*) FROM kits').fetchone()[0]
+    finally:
+        conn.close()
+
+def kit_page(ctx, after: Optional[str] = None, limit: int = 10, status: Optional[str] = None,
+             theme: Optional[str] = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    One page of kits, newest id first (then by folder), filtered by kit.yaml
+    status / theme. after: continue below this id, or after this folder
+    ('007_a', '0-999/007_a') when folders share an id ('007_a', '0007_b').
+    Returns (total matching the filters, kits).
+    """
+    where, params = [], []
+    if status:
+        where.append('kit_status = ?')
+        params.append(status)
+    if theme:
+        where.append('theme = ?')
+        params.append(theme)
+    sql_where = ' AND '.join(where) or '1=1'
+    page_where, page_params = sql_where, list(params)
+    if after is not None and not str(after).isdigit():
+        parsed = parse_kit_folder(os.path.basename(after))
+        page_where += ' AND (CAST(id AS INTEGER) < ? OR (CAST(id AS INTEGER) = ? AND folder > ?))'
+        page_params += [int(parsed[0]) if parsed else 0] * 2 + [after]
+    elif after is not None:
+        page_where += ' AND CAST(id AS INTEGER) < CAST(? AS INTEGER)'
+        page_params.append(after)
+    query = f'SELECT * FROM kits WHERE {page_where} ORDER BY CAST(id AS INTEGER) DESC, folder LIMIT ?'
+
+    conn = _connect(ctx)
+    try:
+        _sync_folders(ctx, conn)
+        if where:
+            # A filter reads every row, so every row must be current
+            _revalidate(ctx, conn, conn.execute('SELECT folder, formula, sig FROM kits').fetchall())
+        rows = conn.execute(query, page_params + [limit]).fetchall()
+        if _revalidate(ctx, conn, rows):
+            rows = conn.execute(query, page_params + [limit]).fetchall()
+        total = conn.execute(f'SELECT COUNT(*) FROM kits WHERE {sql_where}', params).fetchone()[0]
+        return total, [_to_kit(ctx, r) for r in rows]
+    finally:
+        conn.close()
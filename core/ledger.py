@@ -1,4 +1,5 @@
-"""Ledger utilities for markdown parsing and writing."""
+"""Ledger utilities for markdown parsing and writing, and kit id / folder resolution."""
+import os
 import re
 from pathlib import Path
 from datetime import datetime
@@ -13,21 +14,120 @@ def get_viral_dna_path(context) -> Path:
 def get_market_research_path(context) -> Path:
     return context.strategy_path / f"{context.config.name.lower()}_market_research.md"
 
-def get_next_project_id(context) -> str:
-    """Scans production/ and returns the next available project ID."""
-    production_dir = context.production_path
+# --- Kit ids and folders ---
+# Kit folders are '<id>_<name>'. Ids are decimal, zero-padded to at least
+# KIT_ID_WIDTH digits ('007', '999', '1000', '12345'), so every existing
+# three-digit folder parses unchanged. With production_shard_size set, kits
+# live in range buckets: production/1000-1999/1234_name.
+
+KIT_ID_WIDTH = 3
+KIT_COUNTER_FILE = ".kit_counter"   # Next id to hand out, guarded by a file lock
+KIT_DIR_RE = re.compile(r'^(\d{%d,})_(.+)$' % KIT_ID_WIDTH)
+BUCKET_RE = re.compile(r'^(\d+)-(\d+)$')
+
+def format_kit_id(number: int) -> str:
+    return f"{number:0{KIT_ID_WIDTH}d}"
+
+def parse_kit_folder(name: str) -> Optional[tuple]:
+    """'1234_cat_loop' -> ('1234', 'cat_loop'); None for anything else."""
+    match = KIT_DIR_RE.match(name)
+    return (match.group(1), match.group(2)) if match else None
+
+def kit_bucket(kit_id: str, shard_size: int) -> Optional[str]:
+    """Bucket folder for an id ('1000-1999' for 1234 at size 1000); None when not sharded."""
+    if not shard_size:
+        return None
+    low = int(kit_id) // shard_size * shard_size
+    return f"{low}-{low + shard_size - 1}"
+
+def get_shard_size(context) -> int:
+    return getattr(context.config, 'production_shard_size', 0) or 0
+
+def kit_folder_path(context, kit_id: str, slug: str) -> Path:
+    """Where a kit with this id and name belongs under the channel's layout."""
+    bucket = kit_bucket(kit_id, get_shard_size(context))
+    parent = context.production_path / bucket if bucket else context.production_path
+    return parent / f"{kit_id}_{slug}"
+
+def iter_kit_folders(production_dir: Path):
+    """Yields (relative folder, name) for every kit folder, flat or inside buckets."""
     if not production_dir.exists():
-        return "001"
-    
-    existing = [d.name for d in production_dir.iterdir() if d.is_dir()]
-    ids = []
-    for name in existing:
-        match = re.match(r'^(\d{3})_', name)
-        if match:
-            ids.append(int(match.group(1)))
-    
-    next_id = max(ids) + 1 if ids else 1
-    return f"{next_id:03d}"
+        return
+    with os.scandir(production_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue  # Stray files ('001_notes.txt') are not kits
+            if KIT_DIR_RE.match(entry.name):
+                yield entry.name, entry.name
+            elif BUCKET_RE.match(entry.name):
+                with os.scandir(entry.path) as subs:
+                    for sub in subs:
+                        if sub.is_dir() and KIT_DIR_RE.match(sub.name):
+                            yield f"{entry.name}/{sub.name}", sub.name
+
+def resolve_kit_path(context, kit_id: str) -> Optional[Path]:
+    """
+    The one id -> folder lookup (asset place, index kits.<id>, archive, ...).
+    Accepts an id ('18', '018', '1234') or a full folder name.
+    """
+    parsed = parse_kit_folder(kit_id)
+    if parsed:
+        kit_id = parsed[0]
+    if not kit_id.isdigit():
+        return None
+    kit = find_production_kit(context, format_kit_id(int(kit_id)))
+    return kit['path'] if kit else None
+
+def get_next_project_id(context) -> str:
+    """
+    Returns the next available project ID (one past the highest in the catalog).
+    Only a preview: two processes can get the same answer. Use
+    allocate_kit_ids / create_kit_folder to actually claim ids.
+    """
+    if not context.production_path.exists():
+        return format_kit_id(1)
+    from core.kit_catalog import max_kit_id
+    return format_kit_id(max_kit_id(context) + 1)
+
+def allocate_kit_ids(context, count: int = 1) -> List[str]:
+    """
+    Reserves `count` consecutive kit ids, atomically across processes.
+    The counter file is read and advanced under its lock, and never hands
+    out an id at or below the highest kit already in production/ (kits
+    copied in by hand, or created before the counter existed).
+    """
+    from core.filelock import file_lock
+    from core.kit_catalog import max_kit_id
+
+    counter_path = context.path / KIT_COUNTER_FILE
+    with file_lock(counter_path):
+        try:
+            stored = int(counter_path.read_text(encoding='utf-8').strip())
+        except (OSError, ValueError):
+            stored = 0
+        highest = max_kit_id(context) if context.production_path.exists() else 0
+        first = max(stored, highest + 1)
+        tmp_path = counter_path.with_name(counter_path.name + ".tmp")
+        tmp_path.write_text(str(first + count), encoding='utf-8')
+        os.replace(tmp_path, counter_path)
+    return [format_kit_id(n) for n in range(first, first + count)]
+
+def create_kit_folder(context, slug: str, attempts: int = 5) -> tuple:
+    """
+    Allocates an id and creates its empty kit folder, returning (id, path).
+    mkdir(exist_ok=False) guarantees the folder is ours; on a collision a
+    fresh id is allocated.
+    """
+    for _ in range(attempts):
+        kit_id = allocate_kit_ids(context)[0]
+        kit_path = kit_folder_path(context, kit_id, slug)
+        kit_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            kit_path.mkdir()
+            return kit_id, kit_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a kit folder for '{slug}' after {attempts} attempts")
 
 def read_file(file_path: Path) -> str:
     """Reads the entire content of a file."""
@@ -78,65 +178,19 @@ def parse_analytics_table(content: str) -> List[Dict]:
     return data
 
 def list_production_kits(context) -> List[Dict]:
-    """Lists all kits in the production directory."""
-    production_dir = context.production_path
-    if not production_dir.exists():
+    """
+    Lists all kits in the production directory, ordered by id.
+    Served from the kit catalog (core.kit_catalog), which re-reads only
+    kits whose folder, kit.yaml or asset folders changed.
+    """
+    if not context.production_path.exists():
         return []
-    
-    kits = []
-    for item in sorted(production_dir.iterdir()):
-        if item.is_dir():
-            match = re.match(r'^(\d{3})_(.+)$', item.name)
-            if match:
-                yaml_path = item / 'kit.yaml'
-                kit_status = 'setup'
-                video_id = None
-                
-                if yaml_path.exists():
-                    import yaml
-                    try:
-                        with open(yaml_path, 'r', encoding='utf-8') as f:
-                            kit_data = yaml.safe_load(f) or {}
-                            kit_status = kit_data.get('status', 'setup')
-                            video_id = kit_data.get('video_id')
-                    except Exception:
-                        pass
-                
-                has_script = (item / 'script.txt').exists()
-                has_prompt = (item / 'prompt.txt').exists()
-                from core.templates import FORMULAS
-                formula_name = 'stitch_2clip'
-                if yaml_path.exists():
-                    try:
-                        with open(yaml_path, 'r', encoding='utf-8') as f:
-                            kit_data_yaml = yaml.safe_load(f) or {}
-                            formula_name = kit_data_yaml.get('ingredients', {}).get('formula', 'stitch_2clip')
-                    except Exception:
-                        pass
-
-                f_config = FORMULAS.get(formula_name, FORMULAS['stitch_2clip'])
-                # Check if ANY asset directory has files
-                has_assets = False
-                for d in f_config.get('dirs', []):
-                    d_path = item / d
-                    if d_path.exists() and any(d_path.iterdir()):
-                        has_assets = True
-                        break
-                
-                display_status = '[SETUP]'
-                if has_script and has_prompt and has_assets:
-                    if video_id and video_id != 'TBD':
-                        display_status = '[PUBLISHED]'
-                    else:
-                        display_status = '[PENDING]'
-                elif not has_script:
-                    display_status = '[EMPTY]'
-                
-                kits.append({
-                    'id': match.group(1),
-                    'name': match.group(2),
-                    'path': item,
-                    'status': display_status
-                })
-    
-    return kits
+    from core.kit_catalog import list_kits
+    return list_kits(context)
+
+def find_production_kit(context, kit_id: str) -> Optional[Dict]:
+    """Looks up one kit by id without listing the others."""
+    if not context.production_path.exists():
+        return None
+    from core.kit_catalog import get_kit
+    return get_kit(context, kit_id)
@@ -3,11 +3,29 @@ LLM Driver for ContentOS
 Connects to local Ollama instance (or compatible APIs).
 """
 import requests
+import hashlib
 import json
-from typing import List, Dict, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, Iterator, Optional
+
+from core import llm_cache, llm_telemetry
+from core.config import CONTENTOS_DIR
+
+def _host_from_env() -> str:
+    """OLLAMA_HOST as Ollama itself reads it ('host:port' or a full URL)."""
+    from urllib.parse import urlsplit
+    host = os.environ.get("OLLAMA_HOST", "").strip().rstrip("/")
+    if not host:
+        return "http://localhost:11434"
+    if "://" not in host:
+        host = f"http://{host}"
+    return host if urlsplit(host).port else f"{host}:11434"
 
 # Default Configuration
-OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_HOST = _host_from_env()
 # Priority list: High IQ -> Coding -> Fast Local
 PRIORITY_MODELS = [
     "deepseek-v3.1:671b-cloud",  # Best reasoning
@@ -16,12 +34,64 @@ PRIORITY_MODELS = [
     "mistral"                    # Old faithful
 ]
 
+DEFAULT_SYSTEM = "You are a helpful AI assistant for a YouTube automation system."
+
+DEFAULT_TEMPERATURE = 0.7
+
 _ACTIVE_MODEL = None
+MODEL_SELECTION_PATH = CONTENTOS_DIR / "llm_model.json"
+
+# Resolved model per task route (see get_task_model)
+_TASK_MODELS: Dict[str, str] = {}
+_TASK_LOCK = threading.Lock()
+
+# Shared keep-alive session (see get_session)
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+# Per-thread timing of the latest call (see get_last_stats)
+_STATS = threading.local()
+
+def _llm_config():
+    """Returns the LLM section of the global config (defaults if unreadable)."""
+    try:
+        from core.context import context_manager
+        return context_manager.global_config.llm
+    except Exception:
+        from core.config import LLMConfig
+        return LLMConfig()
+
+def get_session() -> requests.Session:
+    """
+    Returns the module-wide pooled HTTP session, creating it on first use.
+    
+    Connections to Ollama are kept alive and reused across calls instead of
+    paying a TCP handshake per request. The session is safe to share between
+    worker threads; the pool holds up to `llm.pool_size` idle connections.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                pool_size = _llm_config().pool_size
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
+def _timeout(read_timeout: float) -> tuple:
+    """Builds a (connect, read) timeout tuple for requests."""
+    return (_llm_config().connect_timeout, read_timeout)
 
 def check_connection() -> bool:
     """Checks if Ollama is accessible."""
     try:
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=2)
+        response = get_session().get(f"{OLLAMA_HOST}/api/tags", timeout=_timeout(_llm_config().probe_timeout))
         return response.status_code == 200
     except (requests.RequestException, ConnectionError):
         return False
@@ -75,63 +145,420 @@ def ensure_ollama_running() -> bool:
         print(f"[!] Failed to start Ollama: {e}")
         return False
 
-def list_models() -> List[str]:
-    """Returns list of available local models."""
+def _fetch_tags() -> List[Dict[str, Any]]:
+    """Returns the raw /api/tags model entries (empty list if unreachable)."""
     try:
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=2)
+        response = get_session().get(f"{OLLAMA_HOST}/api/tags", timeout=_timeout(_llm_config().probe_timeout))
         if response.status_code == 200:
-            data = response.json()
-            return [m['name'] for m in data.get('models', [])]
+            return response.json().get('models', [])
         return []
-    except (requests.RequestException, ConnectionError):
+    except (requests.RequestException, ConnectionError, ValueError):
         return []
 
+def list_models() -> List[str]:
+    """Returns list of available local models."""
+    return [m['name'] for m in _fetch_tags()]
+
+def _tags_digest(models: List[Dict[str, Any]]) -> str:
+    """Fingerprint of the installed model set; changes when models are pulled/removed."""
+    entries = sorted(f"{m.get('name')}@{m.get('digest', '')}" for m in models)
+    return hashlib.sha256("\n".join(entries).encode('utf-8')).hexdigest()
+
+def _load_selection() -> Optional[Dict[str, Any]]:
+    """Reads the persisted model selection, if any."""
+    if not MODEL_SELECTION_PATH.exists():
+        return None
+    try:
+        with open(MODEL_SELECTION_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_selection(tags_digest: str, model_name: Optional[str] = None, task: Optional[str] = None) -> None:
+    """
+    Persists a selection so later processes can skip probing: the global
+    model, or (with task) one task route's model. Entries made against a
+    different installed model set are dropped.
+    """
+    saved = _load_selection() or {}
+    if saved.get("tags_digest") != tags_digest:
+        saved = {}
+    saved["tags_digest"] = tags_digest
+    if task:
+        saved.setdefault("tasks", {})[task] = {"model": model_name, "selected_at": time.time()}
+    else:
+        saved.update({"model": model_name, "selected_at": time.time()})
+    try:
+        CONTENTOS_DIR.mkdir(exist_ok=True)
+        with open(MODEL_SELECTION_PATH, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=2)
+    except OSError:
+        pass
+
+def invalidate_model_selection() -> None:
+    """Forgets the selected models (in memory and on disk); the next call re-probes."""
+    global _ACTIVE_MODEL
+    _ACTIVE_MODEL = None
+    with _TASK_LOCK:
+        _TASK_MODELS.clear()
+    try:
+        MODEL_SELECTION_PATH.unlink()
+    except OSError:
+        pass
+
 def get_best_model(force_refresh=False) -> str:
     """
     Smartly selects the best available model from the priority list.
-    Pings them in order to find the first one that works.
+    
+    The choice is persisted to .contentos/llm_model.json and reused by later
+    processes while it is younger than llm.model_cache_ttl and the installed
+    model set (/api/tags) is unchanged. Otherwise the priority list is
+    re-checked with a cheap /api/show liveness probe per candidate.
     """
     global _ACTIVE_MODEL
     if _ACTIVE_MODEL and not force_refresh:
         return _ACTIVE_MODEL
 
-    available = list_models()
+    models = _fetch_tags()
+    available = [m['name'] for m in models]
     if not available:
         return "mistral" # Verification failed, fallback default
+    digest = _tags_digest(models)
+
+    # 0. Reuse persisted selection
+    if not force_refresh:
+        saved = _load_selection()
+        if (saved and saved.get('model') in available
+                and saved.get('tags_digest') == digest
+                and time.time() - saved.get('selected_at', 0) < _llm_config().model_cache_ttl):
+            _ACTIVE_MODEL = saved['model']
+            return _ACTIVE_MODEL
 
     # 1. Check Priority List
     for preferred in PRIORITY_MODELS:
         if preferred in available:
-            # Ping test to be sure
+            # Liveness check to be sure
             if _ping_model(preferred):
                 print(f"ContentOS: Selected Model -> {preferred}")
                 _ACTIVE_MODEL = preferred
+                _save_selection(digest, preferred)
                 return preferred
     
     # 2. Fallback to whatever is there
     _ACTIVE_MODEL = available[0]
+    _save_selection(digest, _ACTIVE_MODEL)
     return _ACTIVE_MODEL
 
+def _task_route(task: Optional[str]):
+    """The configured TaskRoute for task, or None."""
+    if not task:
+        return None
+    try:
+        from core.context import context_manager
+        return context_manager.global_config.tasks.get(task)
+    except Exception:
+        from core.config import default_task_routes
+        return default_task_routes().get(task)
+
+def get_task_model(task: Optional[str]) -> str:
+    """
+    Selects the model for a task route (GlobalConfig.tasks).
+    
+    The first installed, live model of the route's priority list wins;
+    routes without models, or with none installed, use get_best_model().
+    Like the global choice, it is persisted and reused while the installed
+    model set is unchanged.
+    """
+    route = _task_route(task)
+    if not route or not route.models:
+        return get_best_model()
+    with _TASK_LOCK:
+        if task in _TASK_MODELS:
+            return _TASK_MODELS[task]
+    
+    models = _fetch_tags()
+    available = [m['name'] for m in models]
+    digest = _tags_digest(models)
+    
+    saved = _load_selection() or {}
+    entry = saved.get("tasks", {}).get(task, {}) if saved.get("tags_digest") == digest else {}
+    chosen = None
+    if (entry.get("model") in route.models and entry.get("model") in available
+            and time.time() - entry.get("selected_at", 0) < _llm_config().model_cache_ttl):
+        chosen = entry["model"]
+    else:
+        for preferred in route.models:
+            if preferred in available and _ping_model(preferred):
+                print(f"ContentOS: Selected Model for {task} -> {preferred}")
+                chosen = preferred
+                _save_selection(digest, preferred, task=task)
+                break
+    chosen = chosen or get_best_model()
+    
+    with _TASK_LOCK:
+        _TASK_MODELS[task] = chosen
+    return chosen
+
+def _resolve_task(task: Optional[str], model: Optional[str], temperature: Optional[float],
+                  timeout: Optional[float]):
+    """Fills model/temperature/timeout left unset by the caller from the task route."""
+    route = _task_route(task)
+    if route:
+        model = model or get_task_model(task)
+        temperature = route.temperature if temperature is None else temperature
+        timeout = timeout or route.timeout
+    if temperature is None:
+        temperature = DEFAULT_TEMPERATURE
+    return model, temperature, timeout
+
 def _ping_model(model_name: str) -> bool:
-    """Quick inference check to ensure model is actually responding."""
+    """Cheap liveness check: asks Ollama for model metadata instead of running inference."""
     try:
-        url = f"{OLLAMA_HOST}/api/chat"
-        payload = {
-            "model": model_name,
-            "messages": [{"role": "user", "content": "ping"}],
-            "stream": False
-        }
-        res = requests.post(url, json=payload, timeout=5)
+        url = f"{OLLAMA_HOST}/api/show"
+        payload = {"model": model_name, "name": model_name}
+        res = get_session().post(url, json=payload, timeout=_timeout(_llm_config().probe_timeout))
         return res.status_code == 200
     except (requests.RequestException, ConnectionError):
         return False
 
+def _selection_stale(error: Exception) -> bool:
+    """
+    True for failures that mean the selected model is unusable: no server, or
+    the model is gone (404 / "model not found"). Other HTTP errors (a bad
+    request, a prompt that is too large) say nothing about the selection.
+    """
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return True
+    response = getattr(error, "response", None)
+    if response is None:
+        return False
+    if response.status_code == 404:
+        return True
+    try:
+        detail = str(response.json().get("error", ""))
+    except ValueError:
+        detail = response.text or ""
+    return "model" in detail.lower() and "not found" in detail.lower()
+
+def _on_call_failure(model_name: str, error: Exception) -> None:
+    """Drops a persisted selection whose model just failed a request (see _selection_stale)."""
+    if not _selection_stale(error):
+        return
+    with _TASK_LOCK:
+        routed = model_name in _TASK_MODELS.values()
+    if model_name == _ACTIVE_MODEL or routed:
+        invalidate_model_selection()
+
+def _keep_alive() -> Optional[Any]:
+    """llm.keep_alive as Ollama expects it: a duration string or a number of seconds."""
+    value = str(_llm_config().keep_alive).strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def _system_message(system: str, context: str) -> str:
+    """
+    System persona followed by shared context. Keeping the static part first
+    gives every call in a batch the same prompt prefix, which Ollama can
+    reuse from its KV cache instead of re-evaluating.
+    """
+    return f"{system}\n\n{context}" if context else system
+
+def _build_payload(
+    prompt: str,
+    system: str,
+    model: Optional[str],
+    temperature: float,
+    json_mode: bool,
+    stream: bool,
+    context: str = ""
+) -> Dict[str, Any]:
+    """Builds the /api/chat request body shared by ask() and ask_stream()."""
+    payload = {
+        "model": model or get_best_model(),
+        "messages": [
+            {"role": "system", "content": _system_message(system, context)},
+            {"role": "user", "content": prompt}
+        ],
+        "stream": stream,
+        "options": {
+            "temperature": temperature
+        }
+    }
+    
+    keep_alive = _keep_alive()
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if json_mode:
+        payload["format"] = "json"
+    return payload
+
+def _cache_key(payload: Dict[str, Any], prompt: str, temperature: float,
+               json_mode: bool, cache: Optional[bool]) -> Optional[str]:
+    """
+    Returns the response-cache key for this call, or None if it shouldn't be cached.
+    
+    cache=None caches only near-deterministic calls (temperature at or below
+    llm.cache_max_temperature); True/False force it per call. The global
+    llm.cache_enabled switch always wins.
+    """
+    cfg = _llm_config()
+    if not cfg.cache_enabled or cache is False:
+        return None
+    if cache is None and temperature > cfg.cache_max_temperature:
+        return None
+    return llm_cache.make_key(payload["model"], payload["messages"][0]["content"], prompt,
+                              temperature, json_mode, payload.get("format"))
+
+def _cache_store(key: Optional[str], model: str, content: str) -> None:
+    """Saves a successful response under key (no-op when caching is off)."""
+    if key and content:
+        llm_cache.put(key, model, content, int(_llm_config().cache_max_mb * 1024 * 1024))
+
+def _record_stats(model: str, started: float, first_token_at: Optional[float],
+                  result: Dict[str, Any], cache_hit: bool = False, ok: bool = True) -> None:
+    """
+    Stores timing for the calling thread's latest request (see get_last_stats)
+    and appends the call to the telemetry log (llm.telemetry_enabled).
+    """
+    finished = time.perf_counter()
+    if _llm_config().telemetry_enabled:
+        llm_telemetry.record(model, result, finished - started,
+                             ttft_s=(first_token_at - started) if first_token_at else None,
+                             cache_hit=cache_hit, ok=ok)
+    if not ok:
+        # Replace the previous call's timing, so it isn't reported as this one's
+        _STATS.last = {"model": model, "ok": False, "total_s": finished - started}
+        return
+    
+    first_token_at = first_token_at or finished
+    eval_count = result.get("eval_count") or 0
+    eval_seconds = (result.get("eval_duration") or 0) / 1e9
+    if not eval_seconds:
+        # Older servers omit eval_duration: approximate with wall-clock generation time
+        eval_seconds = finished - first_token_at
+    
+    _STATS.last = {
+        "model": model,
+        "ttft_s": first_token_at - started,
+        "total_s": finished - started,
+        "eval_count": eval_count,
+        "tokens_per_sec": eval_count / eval_seconds if eval_seconds > 0 else 0.0,
+        "cache_hit": cache_hit,
+        "ok": True
+    }
+
+def get_last_stats() -> Dict[str, Any]:
+    """
+    Returns timing for the most recent ask()/ask_stream() call on this thread.
+    
+    Keys: model, ttft_s (time to first token), total_s, eval_count, tokens_per_sec,
+    cache_hit, ok. A failed call only has model, ok (False) and total_s.
+    Empty dict if no call has completed yet.
+    """
+    return dict(getattr(_STATS, "last", {}))
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """One-line human summary of get_last_stats()."""
+    if not stats:
+        return "no timing data"
+    if not stats.get("ok", True):
+        return f"failed after {stats['total_s']:.1f}s"
+    if stats.get("cache_hit"):
+        return f"cache hit | total {stats['total_s']:.3f}s"
+    return (f"first token {stats['ttft_s']:.1f}s | total {stats['total_s']:.1f}s | "
+            f"{stats['eval_count']} tokens @ {stats['tokens_per_sec']:.1f} tok/s")
+
+def ask_stream(
+    prompt: str,
+    system: str = DEFAULT_SYSTEM,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    json_mode: bool = False,
+    cache: Optional[bool] = None,
+    context: str = "",
+    task: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Streams the LLM response, yielding text chunks as Ollama produces them.
+    
+    Same arguments as ask(). Ollama answers with one JSON object per line;
+    the final object (done=true) carries the token counts used for
+    get_last_stats(). Errors are yielded as one final "Error: ..." chunk,
+    possibly after partial content (an error mid-stream, or a stream that
+    ends without done: "Error: stream ended before completion").
+    A cached response is yielded as one chunk.
+    """
+    model, temperature, timeout = _resolve_task(task, model, temperature, timeout)
+    payload = _build_payload(prompt, system, model, temperature, json_mode, stream=True, context=context)
+    url = f"{OLLAMA_HOST}/api/chat"
+    started = time.perf_counter()
+    first_token_at = None
+    
+    cache_key = _cache_key(payload, prompt, temperature, json_mode, cache)
+    cached = llm_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        _record_stats(payload["model"], started, None, {}, cache_hit=True)
+        yield cached
+        return
+    
+    chunks = []
+    try:
+        with get_session().post(url, json=payload, stream=True,
+                                timeout=_timeout(timeout or _llm_config().request_timeout)) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    _record_stats(payload["model"], started, first_token_at, {}, ok=False)
+                    yield f"Error: {chunk['error']}"
+                    return
+                
+                content = chunk.get("message", {}).get("content", "")
+                if content:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(content)
+                    yield content
+                
+                if chunk.get("done"):
+                    _record_stats(payload["model"], started, first_token_at, chunk)
+                    _cache_store(cache_key, payload["model"], "".join(chunks))
+                    return
+            
+            # Stream ended without a done chunk (server dropped it): a failed call
+            _record_stats(payload["model"], started, first_token_at, {}, ok=False)
+            yield "Error: stream ended before completion"
+                    
+    except requests.exceptions.ConnectionError as e:
+        _on_call_failure(payload["model"], e)
+        _record_stats(payload["model"], started, first_token_at, {}, ok=False)
+        yield "Error: Could not connect to Ollama. Is it running on port 11434?"
+    except requests.exceptions.HTTPError as e:
+        _on_call_failure(payload["model"], e)
+        _record_stats(payload["model"], started, first_token_at, {}, ok=False)
+        yield f"Error: {str(e)}"
+    except Exception as e:
+        _record_stats(payload["model"], started, first_token_at, {}, ok=False)
+        yield f"Error: {str(e)}"
+
 def ask(
     prompt: str,
-    system: str = "You are a helpful AI assistant for a YouTube automation system.",
+    system: str = DEFAULT_SYSTEM,
     model: Optional[str] = None,
-    temperature: float = 0.7,
-    json_mode: bool = False
+    temperature: Optional[float] = None,
+    json_mode: bool = False,
+    stream: bool = False,
+    cache: Optional[bool] = None,
+    timeout: Optional[float] = None,
+    context: str = "",
+    task: Optional[str] = None
 ) -> str:
     """
     Sends a simple prompt to the LLM and returns the text response.
@@ -139,42 +566,173 @@ def ask(
     Args:
         prompt: The user's query.
         system: System context/persona.
-        model: Model name. If None, auto-selects best model.
-        temperature: Creativity (0.0 - 1.0).
+        model: Model name. If None, the task's model or the best model.
+        temperature: Creativity (0.0 - 1.0). If None, the task's or 0.7.
         json_mode: If True, forces valid JSON output.
+        stream: If True, prints tokens to the console as they arrive
+                (followed by a timing line) before returning the full text.
+        cache: Response cache policy. None caches low-temperature calls only,
+               True/False force caching on/off for this call.
+        timeout: Seconds to wait for the response (default: llm.request_timeout).
+        context: Static shared context (e.g. brain context), sent right after
+                 the system persona so calls that share it share a prompt
+                 prefix. Put per-call data in prompt.
+        task: Task route in GlobalConfig.tasks ('extract', 'summarize-batch',
+              'reduce', 'strategy'); supplies model, temperature and timeout
+              where they are not given.
     
     Returns:
         String content of the response.
     """
-    target_model = model or get_best_model()
+    if stream:
+        chunks = []
+        for chunk in ask_stream(prompt, system, model, temperature, json_mode, cache, context, task, timeout):
+            # Safe print for Windows Console
+            print(chunk.encode('ascii', 'ignore').decode('ascii'), end="", flush=True)
+            chunks.append(chunk)
+        print(f"\n   ({format_stats(get_last_stats())})")
+        if chunks and is_error(chunks[-1]) and not get_last_stats().get("ok", True):
+            return chunks[-1]  # Failed mid-stream: the partial text is not an answer
+        return "".join(chunks)
     
+    model, temperature, timeout = _resolve_task(task, model, temperature, timeout)
+    payload = _build_payload(prompt, system, model, temperature, json_mode, stream=False, context=context)
     url = f"{OLLAMA_HOST}/api/chat"
+    started = time.perf_counter()
     
-    payload = {
-        "model": target_model,
-        "messages": [
-            {"role": "system", "content": system},
-            {"role": "user", "content": prompt}
-        ],
-        "stream": False,
-        "options": {
-            "temperature": temperature
-        }
-    }
-    
-    if json_mode:
-        payload["format"] = "json"
+    cache_key = _cache_key(payload, prompt, temperature, json_mode, cache)
+    cached = llm_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        _record_stats(payload["model"], started, None, {}, cache_hit=True)
+        return cached
 
     try:
-        response = requests.post(url, json=payload, timeout=120)
+        response = get_session().post(url, json=payload, timeout=_timeout(timeout or _llm_config().request_timeout))
         response.raise_for_status()
         result = response.json()
+        _record_stats(payload["model"], started, None, result)
         
         # Extract content
         content = result.get("message", {}).get("content", "")
+        _cache_store(cache_key, payload["model"], content)
         return content
         
-    except requests.exceptions.ConnectionError:
+    except requests.exceptions.ConnectionError as e:
+        _on_call_failure(payload["model"], e)
+        _record_stats(payload["model"], started, None, {}, ok=False)
         return "Error: Could not connect to Ollama. Is it running on port 11434?"
+    except requests.exceptions.HTTPError as e:
+        _on_call_failure(payload["model"], e)
+        _record_stats(payload["model"], started, None, {}, ok=False)
+        return f"Error: {str(e)}"
     except Exception as e:
+        _record_stats(payload["model"], started, None, {}, ok=False)
         return f"Error: {str(e)}"
+
+def is_error(response: Optional[str]) -> bool:
+    """True if ask() returned its "Error: ..." failure string (or nothing)."""
+    return not response or response.startswith("Error:")
+
+def ask_many(
+    prompts: List[str],
+    system: str = DEFAULT_SYSTEM,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    json_mode: bool = False,
+    cache: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_done: Optional[Callable[[int, bool], None]] = None,
+    context: str = "",
+    task: Optional[str] = None
+) -> List[Optional[str]]:
+    """
+    Runs independent prompts concurrently on a bounded thread pool.
+    
+    Ollama serves up to OLLAMA_NUM_PARALLEL requests at once, so a map phase
+    of N prompts finishes in roughly ceil(N / max_workers) call latencies.
+    
+    Args:
+        prompts: One prompt per task.
+        system, model, temperature, json_mode, cache, context, task: As for ask().
+                 Shared instructions belong in system/context so every
+                 prompt in the batch starts with the same prefix.
+        max_workers: Pool size (default: llm.max_parallel).
+        timeout: Per-prompt response timeout in seconds.
+        on_done: Optional callback(index, ok) fired as each prompt finishes.
+    
+    Returns:
+        Responses in the same order as prompts; None where a prompt failed.
+    """
+    if not prompts:
+        return []
+    
+    # Resolve once up front so worker threads don't race the model probe
+    target_model, temperature, timeout = _resolve_task(task, model, temperature, timeout)
+    target_model = target_model or get_best_model()
+    workers = max(1, min(max_workers or _llm_config().max_parallel, len(prompts)))
+    results: List[Optional[str]] = [None] * len(prompts)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(ask, prompt, system, target_model, temperature, json_mode,
+                        cache=cache, timeout=timeout, context=context): i
+            for i, prompt in enumerate(prompts)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                response = future.result()
+            except Exception:
+                response = None
+            ok = not is_error(response)
+            results[i] = response if ok else None
+            if on_done:
+                on_done(i, ok)
+    
+    return results
+
+def warm(model: Optional[str] = None, system: Optional[str] = None, context: str = "",
+         task: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Loads a model into Ollama's memory ahead of a batch, held for llm.keep_alive.
+    
+    With system/context, that prefix is also evaluated once (one output token)
+    so the calls that follow can reuse it from Ollama's KV cache instead of
+    processing it again. With task, the task route's model is loaded.
+    
+    Returns:
+        {'model', 'ok', 'wall_s', 'load_s', 'prompt_tokens', 'error'}
+    """
+    target = model or get_task_model(task)
+    payload: Dict[str, Any] = {"model": target, "messages": [], "stream": False}
+    if system or context:
+        payload["messages"] = [
+            {"role": "system", "content": _system_message(system or DEFAULT_SYSTEM, context)},
+            {"role": "user", "content": "Ready?"}
+        ]
+        payload["options"] = {"num_predict": 1}
+    keep_alive = _keep_alive()
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    
+    started = time.perf_counter()
+    try:
+        response = get_session().post(f"{OLLAMA_HOST}/api/chat", json=payload,
+                                      timeout=_timeout(_llm_config().request_timeout))
+        response.raise_for_status()
+        result = response.json()
+        error = result.get("error")
+    except (requests.RequestException, ValueError) as e:
+        _on_call_failure(target, e)
+        result, error = {}, str(e)
+    
+    _record_stats(target, started, None, result, ok=not error)
+    return {
+        'model': target,
+        'ok': not error,
+        'wall_s': time.perf_counter() - started,
+        'load_s': (result.get("load_duration") or 0) / 1e9,
+        'prompt_tokens': result.get("prompt_eval_count") or 0,
+        'error': error
+    }
@@ -0,0 +1,175 @@
+"""
+LLM Pipeline Benchmark
+Drives real ContentOS commands against the fake Ollama server (core.fake_ollama)
+inside a throwaway channel, so pipeline overhead and concurrency can be
+measured separately from model speed.
+
+Everything runs in a temporary directory: the channel, response cache, model
+selection and telemetry DBs are redirected there, and the global config is
+only changed in memory. The user's channels and .contentos/ are not touched.
+"""
+import contextlib
+import copy
+import io
+import sqlite3
+import tempfile
+import time
+from argparse import Namespace
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from core.fake_ollama import FakeOllama, FakeOllamaConfig
+
+SCENARIOS = ["test-crew", "enrich", "scan", "strategy"]
+
+SAMPLE_PROMPT = """# {name}
+POV: a tiny creature discovers something new. Soft lighting, slow reveal.
+Visual: tracking shot, shallow depth of field. Audio: gentle ambience.
+Keep the hook under 2 seconds and end on a loopable frame.
+"""
+
+SAMPLE_COMMENTS = [
+    "This is so relaxing, please make a longer version",
+    "The sound at the end was too loud",
+    "Can you do one with a rainy window next?",
+    "Watched this 10 times, love the loop",
+    "Kind of boring compared to the last one",
+    "What camera do you use for these close-ups?",
+]
+
+def _seed_channel(ctx, kits: int, comments: int) -> None:
+    """Creates kits, comments and a brain in the sandbox channel."""
+    import yaml
+    from core.brain import init_brain, add_learning
+    from core.database import init_db, get_db_path
+
+    for sub in (ctx.production_path, ctx.strategy_path, ctx.analytics_path):
+        sub.mkdir(parents=True, exist_ok=True)
+
+    for i in range(1, kits + 1):
+        kit_path = ctx.production_path / f"{i:03d}_bench_kit_{i}"
+        kit_path.mkdir()
+        (kit_path / "prompt.txt").write_text(SAMPLE_PROMPT.format(name=f"Bench kit {i}"), encoding='utf-8')
+        with open(kit_path / "kit.yaml", 'w', encoding='utf-8') as f:
+            yaml.dump({"id": f"{i:03d}", "name": f"bench_kit_{i}", "theme": "loop", "status": "draft"}, f)
+
+    init_db(ctx)
+    conn = sqlite3.connect(get_db_path(ctx))
+    conn.executemany('''
+        INSERT OR REPLACE INTO comments (id, video_id, author_name, text_original, sentiment_score,
+                                         published_at, reply_count, like_count)
+        VALUES (?, 'bench', 'viewer', ?, 0.0, '2024-01-01T00:00:00Z', 0, ?)
+    ''', [(f"c{i}", f"{SAMPLE_COMMENTS[i % len(SAMPLE_COMMENTS)]} #{i}", i) for i in range(comments)])
+    conn.commit()
+    conn.close()
+
+    init_brain(ctx)
+    add_learning(ctx, "performance", "Loops with ambient audio hold retention", evidence="Bench", source="llm bench")
+
+def _run_scenario(name: str, ctx, batch: int, comments: int) -> None:
+    from commands import kit_cmd, scan_cmd, strategy_cmd, test_crew_cmd
+    if name == "test-crew":
+        test_crew_cmd.run(Namespace())
+    elif name == "enrich":
+        # min_confidence above 1 sends every field of every kit to the LLM
+        kit_cmd.cmd_enrich(Namespace(kit_id=None, force=True, batch=batch, min_confidence=1.01))
+    elif name == "scan":
+        scan_cmd.run_analyst(ctx, limit=comments)
+    elif name == "strategy":
+        strategy_cmd.cmd_suggest(Namespace())
+
+def _call_stats(db_path: Path, command: str) -> Dict[str, Any]:
+    """Client wall time vs simulated server time for one scenario's calls."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute('SELECT wall_ms, server_ms, ok FROM calls WHERE command = ?', (command,)).fetchall()
+    finally:
+        conn.close()
+    ok = [(wall, server) for wall, server, success in rows if success]
+    return {
+        'calls': len(rows),
+        'errors': len(rows) - len(ok),
+        'server_s': sum(server for _, server in ok) / 1000,
+        'overhead_ms': sum(wall - server for wall, server in ok) / len(ok) if ok else 0.0
+    }
+
+def run_benchmark(scenarios: Optional[List[str]] = None, fake: Optional[FakeOllamaConfig] = None,
+                  kits: int = 20, comments: int = 300, batch: int = 1,
+                  parallel: Optional[int] = None, cache: bool = False,
+                  verbose: bool = False) -> List[Dict[str, Any]]:
+    """
+    Runs each scenario once against a fresh fake server and sandbox channel.
+
+    Returns one row per scenario: wall_s, calls, errors, server_s (sum of
+    simulated model time), overhead_ms (mean client wall minus server time
+    per call), peak_parallel (max concurrent requests seen by the server).
+    """
+    from core import llm, llm_cache, llm_telemetry
+    from core.config import ChannelConfig
+    from core.context import context_manager, ChannelContext
+
+    scenarios = scenarios or SCENARIOS
+    fake = fake or FakeOllamaConfig()
+
+    saved = {
+        'host': llm.OLLAMA_HOST, 'selection': llm.MODEL_SELECTION_PATH, 'active': llm._ACTIVE_MODEL,
+        'cache_db': llm_cache.CACHE_DB_PATH, 'telemetry_db': llm_telemetry.TELEMETRY_DB_PATH,
+        'command': llm_telemetry.get_command(),
+        'global': context_manager._global_config, 'context': context_manager._current_context,
+    }
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="contentos_bench_") as tmp:
+        tmp = Path(tmp)
+        global_config = copy.deepcopy(context_manager.global_config)
+        global_config.features.llm_swarm = True
+        global_config.features.ollama_autostart = False
+        global_config.llm.cache_enabled = cache
+        global_config.llm.telemetry_enabled = True
+        global_config.llm.embedding_model = ""
+        if parallel:
+            global_config.llm.max_parallel = parallel
+
+        ctx = ChannelContext(name="bench", path=tmp / "bench", config=ChannelConfig(name="bench"),
+                             global_config=global_config)
+        ctx.path.mkdir()
+
+        try:
+            llm.MODEL_SELECTION_PATH = tmp / "llm_model.json"
+            llm_cache.CACHE_DB_PATH = tmp / "llm_cache.db"
+            llm_telemetry.TELEMETRY_DB_PATH = tmp / "llm_telemetry.db"
+            context_manager._global_config = global_config
+            context_manager._current_context = ctx
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                _seed_channel(ctx, kits, comments)
+
+            for name in scenarios:
+                with FakeOllama(copy.deepcopy(fake)) as server:
+                    llm.OLLAMA_HOST = server.url
+                    llm._ACTIVE_MODEL = None
+                    llm._TASK_MODELS.clear()
+                    llm_telemetry.set_command(f"bench {name}")
+
+                    output = io.StringIO()
+                    started = time.perf_counter()
+                    with contextlib.redirect_stdout(output):
+                        _run_scenario(name, ctx, batch, comments)
+                    wall = time.perf_counter() - started
+                    if verbose:
+                        print(output.getvalue())
+
+                    row = {'scenario': name, 'wall_s': wall, 'peak_parallel': server.peak_active}
+                    row.update(_call_stats(llm_telemetry.TELEMETRY_DB_PATH, f"bench {name}"))
+                    rows.append(row)
+        finally:
+            llm.OLLAMA_HOST = saved['host']
+            llm.MODEL_SELECTION_PATH = saved['selection']
+            llm._ACTIVE_MODEL = saved['active']
+            llm._TASK_MODELS.clear()
+            llm_cache.CACHE_DB_PATH = saved['cache_db']
+            llm_telemetry.TELEMETRY_DB_PATH = saved['telemetry_db']
+            llm_telemetry.set_command(saved['command'])
+            context_manager._global_config = saved['global']
+            context_manager._current_context = saved['context']
+    return rows
@@ -0,0 +1,148 @@
+"""
+LLM Response Cache
+Content-addressed store for Ollama responses, kept in .contentos/llm_cache.db.
+Entries are evicted least-recently-used once the cache exceeds its size budget.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Optional, Dict, Any
+
+from core.config import CONTENTOS_DIR
+
+CACHE_DB_PATH = CONTENTOS_DIR / "llm_cache.db"
+
+def make_key(model: str, system: str, prompt: str, temperature: float,
+             json_mode: bool, fmt: Optional[str]) -> str:
+    """Hashes everything that influences a response into a stable cache key."""
+    material = json.dumps([model, system, prompt, temperature, json_mode, fmt], ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+def _connect() -> sqlite3.Connection:
+    """Opens the cache DB, creating the schema on first use."""
+    CONTENTOS_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT,
+            size INTEGER,
+            created_at REAL,
+            last_access REAL,
+            hits INTEGER DEFAULT 0
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER DEFAULT 0
+        )
+    ''')
+    return conn
+
+def _bump(cursor, name: str, amount: int = 1) -> None:
+    cursor.execute('''
+        INSERT INTO stats (name, value) VALUES (?, ?)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+    ''', (name, amount))
+
+def get(key: str) -> Optional[str]:
+    """Returns the cached response for key (refreshing its LRU position), or None."""
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT response FROM responses WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute('UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?',
+                           (time.time(), key))
+            _bump(cursor, 'hits')
+        else:
+            _bump(cursor, 'misses')
+        conn.commit()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+def put(key: str, model: str, response: str, max_bytes: int) -> None:
+    """Stores a response, then evicts least-recently-used entries beyond max_bytes."""
+    size = len(response.encode('utf-8'))
+    if size > max_bytes:
+        return
+
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return
+
+    try:
+        cursor = conn.cursor()
+        now = time.time()
+        cursor.execute('''
+            INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access, hits)
+            VALUES (?, ?, ?, ?, ?, ?, 0)
+        ''', (key, model, response, size, now, now))
+        _evict(cursor, max_bytes)
+        conn.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+
+def _evict(cursor, max_bytes: int) -> int:
+    """Deletes oldest-accessed entries until the total size fits max_bytes."""
+    cursor.execute('SELECT COALESCE(SUM(size), 0) FROM responses')
+    excess = cursor.fetchone()[0] - max_bytes
+    if excess <= 0:
+        return 0
+
+    victims = []
+    cursor.execute('SELECT key, size FROM responses ORDER BY last_access ASC')
+    for key, size in cursor.fetchall():
+        if excess <= 0:
+            break
+        victims.append((key,))
+        excess -= size
+
+    cursor.executemany('DELETE FROM responses WHERE key = ?', victims)
+    _bump(cursor, 'evictions', len(victims))
+    return len(victims)
+
+def get_stats() -> Dict[str, Any]:
+    """Returns entry count, stored bytes and lifetime hit/miss/eviction counters."""
+    stats = {'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+    if not CACHE_DB_PATH.exists():
+        return stats
+
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses')
+        stats['entries'], stats['bytes'] = cursor.fetchone()
+        cursor.execute('SELECT name, value FROM stats')
+        for name, value in cursor.fetchall():
+            stats[name] = value
+    finally:
+        conn.close()
+    return stats
+
+def clear() -> None:
+    """Drops every cached response (counters are kept)."""
+    if not CACHE_DB_PATH.exists():
+        return
+    conn = _connect()
+    try:
+        conn.execute('DELETE FROM responses')
+        conn.commit()
+    finally:
+        conn.close()
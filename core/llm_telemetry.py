@@ -0,0 +1,158 @@
+"""
+LLM Telemetry
+Records every Ollama call (command, model, token counts, server-side durations,
+cache hits) to .contentos/llm_telemetry.db and summarizes latency/throughput.
+"""
+import math
+import sqlite3
+import time
+from typing import List, Dict, Any, Optional
+
+from core.config import CONTENTOS_DIR
+
+TELEMETRY_DB_PATH = CONTENTOS_DIR / "llm_telemetry.db"
+
+# CLI command the current process is serving (see set_command)
+_COMMAND = "unknown"
+
+def set_command(name: str) -> None:
+    """Tags subsequent calls with the CLI command that issued them (e.g. 'kit enrich')."""
+    global _COMMAND
+    _COMMAND = name or "unknown"
+
+def get_command() -> str:
+    return _COMMAND
+
+def _connect() -> sqlite3.Connection:
+    """Opens the telemetry DB, creating the schema on first use."""
+    CONTENTOS_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(TELEMETRY_DB_PATH, timeout=10)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL,
+            command TEXT,
+            model TEXT,
+            prompt_tokens INTEGER,
+            output_tokens INTEGER,
+            load_ms REAL,
+            prompt_ms REAL,
+            eval_ms REAL,
+            server_ms REAL,
+            wall_ms REAL,
+            ttft_ms REAL,
+            cache_hit INTEGER DEFAULT 0,
+            ok INTEGER DEFAULT 1
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_calls_ts ON calls(ts)')
+    return conn
+
+def record(model: str, result: Dict[str, Any], wall_s: float, ttft_s: Optional[float] = None,
+           cache_hit: bool = False, ok: bool = True) -> None:
+    """
+    Stores one call. `result` is Ollama's final response object; its
+    *_duration fields are nanoseconds. Never raises: telemetry must not
+    break a command.
+    """
+    ns_to_ms = lambda key: (result.get(key) or 0) / 1e6
+    row = (
+        time.time(), _COMMAND, model,
+        result.get("prompt_eval_count") or 0, result.get("eval_count") or 0,
+        ns_to_ms("load_duration"), ns_to_ms("prompt_eval_duration"), ns_to_ms("eval_duration"),
+        ns_to_ms("total_duration"), wall_s * 1000, (ttft_s * 1000) if ttft_s is not None else None,
+        int(cache_hit), int(ok)
+    )
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return
+    try:
+        conn.execute('''
+            INSERT INTO calls (ts, command, model, prompt_tokens, output_tokens, load_ms, prompt_ms,
+                               eval_ms, server_ms, wall_ms, ttft_ms, cache_hit, ok)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', row)
+        conn.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100) of an unsorted list; 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def summarize(since: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Aggregates calls per (command, model), most total LLM time first.
+
+    Latency percentiles cover successful uncached calls; throughput is output
+    tokens per second of server eval time.
+    """
+    if not TELEMETRY_DB_PATH.exists():
+        return []
+
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT command, model, wall_ms, prompt_tokens, output_tokens, load_ms, eval_ms, cache_hit, ok
+            FROM calls WHERE ts >= ?
+        ''', (since or 0,))
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    groups = {}
+    for command, model, wall_ms, prompt_tokens, output_tokens, load_ms, eval_ms, cache_hit, ok in rows:
+        g = groups.setdefault((command, model), {
+            'command': command, 'model': model, 'calls': 0, 'cache_hits': 0, 'errors': 0,
+            'latencies': [], 'prompt_tokens': 0, 'output_tokens': 0, 'eval_ms': 0.0, 'load_ms': 0.0
+        })
+        g['calls'] += 1
+        if not ok:
+            g['errors'] += 1
+        elif cache_hit:
+            g['cache_hits'] += 1
+        else:
+            g['latencies'].append(wall_ms)
+            g['prompt_tokens'] += prompt_tokens
+            g['output_tokens'] += output_tokens
+            g['eval_ms'] += eval_ms
+            g['load_ms'] += load_ms
+
+    summary = []
+    for g in groups.values():
+        served = len(g['latencies'])
+        summary.append({
+            'command': g['command'],
+            'model': g['model'],
+            'calls': g['calls'],
+            'cache_hits': g['cache_hits'],
+            'errors': g['errors'],
+            'p50_ms': percentile(g['latencies'], 50),
+            'p95_ms': percentile(g['latencies'], 95),
+            'total_s': sum(g['latencies']) / 1000,
+            'avg_prompt_tokens': g['prompt_tokens'] / served if served else 0,
+            'avg_output_tokens': g['output_tokens'] / served if served else 0,
+            'tokens_per_sec': g['output_tokens'] / (g['eval_ms'] / 1000) if g['eval_ms'] else 0.0,
+            'load_s': g['load_ms'] / 1000
+        })
+    summary.sort(key=lambda s: s['total_s'], reverse=True)
+    return summary
+
+def clear() -> None:
+    """Deletes all recorded calls."""
+    if not TELEMETRY_DB_PATH.exists():
+        return
+    conn = _connect()
+    try:
+        conn.execute('DELETE FROM calls')
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,103 @@
+"""
+Sitemap Cache
+Persisted summaries of `contentos index` nodes, so agents surfing the index
+repeatedly don't re-walk production/ and the brain folder on every call.
+
+Each entry stores a node (or its stub) together with the (mtime_ns, size)
+of the directories and files it was built from. A lookup only stats those
+paths: an unchanged subtree is served from the cache without listing or
+reading it, and any change (a kit folder added, state.json rewritten, a
+theme edited) rebuilds just the entries that depend on it.
+
+Channel nodes live in <channel>/.sitemap.json; workspace nodes (the channel
+list) in .contentos/sitemap.json. Writes are atomic (tmp + os.replace); two
+processes saving at once only lose each other's new entries.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.config import CONTENTOS_DIR
+
+SITEMAP_FILE = ".sitemap.json"
+WORKSPACE_SITEMAP_PATH = CONTENTOS_DIR / "sitemap.json"
+MAX_ENTRIES = 200              # Oldest entries are dropped beyond this (pages of large lists add up)
+
+def _signature(paths: List[Path]) -> List[Optional[List[int]]]:
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            sig.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            sig.append(None)
+    return sig
+
+class SitemapCache:
+    """Node cache for one sitemap file, loaded once and saved when changed."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f).get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str, deps: List[Path]) -> Optional[Any]:
+        """Cached value for key if none of its dependencies changed."""
+        entry = self._load().get(key)
+        if entry is not None and entry.get("deps") == [str(p) for p in deps] \
+                and entry.get("sig") == _signature(deps):
+            self.hits += 1
+            return entry["value"]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, deps: List[Path], value: Any) -> None:
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = {"deps": [str(p) for p in deps], "sig": _signature(deps), "value": value}
+        while len(entries) > MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        self._dirty = True
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            pass  # Cache only; the next call rebuilds
+
+_CACHES: Dict[str, SitemapCache] = {}
+
+def get_sitemap(ctx=None) -> SitemapCache:
+    """Sitemap cache for a channel, or the workspace cache when ctx is None."""
+    path = ctx.path / SITEMAP_FILE if ctx else WORKSPACE_SITEMAP_PATH
+    cache = _CACHES.get(str(path))
+    if cache is None:
+        cache = _CACHES[str(path)] = SitemapCache(path)
+    return cache
+
+def save_all() -> None:
+    for cache in _CACHES.values():
+        cache.save()